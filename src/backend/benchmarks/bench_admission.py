@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+import httpx
+
+from benchmarks.bench_load import free_port, percentile, session_headers, start_server, wait_ready
+from models.domains import DOMAINS
+from services.admission import ADMISSION_USER_RATES
+
+ABUSER = 1
+
+
+async def overload(client: httpx.AsyncClient, args, rng: random.Random) -> dict:
+    # Open loop: arrivals keep coming at --rate whatever the server does, which
+    # is what exposes an unbounded queue (closed-loop clients would back off).
+    outcomes = []
+    targets = itertools.count()
+
+    async def one(user_id: int):
+        # Unique (user, target) pairs so every request is an analysis-cache miss.
+        target = f"{DOMAINS[next(targets) % len(DOMAINS) + 1]} {user_id}-{rng.random():.6f}"
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/domain_switch", json={"target_domain": target}, headers=session_headers(user_id)
+            )
+            status = response.status_code
+        except httpx.HTTPError:
+            status = "error"
+        outcomes.append((user_id, status, time.perf_counter() - start))
+
+    tasks = []
+    start = time.perf_counter()
+    for arrival in range(int(args.rate * args.duration)):
+        delay = start + arrival / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        user_id = ABUSER if rng.random() < args.abuser_share else rng.randint(2, args.users)
+        tasks.append(asyncio.create_task(one(user_id)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    ok = [latency for user_id, status, latency in outcomes if status == 200]
+    honest = [latency for user_id, status, latency in outcomes if status == 200 and user_id != ABUSER]
+    shed = [latency for _, status, latency in outcomes if status in (429, 503)]
+    return {
+        "offered": len(outcomes),
+        "ok": len(ok),
+        "shed_429": sum(1 for _, status, _ in outcomes if status == 429),
+        "shed_503": sum(1 for _, status, _ in outcomes if status == 503),
+        "errors": sum(1 for _, status, _ in outcomes if status not in (200, 429, 503)),
+        "abuser_ok": sum(1 for user_id, status, _ in outcomes if status == 200 and user_id == ABUSER),
+        "goodput": len(ok) / elapsed,
+        "elapsed": elapsed,
+        "p50": percentile(ok, 0.5),
+        "p95": percentile(ok, 0.95),
+        "p99": percentile(ok, 0.99),
+        "honest_p95": percentile(honest, 0.95),
+        "shed_p50": percentile(shed, 0.5),
+    }
+
+
+async def run_mode(args, enabled: bool) -> dict:
+    args.port = free_port()
+    env = {"ADMISSION_ENABLED": "true" if enabled else "false", "ADMISSION_USER_RATES": ADMISSION_USER_RATES}
+    process = start_server(args, env)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=300) as client:
+            await wait_ready(client, process)
+            return await overload(client, args, random.Random(args.seed))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Open-loop overload of /domain_switch with admission control off and on (fake LLM and PostgREST)"
+    )
+    parser.add_argument("--rate", type=float, default=60, help="arrivals per second; capacity is about 8 / llm-latency")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--users", type=int, default=400)
+    parser.add_argument("--abuser-share", type=float, default=0.25, help="share of arrivals from a single user")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = {"off": await run_mode(args, False), "on": await run_mode(args, True)}
+    print(f"offered {args.rate:.0f} req/s for {args.duration:.0f}s; {args.abuser_share:.0%} from one user")
+    print(
+        f"{'admission':<11}{'offered':>8}{'ok':>6}{'429':>6}{'503':>6}{'errors':>7}{'abuser ok':>10}"
+        f"{'goodput/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'others p95':>11}{'shed p50':>9}{'wall s':>8}"
+    )
+    for mode, r in results.items():
+        print(
+            f"{mode:<11}{r['offered']:>8}{r['ok']:>6}{r['shed_429']:>6}{r['shed_503']:>6}{r['errors']:>7}{r['abuser_ok']:>10}"
+            f"{r['goodput']:>10.1f}{r['p50'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}{r['p99'] * 1000:>9.0f}"
+            f"{r['honest_p95'] * 1000:>11.0f}{r['shed_p50'] * 1000:>9.1f}{r['elapsed']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import server; print(time.perf_counter() - t)"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def bench_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("SESSION_SECRET", "bench-secret")
+    env.setdefault("RESUME_API", "unused")
+    env.setdefault("JOBS_DB_PATH", ":memory:")
+    env.setdefault("QUIZ_BANK_PATH", ":memory:")
+    env.setdefault("RESUME_STATE_PATH", ":memory:")
+    # Never contacted during boot; only has to look configured for /readyz.
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    env.setdefault("SUPABASE_KEY", "bench")
+    return env
+
+
+def import_time(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def boot_time(env: dict, timeout: float = 120.0) -> tuple[float, float]:
+    # Seconds from process spawn until /healthz answers (port bound) and until
+    # /readyz reports the background warm-up finished.
+    port = free_port()
+    started_at = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    live = None
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            while time.perf_counter() - started_at < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"server exited with status {process.returncode}")
+                try:
+                    if live is None and client.get("/healthz").status_code == 200:
+                        live = time.perf_counter() - started_at
+                    if live is not None and client.get("/readyz").status_code == 200:
+                        return live, time.perf_counter() - started_at
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.02)
+        raise RuntimeError("server did not become ready in time")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def slowest_imports(env: dict, top: int) -> list:
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only top-level packages, so nested modules are not double counted.
+        if name.startswith("   ") and not name.startswith("    "):
+            rows.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start: server.py import time and time to live/ready")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="list the slowest imports pulled in by server.py")
+    args = parser.parse_args()
+    env = bench_env()
+
+    imports = [import_time(env) for _ in range(args.runs)]
+    boots = [boot_time(env) for _ in range(args.runs)]
+    print(f"{'metric':<28}{'median s':>10}{'min s':>10}{'max s':>10}")
+    for label, values in (
+        ("import server", imports),
+        ("spawn -> /healthz 200", [live for live, _ in boots]),
+        ("spawn -> /readyz 200", [ready for _, ready in boots]),
+    ):
+        print(f"{label:<28}{statistics.median(values):>10.3f}{min(values):>10.3f}{max(values):>10.3f}")
+    if args.top:
+        print("\nslowest direct imports of server.py:")
+        for seconds, name in slowest_imports(env, args.top):
+            print(f"  {seconds:>7.3f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
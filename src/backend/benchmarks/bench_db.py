@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.fake_postgrest import FakePostgrest
+from benchmarks.fakes import fake_instance
+from models.upload_resume import resume_upload
+from services.db_client import SupabaseDB
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+async def drive(label: str, calls: int, concurrency: int, op):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await op(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(calls)])
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<28}{concurrency:>6}{calls / elapsed:>10.0f}"
+        f"{percentile(latencies, 0.5) * 1000:>9.1f}{percentile(latencies, 0.99) * 1000:>9.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="RPC latency/throughput of the async Supabase data-access layer")
+    parser.add_argument("--url", default="", help="PostgREST base URL; defaults to the in-process fake")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.005, help="latency injected by the in-process fake")
+    args = parser.parse_args()
+
+    if args.url:
+        db = SupabaseDB(url=args.url, key="bench")
+    else:
+        fake = FakePostgrest(latency=args.latency)
+        db = SupabaseDB(url="http://postgrest.local", key="bench", transport=httpx.ASGITransport(app=fake.app))
+
+    users = await db.bulk_insert(
+        "users", [{"name": f"user {i}", "email": f"user{i}@example.com", "password": "x"} for i in range(100)],
+        returning=True,
+    )
+    ids = [user["id"] for user in users]
+    data = fake_instance(resume_upload).model_dump()
+
+    print(f"{'operation':<28}{'conc':>6}{'ops/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for concurrency in (1, 16, 64):
+        await drive("users by email", args.calls, concurrency, lambda i: db.get_user_by_email(f"user{i % 100}@example.com"))
+        await drive("upsert_full_resume", args.calls, concurrency, lambda i: db.upsert_full_resume(ids[i % 100], data))
+        await drive("get_full_candidate_profile", args.calls, concurrency, lambda i: db.get_full_candidate_profile(ids[i % 100]))
+    await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import time
+
+from benchmarks.fakes import FakeChatModel
+from models.domain_switch import DomainSwitchAnalysis
+from services.llm import LLMService
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(label: str, calls: int, call):
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[call() for _ in range(calls)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lag = await lag_task
+    print(f"{label:<28}{calls:>7}{elapsed:>10.2f}{calls / elapsed:>10.1f}{lag * 1000:>14.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event loop responsiveness under concurrent fake LLM calls")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    service = LLMService(
+        model=FakeChatModel(latency=args.latency, jitter=args.latency / 5),
+        max_concurrency=args.concurrency,
+        route_limits={"domain_switch": args.concurrency},
+    )
+    structured = service.structured(DomainSwitchAnalysis)
+
+    print(f"{'mode':<28}{'calls':>7}{'wall s':>10}{'req/s':>10}{'max lag ms':>14}")
+    async def blocking_call():
+        return structured.invoke({})
+
+    await run("blocking invoke", min(args.requests, 5), blocking_call)
+    await run("LLMService.ainvoke", args.requests, lambda: service.ainvoke("domain_switch", structured, {}))
+
+    stats = service.stats()["routes"]["domain_switch"]
+    print(
+        f"avg queue wait {stats['queue_wait_seconds'] / stats['calls']:.3f}s, "
+        f"avg generation {stats['generation_seconds'] / stats['calls']:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SESSION_SECRET", "bench-secret")
+os.environ.setdefault("RESUME_API", "unused")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+os.environ.setdefault("QUIZ_BANK_PATH", ":memory:")
+os.environ.setdefault("RESUME_STATE_PATH", ":memory:")
+
+import httpx
+
+from benchmarks.fixtures import make_pdf, synthetic_resume_pages
+from models.domains import DOMAINS
+from services.sessions import create_session_token
+
+ROUTES = ("login", "profile", "domain_switch", "resume")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PASSWORD = "placement-drive"
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(args):
+    # Runs in its own process so client-side work does not share the server's
+    # event loop; fakes are wired in before server.py imports the routers.
+    import bcrypt
+    import uvicorn
+
+    from benchmarks.fake_postgrest import FakePostgrest
+    from benchmarks.fakes import FakeChatModel
+    from services.db_client import db
+    from services.llm import llm
+
+    fake = FakePostgrest(latency=args.db_latency)
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=args.bcrypt_rounds)).decode("utf-8")
+    for user_id in range(1, args.users + 1):
+        fake.tables["users"].append(
+            {"id": user_id, "name": f"Student {user_id}", "email": f"s{user_id}@example.com", "password": hashed}
+        )
+        fake.resumes[str(user_id)] = {
+            "domain": "Web Development",
+            "skills": [{"skill_name": "Python"}, {"skill_name": "React"}, {"skill_name": "SQL"}],
+            "projects": [{"title": "Campus Connect", "description": "React Native event discovery app"}],
+        }
+    db.url, db.key, db.transport = "http://fake", "bench", httpx.ASGITransport(app=fake.app)
+    llm.set_model(FakeChatModel(latency=args.llm_latency, jitter=args.llm_latency / 4))
+
+    import server
+
+    uvicorn.run(server.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def session_headers(user_id: int) -> dict:
+    return {"Cookie": f"session={create_session_token(user_id)}"}
+
+
+class Scenario:
+    """One request (or request + job polling) per call, spread across the seeded users."""
+
+    def __init__(self, client: httpx.AsyncClient, users: int, resume_variants: int, poll_interval: float):
+        self.client = client
+        self.users = users
+        self.resume_variants = resume_variants
+        self.poll_interval = poll_interval
+        self._targets = itertools.count()
+        self._resumes = itertools.count()
+
+    def user(self, i: int) -> int:
+        return i % self.users + 1
+
+    async def login(self, i: int):
+        user_id = self.user(i)
+        response = await self.client.post("/login/", json={"email": f"s{user_id}@example.com", "password": PASSWORD})
+        response.raise_for_status()
+
+    async def profile(self, i: int):
+        response = await self.client.get("/profile", headers=session_headers(self.user(i)))
+        response.raise_for_status()
+
+    async def domain_switch(self, i: int):
+        # Targets advance across concurrency levels, so (user, target) pairs only
+        # repeat, and hit the analysis cache, once users * domains is exhausted.
+        target = DOMAINS[next(self._targets) // self.users % len(DOMAINS) + 1]
+        response = await self.client.post(
+            "/domain_switch", json={"target_domain": target}, headers=session_headers(self.user(i))
+        )
+        response.raise_for_status()
+
+    async def resume(self, i: int):
+        headers = session_headers(self.user(i))
+        # Like domain_switch targets, resumes advance across concurrency levels;
+        # a repeated PDF is a resume cache hit and skips the LLM entirely.
+        seed = next(self._resumes)
+        pdf = make_pdf(synthetic_resume_pages(2, seed=seed % self.resume_variants if self.resume_variants else seed))
+        response = await self.client.post("/resume/", files={"file": ("resume.pdf", pdf, "application/pdf")}, headers=headers)
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            response = await self.client.get(f"/resume/jobs/{job_id}", headers=headers)
+            response.raise_for_status()
+            job = response.json()
+            if job["status"] == "succeeded":
+                return
+            if job["status"] == "failed":
+                raise RuntimeError(job["error"])
+
+
+def is_shed(error: Exception) -> bool:
+    # 429s from admission control are deliberate load shedding, not failures.
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429
+
+
+async def drive(op, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = []
+    shed = 0
+    next_index = iter(range(requests))
+
+    async def worker():
+        nonlocal shed
+        for i in next_index:
+            start = time.perf_counter()
+            try:
+                await op(i)
+            except Exception as e:
+                if is_shed(e):
+                    shed += 1
+                else:
+                    errors.append(e)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "shed": shed,
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "first_error": repr(errors[0]) if errors else None,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    # A run regresses when p95 grows or throughput drops by more than the
+    # tolerance against the same route and concurrency in the baseline.
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            continue
+        if previous["p95_ms"] and result["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {previous['p95_ms']} -> {result['p95_ms']} ms")
+        if previous["rps"] and result["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{key}: rps {previous['rps']} -> {result['rps']}")
+        if result["errors"] > previous["errors"]:
+            regressions.append(f"{key}: errors {previous['errors']} -> {result['errors']}")
+    return regressions
+
+
+async def wait_ready(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            # Wait for the background warm-up too, so it is not measured as load.
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start in time")
+
+
+def start_server(args, env: dict | None = None) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "benchmarks.bench_load", "--serve",
+        "--port", str(args.port),
+        "--users", str(args.users),
+        "--llm-latency", str(args.llm_latency),
+        "--db-latency", str(args.db_latency),
+        "--bcrypt-rounds", str(args.bcrypt_rounds),
+    ]
+    env = {**os.environ, "BCRYPT_ROUNDS": str(args.bcrypt_rounds), **(env or {})}
+    # A few dozen seeded accounts stand in for many more real users, so
+    # per-user rate limits are off unless the caller sets them.
+    env.setdefault("ADMISSION_USER_RATES", "")
+    return subprocess.Popen(command, env=env)
+
+
+async def run(args) -> dict:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    routes = args.routes.split(",")
+    process = start_server(args)
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    results = {}
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=120) as client:
+            await wait_ready(client, process)
+            scenario = Scenario(client, args.users, args.resume_variants, args.poll_interval)
+            print(f"{'route':<16}{'conc':>6}{'reqs':>7}{'errors':>8}{'shed':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+            for route in routes:
+                for concurrency in levels:
+                    result = await drive(getattr(scenario, route), args.requests, concurrency)
+                    results[f"{route}@{concurrency}"] = result
+                    print(
+                        f"{route:<16}{concurrency:>6}{result['requests']:>7}{result['errors']:>8}{result['shed']:>6}{result['rps']:>10.1f}"
+                        f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+                    )
+                    if result["first_error"]:
+                        print(f"  first error: {result['first_error']}")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test /login, /profile, /domain_switch and /resume against a fake chat model and fake PostgREST"
+    )
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--routes", default=",".join(ROUTES))
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and concurrency level")
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--resume-variants", type=int, default=0, help="distinct PDFs to cycle through; 0 makes every upload unique")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+    args.port = args.port or free_port()
+    results = asyncio.run(run(args))
+
+    config = {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "users": args.users,
+        "llm_latency": args.llm_latency,
+        "db_latency": args.db_latency,
+        "bcrypt_rounds": args.bcrypt_rounds,
+        "resume_variants": args.resume_variants,
+    }
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {"config": config, "machine": {"python": platform.python_version(), "cpus": os.cpu_count()}, "results": results},
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print("baseline was recorded with different settings; skipping comparison")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"no regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
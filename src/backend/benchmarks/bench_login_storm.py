@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import time
+
+import bcrypt
+
+from services import passwords
+
+
+async def probe_latency(stop: asyncio.Event, samples: list, interval: float = 0.01):
+    # Stands in for a cheap request (e.g. GET /profile cache hit) sharing the worker.
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+async def storm(label: str, logins: int, verify):
+    stop = asyncio.Event()
+    samples = []
+    probe = asyncio.create_task(probe_latency(stop, samples))
+    start = time.perf_counter()
+    await asyncio.gather(*[verify() for _ in range(logins)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    print(
+        f"{label:<26}{logins:>8}{logins / elapsed:>12.1f}"
+        f"{percentile(samples, 0.5) * 1000:>12.1f}{percentile(samples, 0.99) * 1000:>12.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Concurrent login burst: inline bcrypt vs the process pool")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(b"placement-drive", bcrypt.gensalt(rounds=args.rounds)).decode("utf-8")
+
+    async def inline():
+        return bcrypt.checkpw(b"placement-drive", hashed.encode("utf-8"))
+
+    async def pooled():
+        return await passwords.verify_password("placement-drive", hashed, rounds=args.rounds)
+
+    await pooled()  # spawn workers outside the measurement
+    print(f"{'mode':<26}{'logins':>8}{'logins/s':>12}{'p50 lag ms':>12}{'p99 lag ms':>12}")
+    await storm("inline bcrypt.checkpw", args.logins, inline)
+    await storm(f"process pool ({passwords.BCRYPT_WORKERS} workers)", args.logins, pooled)
+    passwords.shutdown_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import time
+
+os.environ.setdefault("SESSION_SECRET", "bench-secret")
+os.environ.setdefault("RESUME_API", "unused")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+os.environ.setdefault("QUIZ_BANK_PATH", ":memory:")
+os.environ.setdefault("RESUME_STATE_PATH", ":memory:")
+
+import httpx
+import uvicorn
+import websockets
+
+from benchmarks.fake_postgrest import FakePostgrest
+from benchmarks.fakes import FakeChatModel
+from services.admission import admission
+from services.db_client import db
+from services.interview_sessions import interview_store
+from services.llm import llm
+from services.sessions import create_session_token
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def read_turn(ws, started: float, first_token: list):
+    while True:
+        message = json.loads(await ws.recv())
+        if message["type"] == "token" and started is not None:
+            first_token.append(time.perf_counter() - started)
+            started = None
+        elif message["type"] in ("turn_end", "busy"):
+            return message
+        elif message["type"] == "error":
+            raise RuntimeError(message["detail"])
+
+
+async def connect(url: str, headers: dict, results: dict):
+    # A busy server answers a new session with "busy" and closes; reconnect after retry_after.
+    while True:
+        ws = await websockets.connect(url, additional_headers=headers, open_timeout=60)
+        session = json.loads(await ws.recv())
+        if session["type"] != "busy":
+            return ws, session
+        results["busy"] += 1
+        await ws.close()
+        await asyncio.sleep(session["retry_after"])
+
+
+async def candidate(url: str, user_id: int, turns: int, think: float, results: dict):
+    headers = {"Cookie": f"session={create_session_token(user_id)}"}
+    started = time.perf_counter()
+    ws, session = await connect(url, headers, results)
+    async with ws:
+        end = await read_turn(ws, started, results["ttft"])
+        results["turn"].append(time.perf_counter() - started)
+        results["prompt_tokens"].setdefault(end["turn"], []).append(end["prompt_tokens"])
+        for answer in range(turns):
+            await asyncio.sleep(think)
+            started = time.perf_counter()
+            while True:
+                await ws.send(json.dumps({"type": "answer", "text": f"Answer {answer} from {user_id}: " + "details " * 60}))
+                end = await read_turn(ws, started, results["ttft"])
+                if end["type"] != "busy":
+                    break
+                results["busy"] += 1
+                await asyncio.sleep(end["retry_after"])
+            results["turn"].append(time.perf_counter() - started)
+            results["prompt_tokens"].setdefault(end["turn"], []).append(end["prompt_tokens"])
+        results["sessions"].add(session["session_id"])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Concurrent WebSocket mock interviews against a fake chat model (clients share the server's event loop)")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.4)
+    parser.add_argument("--think", type=float, default=0.2)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=0,
+        help="override the mock_interview LLM and admission caps and lift its per-user rate (default: configured limits)",
+    )
+    args = parser.parse_args()
+
+    fake = FakePostgrest()
+    for user_id in range(1, args.sessions + 1):
+        fake.tables["users"].append({"id": user_id, "name": f"Candidate {user_id}", "email": f"c{user_id}@example.com"})
+        fake.resumes[str(user_id)] = {"domain": "Web Development", "skills": [{"skill_name": "Python"}, {"skill_name": "React"}]}
+    db.url, db.key, db.transport = "http://fake", "bench", httpx.ASGITransport(app=fake.app)
+    llm.set_model(FakeChatModel(latency=args.latency, jitter=args.latency / 4))
+    if args.concurrency:
+        llm.max_concurrency = args.concurrency
+        llm.route_limits["mock_interview"] = args.concurrency
+        admission.max_in_flight["mock_interview"] = args.concurrency
+        admission.max_queue["mock_interview"] = args.sessions
+        admission.global_gate.max_in_flight = args.concurrency
+        admission.rates.pop("mock_interview", None)
+
+    import server
+
+    port = free_port()
+    config = uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning", ws_max_queue=64)
+    uv = uvicorn.Server(config)
+    serve = asyncio.create_task(uv.serve())
+    while not uv.started:
+        await asyncio.sleep(0.05)
+
+    results = {"ttft": [], "turn": [], "prompt_tokens": {}, "sessions": set(), "busy": 0}
+    url = f"ws://127.0.0.1:{port}/mock_interview/ws?domain=3"
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *[candidate(url, user_id, args.turns, args.think, results) for user_id in range(1, args.sessions + 1)],
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    held = len(interview_store)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    profile_loads = db.stats().get("rpc:get_full_candidate_profile", {}).get("calls", 0)
+
+    uv.should_exit = True
+    await serve
+
+    turns = len(results["turn"])
+    print(f"sessions: {len(results['sessions'])}/{args.sessions} completed, {len(failures)} failed, {held} held in the store")
+    if failures:
+        print(f"  first failure: {failures[0]!r}")
+    print(f"turns: {turns} in {elapsed:.1f}s ({turns / elapsed:.0f}/s), profile loads: {profile_loads}, busy replies: {results['busy']}")
+    print(
+        f"time to first token p50/p95/p99: {percentile(results['ttft'], 0.5) * 1000:.0f}/"
+        f"{percentile(results['ttft'], 0.95) * 1000:.0f}/{percentile(results['ttft'], 0.99) * 1000:.0f} ms"
+    )
+    print(
+        f"full turn p50/p95/p99: {percentile(results['turn'], 0.5) * 1000:.0f}/"
+        f"{percentile(results['turn'], 0.95) * 1000:.0f}/{percentile(results['turn'], 0.99) * 1000:.0f} ms"
+    )
+    print("prompt tokens by turn (max across sessions): " + ", ".join(
+        f"{turn}:{max(tokens)}" for turn, tokens in sorted(results["prompt_tokens"].items())
+    ))
+    print(f"max RSS grew by {(rss_after - rss_before) / 1024:.1f} MB")
+    print(f"store: {interview_store.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
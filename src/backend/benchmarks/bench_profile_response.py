@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("SESSION_SECRET", "bench-secret")
+os.environ.setdefault("RESUME_API", "unused")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+os.environ.setdefault("QUIZ_BANK_PATH", ":memory:")
+os.environ.setdefault("RESUME_STATE_PATH", ":memory:")
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.fake_postgrest import FakePostgrest
+from services import responses
+from services.db_client import db
+from services.sessions import create_session_token
+
+
+def large_resume(projects: int, skills: int) -> dict:
+    return {
+        "candidates": {
+            "phone": "+91 98765 43210",
+            "bio": "Final year CSE student who likes building data-heavy web apps. " * 4,
+            "resume_json": {"sections": [{"title": f"Section {i}", "lines": [f"Line {j} of section {i}" for j in range(8)]} for i in range(8)]},
+            "domain": "Web Development",
+        },
+        "education": [{"degree": "B.Tech", "field_of_study": "Computer Science", "college_name": "JNTU Hyderabad", "gpa": 8.4, "start_year": 2019, "end_year": 2023}],
+        "projects": [
+            {"project_name": f"Project {i}", "project_description": f"Full-stack app number {i} with React, FastAPI and PostgreSQL, deployed on AWS.", "project_link": f"https://github.com/ravi/project-{i}"}
+            for i in range(projects)
+        ],
+        "certificates": [{"certificate_name": f"Certificate {i}", "certificate_issuer": "Coursera", "certificate_date": "2023-01-01"} for i in range(10)],
+        "skills": [{"skill_name": f"Skill {i}"} for i in range(skills)],
+        "domain": "Web Development",
+        "resume_score": 82,
+    }
+
+
+def starlette_render(content) -> bytes:
+    # What FastAPI's default JSONResponse does with a returned dict.
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_dumps(content) -> bytes:
+    orjson, responses.orjson = responses.orjson, None
+    try:
+        return responses.dumps(content)
+    finally:
+        responses.orjson = orjson
+
+
+def time_per_call(func, content, repeat: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    return (time.perf_counter() - started_at) / repeat
+
+
+async def http_timings(fake: FakePostgrest, requests: int) -> dict:
+    import server
+
+    headers = {"Cookie": f"session={create_session_token(1)}"}
+    results = {}
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get("/profile", headers={**headers, "Accept-Encoding": "identity"})
+        etag = first.headers["etag"]
+        for label, extra in (
+            ("200 identity", {"Accept-Encoding": "identity"}),
+            ("200 gzip", {"Accept-Encoding": "gzip"}),
+            ("304 revalidate", {"Accept-Encoding": "gzip", "If-None-Match": etag}),
+        ):
+            latencies, sizes = [], []
+            for _ in range(requests):
+                started_at = time.perf_counter()
+                response = await client.get("/profile", headers={**headers, **extra})
+                latencies.append(time.perf_counter() - started_at)
+                sizes.append(int(response.headers.get("content-length", 0)))
+            results[label] = (response.status_code, statistics.median(latencies), statistics.median(sizes))
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="/profile serialization, compression and conditional GET")
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--skills", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    fake = FakePostgrest(latency=args.db_latency)
+    fake.tables["users"].append({"id": 1, "name": "Ravi Kumar", "email": "ravi@example.com", "password": "x"})
+    fake.resumes["1"] = large_resume(args.projects, args.skills)
+    content = {"success": True, "data": fake.profile(1)}
+
+    body = responses.dumps(content)
+    print(f"profile body {len(body)} bytes, gzip level {responses.RESPONSE_GZIP_LEVEL}: {len(gzip.compress(body, responses.RESPONSE_GZIP_LEVEL))} bytes")
+    print(f"{'serializer':<28}{'us/call':>10}")
+    for label, func in (
+        ("jsonable_encoder + json", starlette_render),
+        ("json (no encoder pass)", stdlib_dumps),
+        ("orjson" if responses.orjson else "orjson (not installed)", responses.dumps),
+        ("gzip of body", lambda _: gzip.compress(body, responses.RESPONSE_GZIP_LEVEL)),
+    ):
+        print(f"{label:<28}{time_per_call(func, content, args.repeat) * 1e6:>10.0f}")
+
+    db.url, db.key, db.transport = "http://fake", "bench", httpx.ASGITransport(app=fake.app)
+    print(f"\n{'GET /profile':<18}{'status':>7}{'bytes':>8}{'p50 ms':>9}")
+    for label, (status, latency, size) in (await http_timings(fake, args.requests)).items():
+        print(f"{label:<18}{status:>7}{size:>8.0f}{latency * 1000:>9.2f}")
+    await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
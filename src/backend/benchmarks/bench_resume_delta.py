@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("SESSION_SECRET", "bench-secret")
+os.environ.setdefault("RESUME_API", "unused")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+os.environ.setdefault("QUIZ_BANK_PATH", ":memory:")
+os.environ.setdefault("RESUME_STATE_PATH", ":memory:")
+
+import httpx
+
+from benchmarks.fake_postgrest import FakePostgrest
+from benchmarks.fakes import FakeChatModel
+from benchmarks.fixtures import make_pdf
+from routes.resume_upload import process_resume
+from services.db_client import db
+from services.llm import llm
+from services.profile_cache import profile_cache
+from services.resume_state import resume_state
+
+RESUME = {
+    "header": ["Ravi Kumar  |  ravi.kumar@example.com  |  +91 98765 43210"],
+    "Summary": ["Final year CSE student who likes building data-heavy web apps."],
+    "Education": [
+        "B.Tech Computer Science, JNTU Hyderabad, 2019-2023, CGPA 8.4",
+        "Intermediate (MPC), Sri Chaitanya Junior College, 2017-2019, 96%",
+    ],
+    "Experience": [
+        "Software Engineer Intern at DataWorks (May 2022 - Aug 2022)",
+        "Built ETL pipelines in Python and Airflow processing 2M rows per day.",
+    ],
+    "Projects": [
+        "Smart Attendance System: Face recognition attendance using OpenCV and Flask.",
+        "Crop Yield Predictor: Random forest model served with Streamlit, 91% accuracy.",
+        "Campus Connect: React Native app for event discovery with Firebase auth.",
+    ],
+    "Skills": ["Python, Java, SQL, React, Node.js, Docker, AWS", "TensorFlow, Pandas, Git, Linux"],
+    "Certifications": ["AWS Certified Cloud Practitioner - Amazon Web Services - 2022"],
+}
+
+
+def edit_project(sections):
+    sections["Projects"][1] = "Crop Yield Predictor: Gradient boosting model served with FastAPI, 94% accuracy."
+
+
+def add_certificate(sections):
+    sections["Certifications"].append("Deep Learning Specialization - Coursera - 2023")
+
+
+def edit_skills(sections):
+    sections["Skills"][0] += ", Kubernetes"
+
+
+def edit_experience(sections):
+    sections["Experience"].append("Added Redis caching that cut dashboard latency by 40%.")
+
+
+EDITS = {
+    "no change": None,
+    "fix a project": edit_project,
+    "add a certificate": add_certificate,
+    "add a skill": edit_skills,
+    "edit experience": edit_experience,
+}
+
+
+def resume_pdf(run: int, edit=None) -> bytes:
+    # `run` goes in the header so each run is a resume cache miss.
+    sections = {name: list(lines) for name, lines in RESUME.items()}
+    if edit:
+        edit(sections)
+    lines = [f"{sections.pop('header')[0]}  |  ID {run}", ""]
+    for name, entries in sections.items():
+        lines.append(f"{name}:")
+        lines.extend(f"- {entry}" for entry in entries)
+        lines.append("")
+    return make_pdf(["\n".join(lines)])
+
+
+async def reupload(fake: FakePostgrest, user_id: int, run: int, edit, incremental: bool) -> dict:
+    await process_resume(user_id, resume_pdf(run))
+    if not incremental:
+        resume_state.discard(user_id)
+    fake.rpc_bytes.clear()
+    started_at = time.perf_counter()
+    result = await process_resume(user_id, resume_pdf(run, edit))
+    tokens = result["tokens"] or {}
+    return {
+        "seconds": time.perf_counter() - started_at,
+        "input_tokens": tokens.get("prompt_tokens", 0) + tokens.get("resume_tokens", 0) + tokens.get("hint_tokens", 0),
+        "output_tokens": tokens.get("output_tokens") or 0,
+        "write_bytes": sum(fake.rpc_bytes.values()),
+        "cache": result["cache"],
+        "write": result["write"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Edit-and-re-upload: full re-analysis vs re-analysis of the edited sections only"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="re-uploads per edit and mode")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="fixed seconds per LLM call")
+    parser.add_argument("--output-token-latency", type=float, default=0.004, help="extra seconds per output token")
+    parser.add_argument(
+        "--shared-versions", action="store_true",
+        help="treat profile versions as shared (Redis), which lets an unchanged re-upload skip its write",
+    )
+    args = parser.parse_args()
+    profile_cache.versions.shared = args.shared_versions
+
+    fake = FakePostgrest()
+    db.url, db.key, db.transport = "http://fake", "bench", httpx.ASGITransport(app=fake.app)
+    llm.set_model(FakeChatModel(latency=args.llm_latency, output_token_latency=args.output_token_latency))
+
+    print(f"{'edit':<20}{'mode':<13}{'analysis':<10}{'write':<7}{'in tok':>8}{'out tok':>8}{'write B':>9}{'ms':>8}")
+    run = 0
+    for label, edit in EDITS.items():
+        for mode in ("full", "incremental"):
+            rows = []
+            for _ in range(args.runs):
+                run += 1
+                rows.append(await reupload(fake, run, run, edit, mode == "incremental"))
+            print(
+                f"{label:<20}{mode:<13}{rows[-1]['cache']:<10}{rows[-1]['write']:<7}"
+                f"{statistics.median(r['input_tokens'] for r in rows):>8.0f}"
+                f"{statistics.median(r['output_tokens'] for r in rows):>8.0f}"
+                f"{statistics.median(r['write_bytes'] for r in rows):>9.0f}"
+                f"{statistics.median(r['seconds'] for r in rows) * 1000:>8.0f}"
+            )
+    await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+from benchmarks.fixtures import load_sample_resume, synthetic_resume_pages
+from services.skill_taxonomy import SkillTaxonomy
+from services.text_normalizer import normalize_pages
+
+DOMAIN_CASES_PATH = os.path.join(os.path.dirname(__file__), "domain_cases.json")
+
+
+def load_domain_cases() -> list:
+    with open(DOMAIN_CASES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def evaluate(taxonomy: SkillTaxonomy, cases: list) -> dict:
+    # Every case carries a hand-assigned domain and the skills a reader would
+    # mark in it, named as in the taxonomy where it has them. Skills the
+    # taxonomy lacks stay in the labels and count as misses.
+    top1 = top3 = 0
+    predicted = {}
+    actual = {}
+    correct = {}
+    true_positives = extracted = labelled = 0
+    misses = []
+    for case in cases:
+        result = taxonomy.classify(case["text"])
+        top1 += result.domain == case["domain"]
+        top3 += case["domain"] in result.top_domains(3)
+        predicted[result.domain] = predicted.get(result.domain, 0) + 1
+        actual[case["domain"]] = actual.get(case["domain"], 0) + 1
+        if result.domain == case["domain"]:
+            correct[result.domain] = correct.get(result.domain, 0) + 1
+        else:
+            misses.append((case["domain"], result.domain, round(result.confidence, 2)))
+        found, expected = set(result.skills), set(case["skills"])
+        true_positives += len(found & expected)
+        extracted += len(found)
+        labelled += len(expected)
+    per_domain = {
+        domain: (correct.get(domain, 0) / predicted[domain] if predicted.get(domain) else 0.0, correct.get(domain, 0) / count)
+        for domain, count in sorted(actual.items())
+    }
+    return {
+        "top1": top1 / len(cases),
+        "top3": top3 / len(cases),
+        "per_domain": per_domain,
+        "misses": misses,
+        "skill_precision": true_positives / extracted if extracted else 0.0,
+        "skill_recall": true_positives / labelled if labelled else 0.0,
+    }
+
+
+def false_skills(taxonomy: SkillTaxonomy, cases: list) -> list:
+    return [
+        (skill, case["text"].split("\n")[0][:60])
+        for case in cases
+        for skill in taxonomy.classify(case["text"]).skills
+        if skill not in case["skills"]
+    ]
+
+
+def latency(taxonomy: SkillTaxonomy, text: str, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        taxonomy.classify(text)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy and latency of the local skill taxonomy classifier")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--verbose", action="store_true", help="list extracted skills missing from the labels")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    taxonomy = SkillTaxonomy.load()
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"taxonomy {taxonomy.version}: {len(taxonomy.skills)} skills, {taxonomy.patterns} patterns, built in {build_ms:.1f} ms")
+
+    cases = load_domain_cases()
+    scores = evaluate(taxonomy, cases)
+    print(f"{len(cases)} hand-labelled snippets: domain top-1 {scores['top1']:.1%}, top-3 {scores['top3']:.1%}")
+    print(f"skills: precision {scores['skill_precision']:.1%}, recall {scores['skill_recall']:.1%}")
+    print(f"{'domain':<26}{'precision':>10}{'recall':>8}")
+    for domain, (precision, recall) in scores["per_domain"].items():
+        print(f"{domain:<26}{precision:>10.0%}{recall:>8.0%}")
+    for expected, got, confidence in scores["misses"]:
+        print(f"  domain miss: expected {expected!r}, got {got!r} (confidence {confidence})")
+    if args.verbose:
+        for skill, line in false_skills(taxonomy, cases):
+            print(f"  extra skill {skill!r} in {line!r}")
+
+    corpus = [("sample_resume.txt", load_sample_resume())]
+    for page_count in (2, 10, 40):
+        pages = synthetic_resume_pages(page_count, seed=page_count)
+        corpus.append((f"synthetic_{page_count}p", normalize_pages(pages)))
+    # Un-normalized text shows raw scan throughput on a long document.
+    corpus.append(("synthetic_40p_raw", "\n".join(synthetic_resume_pages(40, seed=40))))
+    print(f"{'fixture':<22}{'chars':>9}{'skills':>8}{'p50 ms':>9}{'p95 ms':>9}{'MB/s':>8}")
+    for name, text in corpus:
+        skills = len(taxonomy.classify(text).skills)
+        p50, p95 = latency(taxonomy, text, args.repeat)
+        size_mb = len(text.encode("utf-8")) / 1e6
+        print(f"{name:<22}{len(text):>9}{skills:>8}{p50 * 1000:>9.2f}{p95 * 1000:>9.2f}{size_mb / p50:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
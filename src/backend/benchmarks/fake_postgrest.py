@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import itertools
+import json
+from collections import Counter
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+
+class FakePostgrest:
+    """In-memory stand-in for the PostgREST endpoints the API uses."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables = {"users": []}
+        self.resumes = {}
+        self.rpc_bytes = Counter()
+        self._ids = itertools.count(1)
+        self.app = self._build_app()
+
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    @staticmethod
+    def _filters(request: Request) -> dict:
+        return {
+            column: value[3:]
+            for column, value in request.query_params.items()
+            if value.startswith("eq.")
+        }
+
+    @staticmethod
+    def _matches(row: dict, filters: dict) -> bool:
+        return all(str(row.get(column)) == value for column, value in filters.items())
+
+    def profile(self, user_id) -> dict | None:
+        user = next((row for row in self.tables["users"] if str(row["id"]) == str(user_id)), None)
+        if user is None:
+            return None
+        resume = self.resumes.get(str(user_id), {})
+        return {
+            "user": {"id": user["id"], "name": user["name"], "email": user["email"]},
+            "candidate": resume.get("candidates"),
+            "education": resume.get("education") or [],
+            "projects": resume.get("projects") or [],
+            "certificates": resume.get("certificates") or [],
+            "skills": resume.get("skills") or [],
+            "domain": resume.get("domain"),
+            "resume_score": resume.get("resume_score"),
+        }
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/rest/v1/{table}")
+        async def select(table: str, request: Request):
+            await self._delay()
+            filters = self._filters(request)
+            return [row for row in self.tables.get(table, []) if self._matches(row, filters)]
+
+        @app.patch("/rest/v1/{table}")
+        async def update(table: str, request: Request):
+            await self._delay()
+            filters, values = self._filters(request), await request.json()
+            for row in self.tables.get(table, []):
+                if self._matches(row, filters):
+                    row.update(values)
+            return Response(status_code=204)
+
+        @app.post("/rest/v1/rpc/{name}")
+        async def rpc(name: str, request: Request):
+            await self._delay()
+            body = await request.body()
+            self.rpc_bytes[name] += len(body)
+            params = json.loads(body)
+            if name == "upsert_full_resume":
+                self.resumes[str(params["p_user_id"])] = params["data"]
+                return None
+            if name == "get_full_candidate_profile":
+                return self.profile(params["p_user_id"])
+            return JSONResponse(
+                {"code": "PGRST202", "message": f"Could not find the function public.{name}"}, status_code=404
+            )
+
+        @app.post("/rest/v1/{table}")
+        async def insert(table: str, request: Request):
+            await self._delay()
+            rows = await request.json()
+            rows = rows if isinstance(rows, list) else [rows]
+            stored = self.tables.setdefault(table, [])
+            conflict = request.query_params.get("on_conflict")
+            written = []
+            for row in rows:
+                if table == "users" and any(existing["email"] == row.get("email") for existing in stored):
+                    return JSONResponse(
+                        {"code": "23505", "message": "duplicate key value violates unique constraint"}, status_code=409
+                    )
+                existing = next((r for r in stored if conflict and r.get(conflict) == row.get(conflict)), None)
+                if existing is not None:
+                    existing.update(row)
+                    written.append(existing)
+                else:
+                    row = {"id": next(self._ids), **row}
+                    stored.append(row)
+                    written.append(row)
+            if "return=representation" in request.headers.get("prefer", ""):
+                return JSONResponse(written, status_code=201)
+            return Response(status_code=201)
+
+        return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the fake PostgREST stand-in over HTTP")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(FakePostgrest(latency=args.latency).app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import random
+import re
+import time
+import types
+import typing
+
+from annotated_types import MaxLen, MinLen
+from langchain_core.messages import AIMessageChunk
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+
+def _length_bounds(metadata) -> tuple[int, int]:
+    low, high = 1, 3
+    for item in metadata:
+        if isinstance(item, MinLen):
+            low = high = item.min_length
+        if isinstance(item, MaxLen):
+            high = min(max(low, high), item.max_length)
+    return low, max(low, high)
+
+
+def _fake_value(annotation, name: str, rng: random.Random, metadata=()):
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType):
+        non_null = [arg for arg in args if arg is not type(None)]
+        return _fake_value(non_null[0], name, rng, metadata)
+    if origin in (list, typing.List):
+        low, high = _length_bounds(metadata)
+        return [_fake_value(args[0] if args else str, name, rng) for _ in range(rng.randint(low, high))]
+    if origin in (dict, typing.Dict) or annotation is dict:
+        return {"section": f"{name} {rng.randint(1, 99)}"}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_instance(annotation, rng)
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randint(1, 100)
+    if annotation is float:
+        return round(rng.uniform(5, 10), 2)
+    return f"{name.replace('_', ' ')} {rng.randint(1, 999)}"
+
+
+def fake_instance(schema: type[BaseModel], rng: random.Random | None = None) -> BaseModel:
+    rng = rng or random.Random(0)
+    values = {
+        name: _fake_value(field.annotation, name, rng, field.metadata)
+        for name, field in schema.model_fields.items()
+    }
+    return schema.model_validate(values)
+
+
+def fake_quiz(rng: random.Random):
+    # Schema-shaped fakes would fail quiz validation (option keys, answers), so
+    # quizzes get well-formed questions with a small chance of repeats.
+    from models.quiz import QuizLLMResponse
+
+    questions = []
+    for _ in range(10):
+        topic = rng.randint(1, 400)
+        options = [{"key": key, "text": f"option {key} for topic {topic}"} for key in "ABCD"]
+        questions.append({
+            "question": f"Which statement about topic {topic} is correct?",
+            "options": options,
+            "correct_answer": rng.choice("ABCD"),
+            "explanation": f"Explanation for topic {topic}.",
+        })
+    return QuizLLMResponse.model_validate({"questions": questions})
+
+
+class FakeChatModel:
+    """Stand-in for ChatGoogleGenerativeAI that sleeps instead of calling Gemini."""
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        chunk_chars: int = 24,
+        stream_schemas: list | None = None,
+        factories: dict | None = None,
+        output_token_latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        # Extra seconds per generated token (about 4 JSON characters) for
+        # structured output, since real generation time grows with the output.
+        self.output_token_latency = output_token_latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.chunk_chars = chunk_chars
+        # Schemas the fake can recognise from json_instructions() when streaming raw JSON.
+        self.stream_schemas = stream_schemas or []
+        # Optional schema -> callable(rng) overrides for structured output.
+        self.factories = factories or {}
+        self.calls = 0
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _maybe_fail(self):
+        if self.rng.random() < self.failure_rate:
+            raise RuntimeError("503 UNAVAILABLE: fake model overloaded")
+
+    def _instance(self, schema):
+        factory = self.factories.get(schema)
+        return factory(self.rng) if factory else fake_instance(schema, self.rng)
+
+    def _output_delay(self, instance) -> float:
+        return self.output_token_latency * len(instance.model_dump_json()) / 4 if self.output_token_latency else 0.0
+
+    def with_structured_output(self, schema, **kwargs):
+        def invoke(_input):
+            self.calls += 1
+            instance = self._instance(schema)
+            time.sleep(self._delay() + self._output_delay(instance))
+            self._maybe_fail()
+            return instance
+
+        async def ainvoke(_input):
+            self.calls += 1
+            instance = self._instance(schema)
+            await asyncio.sleep(self._delay() + self._output_delay(instance))
+            self._maybe_fail()
+            return instance
+
+        return RunnableLambda(invoke, afunc=ainvoke)
+
+    def _stream_text(self, prompt: str) -> str:
+        for schema in self.stream_schemas:
+            if f'"title":"{schema.__name__}","type":"object"}}' in prompt:
+                values = fake_instance(schema, self.rng).model_dump(mode="json")
+                match = re.search(r"top-level keys in exactly this order: ([^\n.]+)", prompt)
+                order = [key.strip() for key in match.group(1).split(",")] if match else list(values)
+                return json.dumps({key: values[key] for key in order if key in values})
+        return " ".join(f"token{self.rng.randint(0, 999)}" for _ in range(40))
+
+    async def astream(self, input, **kwargs):
+        self.calls += 1
+        if isinstance(input, list):
+            # Chat history: repr() of message objects is slow enough to skew benchmarks.
+            prompt = "\n".join(str(getattr(message, "content", message)) for message in input)
+        else:
+            prompt = input if isinstance(input, str) else str(input)
+        text = self._stream_text(prompt)
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        delay = self._delay() / max(1, len(chunks))
+        self._maybe_fail()
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield AIMessageChunk(content=chunk)
@@ -0,0 +1,122 @@
+import os
+import random
+
+SAMPLE_RESUME_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "sample_resume.txt")
+
+_SECTIONS = {
+    "Education": [
+        "B.Tech Computer Science, JNTU Hyderabad, 2019-2023, CGPA 8.4",
+        "Intermediate (MPC), Sri Chaitanya Junior College, 2017-2019, 96%",
+        "SSC, Narayana High School, 2017, GPA 9.8",
+    ],
+    "Experience": [
+        "Software Engineer Intern at DataWorks (May 2022 - Aug 2022)",
+        "Built ETL pipelines in Python and Airflow processing 2M rows per day.",
+        "Reduced dashboard latency by 40% by adding Redis caching.",
+        "Wrote REST APIs with FastAPI and PostgreSQL.",
+    ],
+    "Projects": [
+        "Smart Attendance System: Face recognition attendance using OpenCV and Flask.",
+        "Crop Yield Predictor: Random forest model served with Streamlit, 91% accuracy.",
+        "Campus Connect: React Native app for event discovery with Firebase auth.",
+    ],
+    "Skills": [
+        "Python, Java, C++, JavaScript, SQL, React, Node.js, Docker, Kubernetes, AWS",
+        "TensorFlow, PyTorch, scikit-learn, Pandas, NumPy, Git, Linux",
+    ],
+    "Certifications": [
+        "AWS Certified Cloud Practitioner - Amazon Web Services - 2022",
+        "Deep Learning Specialization - Coursera - 2021",
+    ],
+}
+
+
+def load_sample_resume() -> str:
+    with open(SAMPLE_RESUME_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def synthetic_resume_pages(page_count: int, seed: int = 7, lines_per_page: int = 45) -> list[str]:
+    # Pages are drawn from the same few blocks, so most of what the normalizer
+    # removes here is duplicated text: a dedup stress case, not a typical resume.
+    rng = random.Random(seed)
+    names = list(_SECTIONS)
+    pages = []
+    for page_no in range(1, page_count + 1):
+        lines = ["Ravi Kumar  |  ravi.kumar@example.com  |  +91 98765 43210", "Curriculum Vitae", ""]
+        while len(lines) < lines_per_page:
+            section = rng.choice(names)
+            lines.append(f"{section}:")
+            for entry in _SECTIONS[section]:
+                # PDF text layers often carry ragged spacing, bullets and doubled lines.
+                padding = " " * rng.randint(1, 4)
+                lines.append(f"•{padding}{entry}{padding}")
+                if rng.random() < 0.15:
+                    lines.append(f"•{padding}{entry}")
+            lines.append("")
+        lines.extend(["", f"Page {page_no} of {page_count}", "Confidential - generated by ResumeBuilder Pro"])
+        pages.append("\n".join(lines))
+    return pages
+
+
+def distinct_resume_pages(page_count: int, seed: int = 7, lines_per_page: int = 45) -> list[str]:
+    # Every entry is unique; only the running header, the footer, the page
+    # number and ragged spacing are redundant, as in a real multi-page resume.
+    rng = random.Random(seed)
+    names = list(_SECTIONS)
+    pages = []
+    entry_no = 0
+    for page_no in range(1, page_count + 1):
+        lines = ["Ravi Kumar  |  ravi.kumar@example.com  |  +91 98765 43210", ""]
+        while len(lines) < lines_per_page:
+            section = rng.choice(names)
+            lines.append(f"{section}:")
+            for entry in _SECTIONS[section]:
+                entry_no += 1
+                padding = " " * rng.randint(1, 4)
+                lines.append(f"•{padding}{entry} (item {entry_no}, {2015 + entry_no % 9}){padding}")
+            lines.append("")
+        lines.extend(["", str(2015 + page_no % 9), str(page_no)])
+        pages.append("\n".join(lines))
+    return pages
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page in pages:
+        ops = ["BT", "/F1 9 Tf", "11 TL", "40 800 Td"]
+        for line in page.split("\n"):
+            safe = line.encode("cp1252", "replace").decode("cp1252")
+            ops.append(f"({_pdf_escape(safe)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("cp1252", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
@@ -0,0 +1,35 @@
+DOMAINS = {
+    1: "AI/ML",
+    2: "Data Science",
+    3: "Web Development",
+    4: "Mobile App Development",
+    5: "Cybersecurity",
+    6: "DevOps & Cloud",
+    7: "Blockchain",
+    8: "UI/UX Design",
+    9: "Game Development",
+    10: "Embedded Systems",
+    11: "IoT",
+    12: "Robotics",
+    13: "EEE",
+    14: "ECE",
+    15: "Mechanical Engineering",
+    16: "Civil Engineering",
+    17: "Chemical Engineering",
+    18: "Core Engineering"
+}
+DEFAULT_DOMAIN = DOMAINS[18]
+domain_text = "\n".join([f"{k} - {v}" for k, v in DOMAINS.items()])
+_BY_NAME = {name.lower(): name for name in DOMAINS.values()}
+
+
+def resolve_domain(value) -> str | None:
+    # The LLM answers with an id, a name, or "3 - Web Development"; anything
+    # that does not map onto the table is None.
+    if value is None:
+        return None
+    text = str(value).strip()
+    head = text.split("-", 1)[0].strip() if " - " in text else text
+    if head.isdigit():
+        return DOMAINS.get(int(head))
+    return _BY_NAME.get(text.lower())
@@ -57,8 +57,8 @@ class resume_upload(BaseModel):
         description="The list of skills"
     )
     education: Optional[list[education_info]] = Field(..., description="The list of education details") 
-    analysis:str=Field(..., description="give the analyis of the resume if you were an interviewer how would you feel and what must be improved")
-    resume_score:int=Field(..., description="give a score out of 100 to the resume based on the quality of the resume and how well it is structured and how well it is written and how well it is formatted and how well it is organized and how well it is presented and how well it is tailored to the job description and how well it is optimized for ATS and how well it is optimized for human readers")
-    domain:str=Field(..., description="give the domain of the resume based on the skills and experience mentioned in the resume")
-    skill_analysis:str=Field(..., description="for the domain to which the candidate belong give the analysis of what skills should the candidate improve and resources to learn them like yt channels if the candidate is good avoid this just say you are good to go")
-    suggested_projects:str=Field(..., description="for the domain to which the candidate belong give the analysis of what projects should the candidate work on to improve his resume and get more job opportunities like project ideas and resources to learn them like yt channels if the candidate is good avoid this just say you are good to go")
\ No newline at end of file
+    analysis:str=Field(..., description="Interviewer-style evaluation of the resume: strengths and what must be improved")
+    resume_score:int=Field(..., description="Resume quality score out of 100: structure, clarity, impact, ATS optimization, technical depth, presentation")
+    domain:str=Field(..., description="Primary domain of the resume based on its skills and experience")
+    skill_analysis:str=Field(..., description="Skills to improve for the domain with learning resources (e.g. YouTube channels), or 'You are good to go'")
+    suggested_projects:str=Field(..., description="2-4 project ideas for the domain with learning resources, or 'You are good to go'")
\ No newline at end of file
@@ -1,16 +1,21 @@
-from fastapi import APIRouter,Request,HTTPException,Cookie
-from services.db_client import supabase
+from fastapi import APIRouter,Depends,HTTPException,Request
+from services.db_client import get_full_candidate_profile
+from services.profile_cache import profile_cache
 from models.domain_switch import DomainSwitchRequest,DomainSwitchAnalysis
-from routes.resume_upload import model 
-from langchain_core.prompts import PromptTemplate
+from services.llm import llm
+from services.lru_cache import LRUCache
+from services.single_flight import SingleFlight
+from services.sessions import current_user_id
+from services.admission import Ticket, admission, admit
+from services.structured_stream import json_instructions, sse_event, stream_fields
+from services.responses import json_response
+from fastapi.responses import StreamingResponse
+import os
 router=APIRouter()
- 
 
-from langchain_core.prompts import PromptTemplate
-
-prompt = PromptTemplate(
-    input_variables=["user_info_json", "target_domain"],
-    template="""
+# Plain str.format template: langchain_core.prompts is slow to import and the
+# chain only ever formatted it into a single string.
+prompt = """
 You are an expert career mentor and hiring strategist.
 
 USER PROFILE (JSON):
@@ -29,22 +34,79 @@ Guidelines:
 
 Return the response as valid JSON matching the provided schema.
 """
-)
+DOMAIN_SWITCH_CACHE_MAX_ENTRIES=int(os.getenv("DOMAIN_SWITCH_CACHE_MAX_ENTRIES","1024"))
+DOMAIN_SWITCH_CACHE_TTL=float(os.getenv("DOMAIN_SWITCH_CACHE_TTL",str(24*3600)))
+analysis_cache=LRUCache(max_entries=DOMAIN_SWITCH_CACHE_MAX_ENTRIES, ttl=DOMAIN_SWITCH_CACHE_TTL)
+inflight=SingleFlight()
+def normalize_domain(target_domain: str) -> str:
+    return " ".join(target_domain.split()).casefold()
 
 @router.post("/domain_switch")
-async def domain_switch(data:DomainSwitchRequest,user_id :int=Cookie(None)):
-    if not user_id:
-        raise HTTPException(status_code=401,detail="User not logged in")
+async def domain_switch(data:DomainSwitchRequest,request:Request,user_id :str=Depends(current_user_id)):
     try:
-        response=supabase.rpc("get_full_candidate_profile",{"p_user_id":int(user_id)}).execute()
-        if not response.data:
-            raise HTTPException(status_code=404, detail="User not found")
-        structered_model = model.with_structured_output(DomainSwitchAnalysis)
-        structured_chain = prompt |  structered_model
-        result = structured_chain.invoke({
-             "user_info_json": response.data,
-              "target_domain": data.target_domain
-              })
-        return result
+        target=normalize_domain(data.target_domain)
+        if not target:
+            raise HTTPException(status_code=400, detail="Target domain is required")
+        version=await profile_cache.version(user_id)
+        key=(str(user_id), version, target)
+        result=analysis_cache.get(key)
+        if result is not None:
+            return json_response(request, result)
+        async def generate():
+            # Only the shared call takes a slot; cache hits and requests joining
+            # it do not. The ticket belongs to the task rather than to the
+            # leading request, which may disconnect while the call runs on.
+            ticket=Ticket(admission, "domain_switch", user_id)
+            await ticket.acquire()
+            try:
+                profile=await profile_cache.get(user_id, get_full_candidate_profile)
+                if not profile:
+                    raise HTTPException(status_code=404, detail="User not found")
+                analysis=await llm.ainvoke("domain_switch", llm.structured(DomainSwitchAnalysis), prompt.format(
+                    user_info_json=profile,
+                    target_domain=data.target_domain
+                ))
+            finally:
+                ticket.release()
+            if analysis is not None:
+                analysis_cache.set(key, analysis)
+            return analysis
+        return json_response(request, await inflight.do(key, generate))
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+SSE_HEADERS={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+stream_instructions=json_instructions(DomainSwitchAnalysis)
+@router.post("/domain_switch/stream")
+async def domain_switch_stream(data:DomainSwitchRequest,user_id :str=Depends(current_user_id),ticket: Ticket=Depends(admit("domain_switch"))):
+    target=normalize_domain(data.target_domain)
+    if not target:
+        raise HTTPException(status_code=400, detail="Target domain is required")
+    version=await profile_cache.version(user_id)
+    key=(str(user_id), version, target)
+    cached=analysis_cache.get(key)
+    profile=None
+    if cached is None:
+        await ticket.acquire()
+        profile=await profile_cache.get(user_id, get_full_candidate_profile)
+        if not profile:
+            raise HTTPException(status_code=404, detail="User not found")
+    async def events():
+        if cached is not None:
+            for name, value in cached.model_dump(mode="json").items():
+                yield sse_event("field", {"field": name, "value": value})
+            yield sse_event("result", cached.model_dump(mode="json"))
+            return
+        try:
+            text=prompt.format(user_info_json=profile, target_domain=data.target_domain)
+            chunks=llm.astream("domain_switch", llm.model, f"{text}\n{stream_instructions}")
+            async for name, value in stream_fields(chunks, DomainSwitchAnalysis):
+                if name is None:
+                    analysis_cache.set(key, value)
+                    yield sse_event("result", value.model_dump(mode="json"))
+                else:
+                    yield sse_event("field", {"field": name, "value": value})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
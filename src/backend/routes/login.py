@@ -1,23 +1,29 @@
 from fastapi import APIRouter, HTTPException,Response
 from models.login import login
-from services.db_client import supabase
-import bcrypt
+from services.db_client import db
+from services.passwords import hash_password, verify_password
+from services.sessions import set_session_cookie
 router=APIRouter(prefix="/login",tags=["login"])
 @router.post("/")
-def login_user(user:login,response:Response):
+async def login_user(user:login,response:Response):
     if not user.email or not user.password:
         raise HTTPException(status_code=400, detail="Email and password are required")
     try:
-        result=supabase.table("users").select("*").eq("email",user.email).execute()
-        if result.data and len(result.data) > 0:
-            if bcrypt.checkpw(user.password.encode('utf-8'), result.data[0]['password'].encode('utf-8')):
-                response.set_cookie(key="user_id", 
-                                    value=result.data[0]['id'],
-                                    samesite="lax",
-                                    secure=False,
-                                    httponly=True
-                                    )
+        db_user=await db.get_user_by_email(user.email)
+        if db_user:
+            ok,needs_rehash=await verify_password(user.password, db_user['password'])
+            if ok:
+                if needs_rehash:
+                    # The password was verified; a failed upgrade must not fail the login.
+                    try:
+                        rehashed=await hash_password(user.password)
+                        await db.update_user_password(db_user['id'], rehashed)
+                    except Exception as e:
+                        print("Warning: could not upgrade password hash for user", db_user['id'], e)
+                set_session_cookie(response, db_user['id'])
                 return {"message": "Login successful"}
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
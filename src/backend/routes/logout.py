@@ -1,11 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Response
+from services.sessions import clear_session_cookie
 router=APIRouter(prefix="/logout",tags=["logout"])
 @router.post("/")
-def logout_user():
-    response = HTTPException(status_code=200, detail="Logout successful")
+def logout_user(response: Response):
+    clear_session_cookie(response)
     response.delete_cookie(key="user_id",
                            samesite="lax",
                            secure=False,
                            httponly=True
                            )
-    return response
\ No newline at end of file
+    return {"message": "Logout successful"}
\ No newline at end of file
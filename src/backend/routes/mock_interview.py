@@ -1,8 +1,157 @@
-from fastapi import APIRouter, Request
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import SystemMessage, HumanMessage
-
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from models.domains import resolve_domain
+from services.admission import Rejected, admission
+from services.db_client import get_full_candidate_profile
+from services.interview_sessions import interview_store, clip, INTERVIEWER, CANDIDATE, INTERVIEW_PROFILE_MAX_CHARS
+from services.llm import llm
+from services.profile_cache import profile_cache
+from services.prompt_budget import LocalTokenizer
+from services.sessions import user_id_from_cookies
+from services.structured_stream import chunk_text
+import json
+import math
+import time
 
 
 router = APIRouter(prefix="/mock_interview", tags=["mock_interview"])
+##------------------------------------------------------------------------------------------------------------------
+system_prompt = """
+You are a senior interviewer running a mock technical interview for the {domain} domain.
+Rules:
+1. Ask exactly one question per turn.
+2. After each candidate answer, give one or two sentences of honest feedback, then ask the next question.
+3. Base questions on the candidate's profile and adapt difficulty to their answers.
+4. Keep every turn under 120 words. Do NOT return markdown.
+CANDIDATE PROFILE (JSON):
+{profile}
+EARLIER IN THIS INTERVIEW:
+{summary}
+"""
+OPENING = "Start the interview with a one-line greeting and your first question."
+tokenizer=LocalTokenizer()
+##------------------------------------------------------------------------------------------------------------------
+def build_messages(session) -> list:
+    # Fixed shape: system prompt (profile + bounded summary), the opener and at
+    # most INTERVIEW_RECENT_MESSAGES verbatim turns, so prompts stay flat.
+    from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
+
+    messages=[
+        SystemMessage(content=system_prompt.format(
+            domain=session.domain,
+            profile=session.profile,
+            summary=session.summary_text() or "(nothing yet)",
+        )),
+        HumanMessage(content=OPENING),
+    ]
+    for role, text in session.recent:
+        messages.append(AIMessage(content=text) if role==INTERVIEWER else HumanMessage(content=text))
+    return messages
+async def stream_turn(websocket: WebSocket, session):
+    messages=build_messages(session)
+    parts=[]
+    stream=llm.astream("mock_interview", llm.model, messages)
+    try:
+        async for chunk in stream:
+            text=chunk_text(chunk)
+            if text:
+                parts.append(text)
+                await websocket.send_json({"type": "token", "text": text})
+    finally:
+        # Closed explicitly so a client disconnect releases the LLM slot at once.
+        await stream.aclose()
+    session.add(INTERVIEWER, "".join(parts))
+    await websocket.send_json({
+        "type": "turn_end",
+        "turn": session.turns,
+        "prompt_tokens": sum(tokenizer.count(message.content) for message in messages),
+    })
+@asynccontextmanager
+async def turn_slot(user_id):
+    # Every interviewer turn passes the same per-user rate and in-flight/queue
+    # gates as the HTTP LLM routes; Rejected is raised before anything runs.
+    admission.check_rate("mock_interview", user_id)
+    held=await admission.acquire("mock_interview")
+    started=time.perf_counter()
+    try:
+        yield
+    finally:
+        admission.release(held, time.perf_counter()-started)
+async def send_busy(websocket: WebSocket, e: Rejected):
+    await websocket.send_json({"type": "busy", "detail": e.reason, "retry_after": max(1, math.ceil(e.retry_after))})
+def parse_answer(raw: str) -> tuple:
+    if raw.lstrip().startswith("{"):
+        try:
+            message=json.loads(raw)
+        except ValueError:
+            return "invalid", None
+        if not isinstance(message, dict):
+            return "invalid", None
+        return message.get("type", "answer"), message.get("text")
+    return "answer", raw
+##------------------------------------------------------------------------------------------------------------------
+@router.websocket("/ws")
+async def mock_interview(websocket: WebSocket, domain: str | None = None, session_id: str | None = None):
+    user_id=user_id_from_cookies(websocket.cookies)
+    if not user_id:
+        await websocket.close(code=1008, reason="User not logged in")
+        return
+    await websocket.accept()
+    try:
+        session=interview_store.get(session_id, user_id) if session_id else None
+        if session is not None:
+            await websocket.send_json({"type": "session", "session_id": session.id, "resumed": True, "turn": session.turns})
+        else:
+            try:
+                async with turn_slot(user_id):
+                    profile=await profile_cache.get(user_id, get_full_candidate_profile)
+                    if not profile:
+                        await websocket.send_json({"type": "error", "detail": "User not found"})
+                        await websocket.close()
+                        return
+                    session=interview_store.create(
+                        user_id,
+                        resolve_domain(domain) or "the candidate's primary",
+                        clip(json.dumps(profile, separators=(",", ":"), default=str), INTERVIEW_PROFILE_MAX_CHARS),
+                    )
+                    await websocket.send_json({"type": "session", "session_id": session.id, "resumed": False, "turn": 0})
+                    async with session.lock:
+                        await stream_turn(websocket, session)
+            except Rejected as e:
+                # No session was created; the client reconnects after retry_after.
+                await send_busy(websocket, e)
+                await websocket.close(code=1013)
+                return
+        while True:
+            kind, text=parse_answer(await websocket.receive_text())
+            if kind=="end":
+                interview_store.close(session.id)
+                await websocket.close()
+                return
+            if kind!="answer" or not isinstance(text, str) or not text.strip():
+                await websocket.send_json({"type": "error", "detail": "Send an answer as text or {\"type\": \"answer\", \"text\": ...}"})
+                continue
+            if not interview_store.contains(session):
+                await websocket.send_json({"type": "error", "detail": "Interview session expired"})
+                await websocket.close()
+                return
+            try:
+                async with session.lock, turn_slot(user_id):
+                    interview_store.touch(session)
+                    session.add(CANDIDATE, text)
+                    await stream_turn(websocket, session)
+            except Rejected as e:
+                # The answer was not recorded; the client sends it again after retry_after.
+                await send_busy(websocket, e)
+    except WebSocketDisconnect:
+        # The session stays in the store so the client can reconnect with session_id.
+        return
+    except Exception as e:
+        try:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+@router.get("/stats")
+def mock_interview_stats():
+    return interview_store.stats()
@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Request, HTTPException
-from  services.db_client import supabase
+from fastapi import APIRouter, Depends, HTTPException, Request
+from services.db_client import get_full_candidate_profile
+from services.profile_cache import profile_cache
+from services.responses import json_response, make_etag, not_modified
+from services.sessions import current_user_id
 import os
 
+# Bump when the response shape changes, so clients do not revalidate an old body.
+PROFILE_RESPONSE_VERSION = "1"
+# Stored by the browser but revalidated on every dashboard load.
+PROFILE_HEADERS = {"Cache-Control": "private, no-cache"}
+
 router = APIRouter()
 @router.get("/profile")
-async def get_profile(request: Request):
-    user_id = request.cookies.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="User not logged in")
+async def get_profile(request: Request, user_id: str = Depends(current_user_id)):
     try:
-        response = supabase.rpc("get_full_candidate_profile", {"p_user_id": int(user_id)}).execute()
-        if not response.data:
+        # The profile version is bumped on every resume write, so it names the
+        # contents without loading them.
+        validator = await profile_cache.validator(user_id)
+        etag = make_etag(PROFILE_RESPONSE_VERSION, user_id, validator) if validator is not None else None
+        if etag is not None:
+            response = not_modified(request, etag, PROFILE_HEADERS)
+            if response is not None:
+                return response
+        data = await profile_cache.get(user_id, get_full_candidate_profile)
+        if not data:
             raise HTTPException(status_code=404, detail="User not found")
-        return {
+        return json_response(request, {
             "success": True,
-            "data": response.data
-        }
+            "data": data
+        }, etag=etag, headers=PROFILE_HEADERS)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
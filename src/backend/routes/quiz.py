@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from models.domains import resolve_domain
+from services.quiz_bank import quiz_bank, QUIZ_DIFFICULTIES
+from services.sessions import current_user_id
+
+
+router=APIRouter(prefix="/quiz", tags=["Quiz"])
+@router.get("/")
+async def get_quiz(domain: str, difficulty: str = "medium", user_id: str = Depends(current_user_id)):
+    resolved=resolve_domain(domain)
+    if resolved is None:
+        raise HTTPException(status_code=400, detail="Unknown domain")
+    difficulty=difficulty.strip().lower()
+    if difficulty not in QUIZ_DIFFICULTIES:
+        raise HTTPException(status_code=400, detail=f"Difficulty must be one of: {', '.join(QUIZ_DIFFICULTIES)}")
+    try:
+        questions=await quiz_bank.next_quiz(user_id, resolved, difficulty)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Could not generate quiz questions: {e}", headers={"Retry-After": "30"})
+    if questions is None:
+        raise HTTPException(status_code=503, detail="Quiz bank is being refilled, please retry shortly", headers={"Retry-After": "30"})
+    return {"domain": resolved, "difficulty": difficulty, "questions": questions}
+@router.get("/bank/stats")
+def quiz_bank_stats():
+    return quiz_bank.stats()
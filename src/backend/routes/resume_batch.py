@@ -0,0 +1,137 @@
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from routes.resume_upload import analyze_resume, ai_analysis_of
+from services.db_client import db
+from services.pdf_extract import PDF_MAX_BYTES, PDFRejected, check_pdf_header, read_pdf_upload
+from services.profile_cache import profile_cache
+from services.resume_state import resume_state
+from services.sessions import current_user_id
+import asyncio
+import json
+import os
+import re
+import time
+import zipfile
+##------------------------------------------------------------------------------------------------------------------
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_UPSERT_SIZE = int(os.getenv("BATCH_UPSERT_SIZE", "20"))
+# Comma separated user ids (placement cell accounts) allowed to upload on behalf of students.
+BATCH_UPLOAD_ADMINS = {item.strip() for item in os.getenv("BATCH_UPLOAD_ADMINS", "").split(",") if item.strip()}
+ZIP_MAGIC = b"PK\x03\x04"
+# Each resume is named after the student it belongs to: "<user_id>.pdf" or "<user_id>_anything.pdf".
+_OWNER = re.compile(r"^(\d+)(?:[_\-. ].*)?$")
+##------------------------------------------------------------------------------------------------------------------
+class BatchItem:
+    def __init__(self, name: str, read):
+        self.name = name
+        self.read = read
+        stem = os.path.splitext(os.path.basename(name))[0]
+        match = _OWNER.match(stem)
+        self.user_id = match.group(1) if match else None
+def _zip_items(upload: UploadFile) -> list:
+    archive = zipfile.ZipFile(upload.file)
+    items = []
+    for info in archive.infolist():
+        if info.is_dir() or os.path.basename(info.filename).startswith("."):
+            continue
+        def read(info=info):
+            # Members are only inflated when a worker picks them up, and never past the PDF cap.
+            if info.file_size > PDF_MAX_BYTES:
+                raise PDFRejected(f"PDF exceeds the {PDF_MAX_BYTES} byte limit", status_code=413)
+            with archive.open(info) as member:
+                data = member.read(PDF_MAX_BYTES + 1)
+            if len(data) > PDF_MAX_BYTES:
+                raise PDFRejected(f"PDF exceeds the {PDF_MAX_BYTES} byte limit", status_code=413)
+            check_pdf_header(data)
+            return data
+        items.append(BatchItem(info.filename, lambda read=read: run_in_threadpool(read)))
+    return items
+async def collect_items(files: list) -> list:
+    items = []
+    for upload in files:
+        head = await upload.read(len(ZIP_MAGIC))
+        await upload.seek(0)
+        if head == ZIP_MAGIC:
+            try:
+                items.extend(await run_in_threadpool(_zip_items, upload))
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"{upload.filename} is not a valid zip archive")
+        else:
+            items.append(BatchItem(upload.filename or "resume.pdf", lambda upload=upload: read_pdf_upload(upload)))
+        if len(items) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"A batch can contain at most {BATCH_MAX_FILES} resumes")
+    return items
+##------------------------------------------------------------------------------------------------------------------
+async def ingest(items: list):
+    results = asyncio.Queue()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    pending = []
+    write_lock = asyncio.Lock()
+    started_at = time.time()
+    counts = {"ok": 0, "error": 0}
+
+    def emit(item, **fields):
+        counts["ok" if fields["status"] == "ok" else "error"] += 1
+        results.put_nowait({"file": item.name, "user_id": item.user_id, **fields})
+
+    async def flush():
+        async with write_lock:
+            batch = pending[:]
+            pending.clear()
+            if not batch:
+                return
+            outcomes = await db.upsert_full_resumes([(item.user_id, json_response) for item, json_response, _, _ in batch])
+            for (item, json_response, cache_status, usage), outcome in zip(batch, outcomes):
+                if isinstance(outcome, Exception):
+                    emit(item, status="error", error=str(outcome))
+                    continue
+                # The stored analysis is no longer what a re-upload should be diffed against.
+                await asyncio.to_thread(resume_state.discard, item.user_id)
+                await profile_cache.invalidate(item.user_id)
+                emit(item, status="ok", cache=cache_status, tokens=usage, data=ai_analysis_of(json_response))
+
+    async def process(item):
+        if item.user_id is None:
+            emit(item, status="error", error="File name must start with the student's user id")
+            return
+        async with semaphore:
+            try:
+                response, cache_status, usage, _ = await analyze_resume(await item.read())
+            except PDFRejected as e:
+                emit(item, status="error", error=e.detail)
+                return
+            except Exception as e:
+                emit(item, status="error", error=str(e))
+                return
+        pending.append((item, response.model_dump(), cache_status, usage))
+        if len(pending) >= BATCH_UPSERT_SIZE:
+            await flush()
+
+    async def run():
+        try:
+            await asyncio.gather(*(process(item) for item in items))
+            await flush()
+        finally:
+            results.put_nowait(None)
+
+    runner = asyncio.create_task(run())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            yield json.dumps(result, default=str) + "\n"
+        yield json.dumps({"summary": {**counts, "total": len(items), "processing_time": time.time() - started_at}}) + "\n"
+    finally:
+        if not runner.done():
+            runner.cancel()
+##------------------------------------------------------------------------------------------------------------------
+router = APIRouter(prefix="/resume", tags=["Resume Upload"])
+@router.post("/batch")
+async def upload_resume_batch(files: list[UploadFile] = File(...), user_id: str = Depends(current_user_id)):
+    if user_id not in BATCH_UPLOAD_ADMINS:
+        raise HTTPException(status_code=403, detail="Batch upload is limited to placement cell accounts")
+    items = await collect_items(files)
+    return StreamingResponse(ingest(items), media_type="application/x-ndjson")
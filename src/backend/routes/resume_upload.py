@@ -1,40 +1,29 @@
-from fastapi import APIRouter, File, UploadFile, Request, HTTPException
-from models.upload_resume import resume_upload
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_core.prompts import ChatPromptTemplate
-from services.db_client import supabase
-import tempfile
-import os
-import re
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from models.upload_resume import resume_upload, skills_info
+from models.domains import DEFAULT_DOMAIN, domain_text, resolve_domain
+from services.db_client import db
+from services.resume_cache import ResumeCache
+from services.llm import llm, LLM_MODEL_NAME
+from services.profile_cache import profile_cache
+from services.sessions import current_user_id
+from services.ap_scheduler import scheduler, QUEUED, SchedulerBusy
+from services.admission import Ticket, admit
+from services.pdf_extract import PDFRejected, extract_pages, read_pdf_upload
+from services.text_normalizer import normalize_pages
+from services.structured_stream import json_instructions, sse_event, stream_fields
+from services.prompt_budget import PromptAssembler, PROMPT_INPUT_TOKEN_BUDGET
+from services.skill_taxonomy import skill_taxonomy, taxonomy_file_version
+from services.resume_delta import EVALUATION_FIELDS, group_texts, merge_update, partial_model, plan_update, same_analysis, section_fingerprints, unchanged_text
+from services.resume_state import resume_state
+from services import metrics
+from fastapi.responses import StreamingResponse
+import asyncio
+import hashlib
+import json
+import math
 import time 
 ##------------------------------------------------------------------------------------------------------------------
-DOMAINS = {
-    1: "AI/ML",
-    2: "Data Science",
-    3: "Web Development",
-    4: "Mobile App Development",
-    5: "Cybersecurity",
-    6: "DevOps & Cloud",
-    7: "Blockchain",
-    8: "UI/UX Design",
-    9: "Game Development",
-    10: "Embedded Systems",
-    11: "IoT",
-    12: "Robotics",
-    13: "EEE",
-    14: "ECE",
-    15: "Mechanical Engineering",
-    16: "Civil Engineering",
-    17: "Chemical Engineering",
-    18: "Core Engineering"
-}
-domain_text = "\n".join([f"{k} - {v}" for k, v in DOMAINS.items()])
-##------------------------------------------------------------------------------------------------------------------
-##------------------------------------------------------------------------------------------------------------------
-api_key=os.getenv("RESUME_API")
-model=ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.1, google_api_key=api_key)
-structured_model=model.with_structured_output(resume_upload)
 prompt = f"""
 You are an expert resume parsing and evaluation system.
 Your task is to extract structured information from the given resume text.
@@ -107,64 +96,274 @@ Provide:
 If the text is not a valid resume, return an empty JSON object.
 Return structured output now.
 """
+update_prompt = f"""
+You are an expert resume parsing and evaluation system.
+The candidate edited their resume and uploaded it again. Only the sections under CHANGED SECTIONS differ
+from the previous upload; UNCHANGED SECTIONS after them are the rest of the resume, already extracted.
+You MUST follow these rules strictly:
+1. Re-extract only the fields named under RE-EXTRACT, from the changed sections only. Read the unchanged
+   sections for the evaluation only.
+2. Extract only information explicitly present in the resume. Do NOT hallucinate or invent missing data.
+3. If a re-extracted section is empty or was removed, return null for that field.
+4. Dates must be in ISO format (YYYY-MM-DD) if available.
+5. Skills are individual technical skills as separate entries, without duplicates.
+6. Then evaluate the whole resume again, changed and unchanged parts together, and fill in the
+   EVALUATION SECTION below.
+7.speak like you are giving a feedback to your friend address the user as you need to improve etc etc 
+-------------------------
+DOMAIN CLASSIFICATION:
+Based strictly on the candidate’s skills, education, and projects,
+select ONLY ONE primary domain from the list below:
+{domain_text}
+If no clear domain can be identified, return core engineering.
+-------------------------
+EVALUATION SECTION:
+Provide:
+- analysis:
+  A short interviewer-style evaluation of the resume.
+  Mention strengths and weaknesses.
+- resume_score:
+  Score out of 100 based on:
+  structure, clarity, impact, ATS optimization, technical depth, and presentation.
+- skill_analysis:
+  Based on the selected domain, suggest what skills the candidate should improve.
+  If the candidate is strong and industry-ready, say:
+  "You are good to go."
+- suggested_projects:
+  Suggest 2-4 strong project ideas relevant to the domain to improve job opportunities.
+  If already strong, say:
+  "You are good to go."
+-------------------------
+Return structured output now.
+"""
+AI_ANALYSIS_KEYS=["analysis","resume_score","skill_analysis","suggested_projects"]
+resume_schema_text=json.dumps(resume_upload.model_json_schema(), sort_keys=True)
+resume_stream_instructions=json_instructions(resume_upload, AI_ANALYSIS_KEYS)
+# Static instructions and schema always come first, byte-identical, so provider prefix caching applies.
+resume_prompt=PromptAssembler(f"{prompt}\n\n resume_text:", static_extra=resume_schema_text)
+resume_stream_prompt=PromptAssembler(f"{prompt}\n{resume_stream_instructions}\n\n resume_text:")
+resume_update_prompt=PromptAssembler(f"{update_prompt}\n\nCHANGED SECTIONS:\n")
+PROMPT_VERSION=hashlib.sha256(
+    (LLM_MODEL_NAME + prompt + update_prompt + resume_schema_text + str(PROMPT_INPUT_TOKEN_BUDGET) + taxonomy_file_version()).encode("utf-8")
+).hexdigest()[:16]
+resume_cache=ResumeCache(PROMPT_VERSION)
 ##------------------------------------------------------------------------------------------------------------------
-def clean_resume_text(text: str) -> str:
-    text=text.replace("\r", "\n")
-    text = re.sub(r"\n{2,}", "\n", text)
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    lines=text.split("\n")
-    cleaned_lines=[]
-    prev_line=""
-    for line in lines:
-        line=line.strip()
-        if line and line!=prev_line:
-            cleaned_lines.append(line)
-        prev_line=line
-    text="\n".join(cleaned_lines)
-    parts=text.split("\n\n")
-    unique_parts=list(dict.fromkeys(parts))
-    text="\n\n".join(unique_parts)
-    return text.strip()
+def taxonomy_hints(result, skills: bool = True) -> str:
+    # Each hint carries its own instruction, so a prompt without it pays
+    # nothing. DETECTED SKILLS costs roughly a third of the skill entries the
+    # model no longer writes out, so it is only sent when skills are being
+    # extracted; LIKELY DOMAINS only when the local classification is confident.
+    lines=[]
+    if skills and result.skills:
+        lines.append("DETECTED SKILLS (already extracted; return only technical skills missing from this list): " + ", ".join(result.skills))
+    if result.confident:
+        lines.append("LIKELY DOMAINS (prefer one unless the resume clearly points elsewhere): " + ", ".join(result.top_domains()))
+    return "\n".join(lines)
+def apply_taxonomy(response, result):
+    # Locally detected skills come first (in resume order), the LLM only adds
+    # what the taxonomy missed; an unknown or missing domain falls back to the
+    # local classification when it is confident, else to the default domain.
+    taxonomy=skill_taxonomy()
+    seen=set()
+    skills=[]
+    for name in result.skills + [skill.skill_name for skill in response.skills or []]:
+        key=(taxonomy.canonical(name) or name).strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            skills.append(name)
+    response.skills=[skills_info(skill_name=name) for name in skills] or None
+    response.domain=resolve_domain(response.domain) or (result.domain if result.confident else DEFAULT_DOMAIN)
+    response.candidates.domain=resolve_domain(response.candidates.domain) or response.domain
+    return response
 ##------------------------------------------------------------------------------------------------------------------
+async def reanalyze_changed(cleaned_text: str, taxonomy_result, previous: dict):
+    # Patches the previous analysis when only list sections were edited:
+    # returns (response, cache_status, usage), or None for a full analysis.
+    texts=group_texts(cleaned_text)
+    fields=plan_update(previous["fingerprints"], texts)
+    if fields is None:
+        return None
+    if not fields:
+        return resume_upload.model_validate(previous["response"]), "unchanged", None
+    # The evaluation judges the whole resume, so the unchanged sections go
+    # along as context; the fields they hold are kept from `previous`.
+    changed="\n".join(texts.get(field) or f"{field.upper()}: (section removed)" for field in fields)
+    resume_text=f"{changed}\n\nUNCHANGED SECTIONS:\n{unchanged_text(cleaned_text, fields)}"
+    hints="\n".join(line for line in (
+        "RE-EXTRACT: " + ", ".join(fields),
+        taxonomy_hints(taxonomy_result, skills="skills" in fields),
+    ) if line)
+    schema=partial_model(tuple(fields) + EVALUATION_FIELDS)
+    assembled=resume_update_prompt.assemble(resume_text, hints)
+    update=await llm.ainvoke("resume", llm.structured(schema), assembled.text)
+    if update is None:
+        return None
+    response=resume_upload.model_validate(merge_update(previous["response"], update.model_dump()))
+    apply_taxonomy(response, taxonomy_result)
+    usage=assembled.usage(resume_update_prompt.count(update.model_dump_json()))
+    usage["prompt_tokens"]+=resume_update_prompt.count(json.dumps(schema.model_json_schema(), sort_keys=True))
+    usage["reextracted"]=fields
+    return response, "partial", usage
+async def analyze_resume(data: bytes, previous: dict | None = None):
+    # `previous` is the user's resume_state entry, if any; the returned section
+    # fingerprints go back into it once the result has been written.
+    with metrics.stage("pdf_load"):
+        pages = await run_in_threadpool(extract_pages, data)
+    with metrics.stage("text_clean"):
+        cleaned_text = normalize_pages(pages)
+    with metrics.stage("skill_taxonomy"):
+        taxonomy_result=skill_taxonomy().classify(cleaned_text)
+    # Visible on GET /resume/jobs/{id} while the LLM call is still running.
+    await scheduler.report_progress(taxonomy_result.as_dict())
+    fingerprints=section_fingerprints(cleaned_text)
+    cache_key=resume_cache.key(cleaned_text)
+    response=resume_cache.get(cache_key)
+    cache_status="hit" if response is not None else "miss"
+    usage=None
+    if response is None and previous is not None:
+        patched=await reanalyze_changed(cleaned_text, taxonomy_result, previous)
+        if patched is not None:
+            response, cache_status, usage = patched
+            resume_cache.set(cache_key,response)
+    if response is None:
+        assembled=resume_prompt.assemble(cleaned_text, taxonomy_hints(taxonomy_result))
+        response=await llm.ainvoke("resume", llm.structured(resume_upload), assembled.text)
+        if response is None:
+            raise ValueError("Could not extract structured data from the resume")
+        apply_taxonomy(response, taxonomy_result)
+        resume_cache.set(cache_key,response)
+        usage=assembled.usage(resume_prompt.count(response.model_dump_json()))
+    resume_state.analyses[cache_status]+=1
+    return response, cache_status, usage, fingerprints
+def ai_analysis_of(json_response: dict) -> dict:
+    return {k:json_response[k] for k in AI_ANALYSIS_KEYS if k in json_response}
+async def previous_analysis(user_id):
+    return await asyncio.to_thread(resume_state.get, user_id, PROMPT_VERSION, await profile_cache.stamp(user_id))
+async def save_resume(user_id, json_response: dict, fingerprints: dict, previous: dict | None) -> str:
+    # Skips the write when nothing changed since `previous` and it still
+    # matches the stored profile, otherwise upserts the full resume. Returns
+    # the write made. Only a shared version store sees writes made by other
+    # workers and instances, so with a local one the stored profile may have
+    # moved on without the stamp changing, and the write always happens.
+    async with resume_state.lock(user_id):
+        if previous is not None and previous["profile_stamp"]!=await profile_cache.stamp(user_id):
+            previous=None
+        if previous is not None and profile_cache.versions.shared and same_analysis(previous["response"], json_response):
+            write="skipped"
+        else:
+            await db.upsert_full_resume(user_id, json_response)
+            write="full"
+        if write=="skipped":
+            stamp=previous["profile_stamp"]
+        else:
+            stamp=await profile_cache.stamp(user_id, await profile_cache.invalidate(user_id))
+        await asyncio.to_thread(resume_state.set, user_id, PROMPT_VERSION, stamp, fingerprints, json_response)
+    resume_state.writes[write]+=1
+    return write
+async def process_resume(user_id, data: bytes):
+    start_time=time.time()
+    previous=await previous_analysis(user_id)
+    response, cache_status, usage, fingerprints = await analyze_resume(data, previous)
+    json_response=response.model_dump()
+    write=await save_resume(user_id, json_response, fingerprints, previous)
+    latency=time.time()-start_time
+    return {"data": ai_analysis_of(json_response), "processing_time": latency, "cache": cache_status, "tokens": usage, "write": write}
 ##------------------------------------------------------------------------------------------------------------------
 router = APIRouter(prefix="/resume", tags=["Resume Upload"])
-@router.post("/")
-def upload_resume(request:Request,file: UploadFile = File(...)):
-    user_id=request.cookies.get("user_id")
-    start_time=time.time()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(file.file.read())
-        tmp_path = tmp.name
+@router.post("/", status_code=202)
+async def upload_resume(file: UploadFile = File(...), user_id: str = Depends(current_user_id), ticket: Ticket = Depends(admit("resume"))):
+    # The job queue does the in-flight limiting here; only the user's rate is checked.
+    ticket.check_rate()
+    try:
+        data=await read_pdf_upload(file)
+    except PDFRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    try:
+        job_id=await scheduler.submit("resume", user_id, process_resume, user_id, data)
+    except SchedulerBusy as e:
+        raise HTTPException(status_code=429, detail="Too many resumes are being processed, please retry shortly", headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    return {"message": "Resume accepted for processing", "job_id": job_id, "status": QUEUED}
+@router.post("/stream")
+async def upload_resume_stream(file: UploadFile = File(...), user_id: str = Depends(current_user_id), ticket: Ticket = Depends(admit("resume"))):
     try:
-        loader = PyPDFLoader(tmp_path)
-        pages = loader.load()
-        full_text = "\n".join(page.page_content for page in pages)
-        cleaned_text = clean_resume_text(full_text)
-        response=structured_model.invoke(f"{prompt}\n\n resume_text:{cleaned_text}")
-        json_response=response.model_dump()
-        result = supabase.rpc(
-            "upsert_full_resume",
-            {
-                "p_user_id":user_id,
-                "data": json_response
-            }
-        ).execute()
-        #return {"message": "Resume uploaded and processed successfully", "data": json_response}
-        list=["analysis","resume_score","skill_analysis","suggested_projects"]
-        ai_analysis={}
-        for k in json_response.keys():
-            if k in list:
-                ai_analysis[k]=json_response[k]
-        end_time=time.time()
-        latency=end_time-start_time
-        #print(json_response)
-        return {"message": "Resume uploaded and processed successfully", "data": ai_analysis, "processing_time": latency}
-    except Exception as e:
-        return {"error": str(e)}
-    finally:
-        os.remove(tmp_path)
+        data=await read_pdf_upload(file)
+    except PDFRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    # Held until the stream ends (released by the admit() dependency).
+    await ticket.acquire()
+    async def events():
+        start_time=time.time()
+        try:
+            with metrics.stage("pdf_load"):
+                pages = await run_in_threadpool(extract_pages, data)
+            with metrics.stage("text_clean"):
+                cleaned_text = normalize_pages(pages)
+            with metrics.stage("skill_taxonomy"):
+                taxonomy_result=skill_taxonomy().classify(cleaned_text)
+            yield sse_event("provisional", taxonomy_result.as_dict())
+            previous=await previous_analysis(user_id)
+            fingerprints=section_fingerprints(cleaned_text)
+            cache_key=resume_cache.key(cleaned_text)
+            response=resume_cache.get(cache_key)
+            cache_status="hit" if response is not None else "miss"
+            usage=None
+            if response is None and previous is not None:
+                # A patched re-upload is small enough that streaming it buys little.
+                patched=await reanalyze_changed(cleaned_text, taxonomy_result, previous)
+                if patched is not None:
+                    response, cache_status, usage = patched
+                    resume_cache.set(cache_key,response)
+                    for name, value in ai_analysis_of(response.model_dump(mode="json")).items():
+                        yield sse_event("field", {"field": name, "value": value})
+            if response is None:
+                assembled=resume_stream_prompt.assemble(cleaned_text, taxonomy_hints(taxonomy_result))
+                chunks=llm.astream("resume", llm.model, assembled.text)
+                async for name, value in stream_fields(chunks, resume_upload):
+                    if name is None:
+                        response=value
+                    elif name in AI_ANALYSIS_KEYS:
+                        yield sse_event("field", {"field": name, "value": value})
+                apply_taxonomy(response, taxonomy_result)
+                resume_cache.set(cache_key,response)
+                usage=assembled.usage(resume_stream_prompt.count(response.model_dump_json()))
+            else:
+                for name, value in ai_analysis_of(response.model_dump(mode="json")).items():
+                    yield sse_event("field", {"field": name, "value": value})
+            resume_state.analyses[cache_status]+=1
+            json_response=response.model_dump()
+            write=await save_resume(user_id, json_response, fingerprints, previous)
+            yield sse_event("result", {
+                "data": ai_analysis_of(json_response),
+                "processing_time": time.time()-start_time,
+                "cache": cache_status,
+                "tokens": usage,
+                "write": write,
+            })
+        except PDFRejected as e:
+            yield sse_event("error", {"detail": e.detail})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+@router.get("/jobs/{job_id}")
+def get_resume_job(job_id: str, user_id: str = Depends(current_user_id)):
+    job=scheduler.store.get(job_id)
+    if job is None or job["kind"]!="resume" or job["user_id"]!=str(user_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    result=job["result"] or {}
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "ai_analysis": result.get("data"),
+        "processing_time": result.get("processing_time"),
+        "cache": result.get("cache"),
+        "tokens": result.get("tokens"),
+        "write": result.get("write"),
+        "provisional": job["progress"],
+        "error": job["error"],
+    }
+@router.get("/cache/stats")
+def resume_cache_stats():
+    return resume_cache.stats()
 ##------------------------------------------------------------------------------------------------------------------
 # def validate_resume(text: str) -> bool:
 #     resume_keywords = [
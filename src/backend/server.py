@@ -1,19 +1,97 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 load_dotenv()
-from services.db_client import supabase
+from services.db_client import db
+from services.ap_scheduler import scheduler
+from services.quiz_bank import quiz_bank
+from services.interview_sessions import interview_store
+from services.llm import llm
+from services.profile_cache import profile_cache
+from services.resume_state import resume_state
+from services import metrics, passwords, pdf_extract
+from services.metrics import MetricsMiddleware
+from services.skill_taxonomy import skill_taxonomy
+from services.warmup import warmup
+from services.admission import admission
+from models.upload_resume import resume_upload as resume_schema
+from models.domain_switch import DomainSwitchAnalysis
+from models.quiz import QuizLLMResponse
 
-from routes import login,register,logout,profile,resume_upload,domain_switch
+from routes import login,register,logout,profile,resume_upload,resume_batch,domain_switch,quiz,mock_interview
 
 app=FastAPI()
+# Bounds single-resume request bodies before Starlette spools them; innermost, so
+# the 413 still gets CORS headers and is counted in /metrics.
+app.add_middleware(pdf_extract.UploadLimitMiddleware, limits={
+    path: pdf_extract.PDF_MAX_BYTES + pdf_extract.PDF_UPLOAD_OVERHEAD_BYTES for path in ("/resume/", "/resume/stream")
+})
 app.add_middleware( CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(MetricsMiddleware)
 app.include_router(login.router)
 app.include_router(register.router)
 app.include_router(logout.router)
 app.include_router(resume_upload.router)
+app.include_router(resume_batch.router)
 app.include_router(profile.router)
 app.include_router(domain_switch.router)
+app.include_router(quiz.router)
+app.include_router(mock_interview.router)
+warmup.add("llm", lambda: llm.warm_up([resume_schema, DomainSwitchAnalysis, QuizLLMResponse]))
+warmup.add("skill_taxonomy", skill_taxonomy)
+warmup.add("pdf_reader", pdf_extract.warm_up)
+warmup.add("bcrypt_pool", passwords.warm_up)
+@app.on_event("startup")
+async def start_services():
+    await db.start()
+    await scheduler.start()
+    await quiz_bank.start()
+    await interview_store.start()
+    warmup.start()
+@app.on_event("shutdown")
+async def stop_services():
+    await warmup.stop()
+    await scheduler.stop()
+    await quiz_bank.stop()
+    await interview_store.stop()
+    await db.close()
+    pdf_extract.shutdown_pool()
+    passwords.shutdown_pool()
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to the VidyaMitra API!"}
\ No newline at end of file
+    return {"message": "Welcome to the VidyaMitra API!"}
+@app.get("/healthz", include_in_schema=False)
+def liveness():
+    return {"status": "ok"}
+@app.get("/readyz", include_in_schema=False)
+def readiness():
+    checks={
+        "database": db.configured,
+        "scheduler": scheduler.started,
+        "warmup": warmup.ready,
+    }
+    ready=all(checks.values())
+    body={"status": "ready" if ready else "starting", "checks": checks, "warmup": warmup.stats()}
+    return JSONResponse(body, status_code=200 if ready else 503)
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    # Latency histograms plus the component counters already exposed as JSON
+    # on the per-router /stats endpoints, in Prometheus text format.
+    extra=[]
+    extra+=metrics.stats_samples("llm", llm.stats(), {"routes": "llm_route"})
+    extra+=metrics.stats_samples("db", {"ops": db.stats()}, {"ops": "op"})
+    extra+=metrics.stats_samples("resume_cache", resume_upload.resume_cache.stats())
+    extra+=metrics.stats_samples("profile_cache", profile_cache.stats())
+    extra+=metrics.stats_samples("resume_state", resume_state.stats(), {"analyses": "outcome", "writes": "write"})
+    extra+=metrics.stats_samples("domain_switch_cache", domain_switch.analysis_cache.stats())
+    extra+=metrics.stats_samples("quiz_bank", quiz_bank.stats(), {"pools": "pool"})
+    extra+=metrics.stats_samples("interview_sessions", interview_store.stats())
+    extra+=metrics.stats_samples("admission", admission.stats(), {"routes": "admission_route"})
+    extra+=metrics.stats_samples("scheduler", {
+        "pending": scheduler.pending(),
+        "running": scheduler.running,
+        "max_pending": scheduler.max_pending,
+        "rejected": scheduler.rejected,
+    })
+    return PlainTextResponse(metrics.render(extra), media_type="text/plain; version=0.0.4")
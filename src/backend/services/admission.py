@@ -0,0 +1,269 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+
+from fastapi import Depends, HTTPException
+
+from services.llm import parse_route_limits
+from services.lru_cache import LRUCache
+from services.sessions import current_user_id
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+# Comma separated route=value pairs, like LLM_ROUTE_LIMITS. Rates are requests
+# per minute per user; burst is how many may be spent at once.
+ADMISSION_USER_RATES = os.getenv("ADMISSION_USER_RATES", "resume=6,domain_switch=20,mock_interview=20")
+ADMISSION_USER_BURST = os.getenv("ADMISSION_USER_BURST", "resume=3,domain_switch=5,mock_interview=5")
+# In-flight caps mirror the LLM route limits so admitted work rarely queues
+# again inside LLMService; anything beyond cap + queue is turned away at once.
+# Mock interview turns queue deeper: a waiting candidate is already connected.
+ADMISSION_MAX_IN_FLIGHT = os.getenv("ADMISSION_MAX_IN_FLIGHT", "resume=8,domain_switch=8,mock_interview=8")
+ADMISSION_MAX_QUEUE = os.getenv("ADMISSION_MAX_QUEUE", "resume=16,domain_switch=16,mock_interview=64")
+ADMISSION_GLOBAL_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_GLOBAL_MAX_IN_FLIGHT", "16"))
+ADMISSION_GLOBAL_MAX_QUEUE = int(os.getenv("ADMISSION_GLOBAL_MAX_QUEUE", "32"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+ADMISSION_MAX_USERS = int(os.getenv("ADMISSION_MAX_USERS", "50000"))
+# Seed for the Retry-After estimate until real hold times have been observed.
+ADMISSION_DEFAULT_HOLD_SECONDS = float(os.getenv("ADMISSION_DEFAULT_HOLD_SECONDS", "2"))
+# Cap on the advertised Retry-After; a route with a zero rate never refills.
+ADMISSION_MAX_RETRY_AFTER = int(os.getenv("ADMISSION_MAX_RETRY_AFTER", "3600"))
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str, retry_after: float, status_code: int = 429):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+    def http_exception(self) -> HTTPException:
+        return HTTPException(
+            status_code=self.status_code,
+            detail=self.reason,
+            headers={"Retry-After": str(max(1, math.ceil(min(self.retry_after, ADMISSION_MAX_RETRY_AFTER))))},
+        )
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+    def take(self, now: float | None = None) -> float:
+        # Returns 0 when a token was spent, otherwise the seconds until one is due.
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+class Gate:
+    """In-flight cap with a bounded FIFO of waiters; a full queue rejects immediately."""
+
+    def __init__(self, max_in_flight: int, max_queue: int, hold_seconds: float = ADMISSION_DEFAULT_HOLD_SECONDS):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.in_flight = 0
+        self._waiters = deque()
+        # Moving average of how long a slot is held, for Retry-After.
+        self.hold_seconds = hold_seconds
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        return self.hold_seconds * (self.waiting + 1) / self.max_in_flight
+
+    async def acquire(self, timeout: float):
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise Rejected("Server is busy, please retry shortly", self.retry_after())
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise Rejected("Timed out waiting for capacity", self.retry_after(), status_code=503)
+
+    def release(self, held_seconds: float | None = None):
+        if held_seconds is not None:
+            self.hold_seconds += (held_seconds - self.hold_seconds) * 0.2
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves straight to the next waiter; in_flight is unchanged.
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class AdmissionStats:
+    def __init__(self):
+        self.admitted = 0
+        self.rate_limited = 0
+        self.queue_full = 0
+        self.timed_out = 0
+        self.queue_wait_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        rates: dict | None = None,
+        bursts: dict | None = None,
+        max_in_flight: dict | None = None,
+        max_queue: dict | None = None,
+        global_max_in_flight: int = ADMISSION_GLOBAL_MAX_IN_FLIGHT,
+        global_max_queue: int = ADMISSION_GLOBAL_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        max_users: int = ADMISSION_MAX_USERS,
+        enabled: bool = ADMISSION_ENABLED,
+    ):
+        self.rates = parse_route_limits(ADMISSION_USER_RATES) if rates is None else rates
+        self.bursts = parse_route_limits(ADMISSION_USER_BURST) if bursts is None else bursts
+        self.max_in_flight = parse_route_limits(ADMISSION_MAX_IN_FLIGHT) if max_in_flight is None else max_in_flight
+        self.max_queue = parse_route_limits(ADMISSION_MAX_QUEUE) if max_queue is None else max_queue
+        self.queue_timeout = queue_timeout
+        self.enabled = enabled
+        # Buckets for idle users fall out of the LRU; a returning user starts full.
+        self.buckets = LRUCache(max_entries=max_users)
+        self.gates = {}
+        self.global_gate = Gate(global_max_in_flight, global_max_queue)
+        self.routes = {}
+
+    def route_stats(self, route: str) -> AdmissionStats:
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = AdmissionStats()
+        return stats
+
+    def gate(self, route: str) -> Gate | None:
+        if route not in self.max_in_flight:
+            return None
+        gate = self.gates.get(route)
+        if gate is None:
+            gate = self.gates[route] = Gate(self.max_in_flight[route], self.max_queue.get(route, 0))
+        return gate
+
+    def check_rate(self, route: str, user_id):
+        if not self.enabled or route not in self.rates:
+            return
+        key = (route, str(user_id))
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rates[route], self.bursts.get(route, 1))
+            self.buckets.set(key, bucket)
+        wait = bucket.take()
+        if wait > 0:
+            self.route_stats(route).rate_limited += 1
+            raise Rejected("Too many requests, please slow down", wait)
+
+    async def acquire(self, route: str) -> list:
+        # Returns the gates that were entered, for release().
+        if not self.enabled:
+            return []
+        stats = self.route_stats(route)
+        queued_at = time.perf_counter()
+        held = []
+        try:
+            for gate in (self.gate(route), self.global_gate):
+                if gate is not None:
+                    await gate.acquire(self.queue_timeout)
+                    held.append(gate)
+        except Rejected as e:
+            self.release(held)
+            if e.status_code == 429:
+                stats.queue_full += 1
+            else:
+                stats.timed_out += 1
+            raise
+        except BaseException:
+            self.release(held)
+            raise
+        stats.admitted += 1
+        stats.queue_wait_seconds += time.perf_counter() - queued_at
+        return held
+
+    def release(self, held: list, held_seconds: float | None = None):
+        for gate in reversed(held):
+            gate.release(held_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "global": {"in_flight": self.global_gate.in_flight, "waiting": self.global_gate.waiting},
+            "routes": {
+                route: {
+                    **stats.as_dict(),
+                    "in_flight": self.gates[route].in_flight if route in self.gates else 0,
+                    "waiting": self.gates[route].waiting if route in self.gates else 0,
+                }
+                for route, stats in self.routes.items()
+            },
+        }
+
+
+admission = AdmissionController()
+
+
+class Ticket:
+    """Per-request handle; the route decides when (and whether) to take a slot."""
+
+    def __init__(self, controller: AdmissionController, route: str, user_id):
+        self.controller = controller
+        self.route = route
+        self.user_id = user_id
+        self._held = None
+        self._acquired_at = None
+
+    def check_rate(self):
+        try:
+            self.controller.check_rate(self.route, self.user_id)
+        except Rejected as e:
+            raise e.http_exception()
+
+    async def acquire(self):
+        # Rate first: a user over their budget never occupies a queue position.
+        self.check_rate()
+        try:
+            self._held = await self.controller.acquire(self.route)
+        except Rejected as e:
+            raise e.http_exception()
+        self._acquired_at = time.perf_counter()
+
+    def release(self):
+        if self._held is not None:
+            self.controller.release(self._held, time.perf_counter() - self._acquired_at)
+            self._held = None
+
+
+def admit(route: str, controller: AdmissionController = admission):
+    # FastAPI runs the code after `yield` once the response has been sent, so
+    # a slot taken for a StreamingResponse is held until the stream ends.
+    async def dependency(user_id: str = Depends(current_user_id)):
+        ticket = Ticket(controller, route, user_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    return dependency
@@ -1 +1,266 @@
-from fastapi import APIRouter, HTTPException
\ No newline at end of file
+import asyncio
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from services import metrics
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+# Jobs waiting for a worker; submit() refuses beyond this instead of letting
+# the backlog (and every queued user's wait) grow without bound.
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "64"))
+# Every scheduler (one per uvicorn worker) heartbeats into jobs.db; the
+# unfinished jobs of an owner silent for longer than the TTL are failed.
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_OWNER_TTL_SECONDS = float(os.getenv("JOB_OWNER_TTL_SECONDS", "45"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Set while a job runs so the job function can publish partial progress
+# without having its id threaded through every call.
+current_job_id = contextvars.ContextVar("current_job_id", default=None)
+
+
+class SchedulerBusy(RuntimeError):
+    def __init__(self, retry_after: float):
+        super().__init__("Job queue is full")
+        self.retry_after = retry_after
+
+
+class JobStore:
+    def __init__(self, path: str = JOBS_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                user_id TEXT,
+                status TEXT NOT NULL,
+                result TEXT,
+                progress TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "progress" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN progress TEXT")
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_owners (
+                owner TEXT PRIMARY KEY,
+                heartbeat_at REAL NOT NULL
+            )
+            """
+        )
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _fetchall(self, sql: str, params=()):
+        # Read to the end under the lock: a half-read SELECT holds a read
+        # snapshot on the shared connection, and a write from another thread
+        # then fails with "database is locked".
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def create(self, kind: str, user_id, owner: str | None = None) -> str:
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, kind, user_id, status, owner, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, None if user_id is None else str(user_id), QUEUED, owner, time.time()),
+        )
+        return job_id
+
+    def mark_running(self, job_id: str):
+        self._execute("UPDATE jobs SET status=?, started_at=? WHERE id=?", (RUNNING, time.time(), job_id))
+
+    def set_progress(self, job_id: str, progress):
+        self._execute("UPDATE jobs SET progress=? WHERE id=?", (json.dumps(progress, default=str), job_id))
+
+    def mark_succeeded(self, job_id: str, result):
+        self._execute(
+            "UPDATE jobs SET status=?, result=?, finished_at=? WHERE id=?",
+            (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id),
+        )
+
+    def mark_failed(self, job_id: str, error: str):
+        self._execute(
+            "UPDATE jobs SET status=?, error=?, finished_at=? WHERE id=?",
+            (FAILED, error, time.time(), job_id),
+        )
+
+    def get(self, job_id: str):
+        rows = self._fetchall("SELECT * FROM jobs WHERE id=?", (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["progress"] = json.loads(job["progress"]) if job["progress"] else None
+        return job
+
+    def heartbeat(self, owner: str):
+        self._execute(
+            "INSERT INTO job_owners (owner, heartbeat_at) VALUES (?, ?) "
+            "ON CONFLICT (owner) DO UPDATE SET heartbeat_at=excluded.heartbeat_at",
+            (owner, time.time()),
+        )
+
+    def fail_owned(self, owner: str, error: str):
+        self._execute(
+            "UPDATE jobs SET status=?, error=?, finished_at=? WHERE owner=? AND status IN (?, ?)",
+            (FAILED, error, time.time(), owner, QUEUED, RUNNING),
+        )
+
+    def release_owner(self, owner: str):
+        self._execute("DELETE FROM job_owners WHERE owner=?", (owner,))
+
+    def fail_orphaned(self, ttl: float) -> int:
+        # Unfinished jobs whose scheduler stopped heartbeating: a crashed or
+        # restarted worker. Jobs of live sibling workers are left alone.
+        with self._lock:
+            cutoff = time.time() - ttl
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status=?, error=?, finished_at=? WHERE status IN (?, ?) AND ("
+                "owner IS NULL OR owner NOT IN (SELECT owner FROM job_owners WHERE heartbeat_at >= ?))",
+                (FAILED, "Interrupted by server restart", time.time(), QUEUED, RUNNING, cutoff),
+            )
+            self._conn.execute("DELETE FROM job_owners WHERE heartbeat_at < ?", (cutoff,))
+            return cursor.rowcount
+
+    def purge(self, older_than: float):
+        self._execute("DELETE FROM jobs WHERE created_at < ? AND status IN (?, ?)", (older_than, SUCCEEDED, FAILED))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobScheduler:
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS, max_pending: int = JOB_MAX_PENDING):
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._queue = None
+        self._tasks = []
+        self._submitting = 0
+        self.running = 0
+        self.rejected = 0
+        # Moving average of job run time, for Retry-After when the queue is full.
+        self.job_seconds = 5.0
+        # Unique per process start, so a restarted worker that reuses a pid
+        # is still a different owner.
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def start(self):
+        if self._tasks:
+            return
+        # SQLite calls run in a thread so a busy jobs.db never stalls the event loop.
+        await asyncio.to_thread(self.store.heartbeat, self.owner)
+        await asyncio.to_thread(self.store.fail_orphaned, JOB_OWNER_TTL_SECONDS)
+        await asyncio.to_thread(self.store.purge, time.time() - JOB_RETENTION_SECONDS)
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is not None:
+            # Jobs still queued here will never run; fail them now rather than
+            # after the owner TTL.
+            await asyncio.to_thread(self.store.fail_owned, self.owner, "Interrupted by server restart")
+            await asyncio.to_thread(self.store.release_owner, self.owner)
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    async def submit(self, kind: str, user_id, func, *args) -> str:
+        if self._queue is None:
+            raise RuntimeError("Job scheduler is not running")
+        pending = self._queue.qsize() + self._submitting
+        if pending >= self.max_pending:
+            self.rejected += 1
+            raise SchedulerBusy(self.job_seconds * (pending + 1) / self.workers)
+        route = metrics.current_route()
+        self._submitting += 1
+        try:
+            job_id = await asyncio.to_thread(self.store.create, kind, user_id, self.owner)
+        finally:
+            self._submitting -= 1
+        self._queue.put_nowait((job_id, kind, route, func, args))
+        return job_id
+
+    async def report_progress(self, progress) -> bool:
+        job_id = current_job_id.get()
+        if job_id is None:
+            return False
+        await asyncio.to_thread(self.store.set_progress, job_id, progress)
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, self.owner)
+                await asyncio.to_thread(self.store.fail_orphaned, JOB_OWNER_TTL_SECONDS)
+            except sqlite3.Error as e:
+                print(f"Warning: job heartbeat failed: {e}")
+
+    async def _worker(self):
+        while True:
+            job_id, kind, route, func, args = await self._queue.get()
+            self.running += 1
+            token = current_job_id.set(job_id)
+            started_at = time.perf_counter()
+            status = FAILED
+            try:
+                await asyncio.to_thread(self.store.mark_running, job_id)
+                with metrics.bind(route or kind):
+                    result = await func(*args)
+                await asyncio.to_thread(self.store.mark_succeeded, job_id, result)
+                status = SUCCEEDED
+            except asyncio.CancelledError:
+                # The loop is shutting down; record the outcome without yielding.
+                self.store.mark_failed(job_id, "Cancelled")
+                raise
+            except Exception as e:
+                await asyncio.to_thread(self.store.mark_failed, job_id, str(e))
+            finally:
+                elapsed = time.perf_counter() - started_at
+                self.job_seconds += (elapsed - self.job_seconds) * 0.2
+                metrics.job_duration.observe(elapsed, kind, status)
+                current_job_id.reset(token)
+                self.running -= 1
+                self._queue.task_done()
+
+
+scheduler = JobScheduler(JobStore(JOBS_DB_PATH), JOB_WORKERS, JOB_MAX_PENDING)
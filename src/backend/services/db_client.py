@@ -1,14 +1,235 @@
-from supabase import create_client, Client
+import asyncio
 import os
+import random
+import time
+
+import httpx
+
+from services import metrics
 
 supabase_url = os.getenv("SUPABASE_URL", "")
 supabase_key = os.getenv("SUPABASE_KEY", "")
 
-supabase = None
-try:
-    if supabase_url and supabase_key and "your_" not in supabase_url:
-        supabase = create_client(supabase_url, supabase_key)
-    else:
-        print("Warning: Supabase credentials are placeholders or missing. Please update .env")
-except Exception as e:
-    print("Error creating Supabase client:", e)
\ No newline at end of file
+DB_TIMEOUT_SECONDS = float(os.getenv("DB_TIMEOUT_SECONDS", "10"))
+DB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "3"))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "50"))
+DB_MAX_KEEPALIVE = int(os.getenv("DB_MAX_KEEPALIVE", "20"))
+DB_KEEPALIVE_EXPIRY = float(os.getenv("DB_KEEPALIVE_EXPIRY", "30"))
+DB_MAX_RETRIES = int(os.getenv("DB_MAX_RETRIES", "2"))
+DB_BULK_CHUNK_SIZE = int(os.getenv("DB_BULK_CHUNK_SIZE", "500"))
+DB_BULK_RPC_CONCURRENCY = int(os.getenv("DB_BULK_RPC_CONCURRENCY", "8"))
+
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+class DBError(Exception):
+    def __init__(self, message: str, status_code: int | None = None, code: str | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class OpStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class SupabaseDB:
+    def __init__(
+        self,
+        url: str = supabase_url,
+        key: str = supabase_key,
+        transport: httpx.AsyncBaseTransport | None = None,
+        timeout: float = DB_TIMEOUT_SECONDS,
+        max_retries: int = DB_MAX_RETRIES,
+    ):
+        self.url = url.rstrip("/")
+        self.key = key
+        self.transport = transport
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._client = None
+        self.ops = {}
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url and self.key and "your_" not in self.url)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            if not self.configured:
+                raise DBError("Supabase credentials are placeholders or missing. Please update .env")
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.url}/rest/v1",
+                headers={"apikey": self.key, "Authorization": f"Bearer {self.key}"},
+                limits=httpx.Limits(
+                    max_connections=DB_MAX_CONNECTIONS,
+                    max_keepalive_connections=DB_MAX_KEEPALIVE,
+                    keepalive_expiry=DB_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=DB_CONNECT_TIMEOUT_SECONDS),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def start(self):
+        if not self.configured:
+            print("Warning: Supabase credentials are placeholders or missing. Please update .env")
+            return
+        self.client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def op_stats(self, op: str) -> OpStats:
+        stats = self.ops.get(op)
+        if stats is None:
+            stats = self.ops[op] = OpStats()
+        return stats
+
+    async def _request(
+        self,
+        op: str,
+        method: str,
+        path: str,
+        *,
+        params=None,
+        json=None,
+        headers=None,
+        timeout: float | None = None,
+        idempotent: bool = True,
+    ):
+        stats = self.op_stats(op)
+        stats.calls += 1
+        started_at = time.perf_counter()
+        deadline = started_at + (self.timeout if timeout is None else timeout)
+        attempt = 0
+        try:
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise DBError(f"{op} exceeded its deadline", status_code=504)
+                try:
+                    response = await self.client.request(
+                        method, path, params=params, json=json, headers=headers, timeout=remaining
+                    )
+                except httpx.TimeoutException:
+                    raise DBError(f"{op} timed out", status_code=504)
+                except httpx.TransportError as e:
+                    if not idempotent or attempt >= self.max_retries:
+                        raise DBError(f"{op} failed: {e}", status_code=503)
+                else:
+                    if response.status_code < 400:
+                        return response.json() if response.content else None
+                    if response.status_code not in RETRYABLE_STATUS or not idempotent or attempt >= self.max_retries:
+                        raise _error_from(op, response)
+                attempt += 1
+                stats.retries += 1
+                await asyncio.sleep(min(random.uniform(0, 0.1 * 2 ** attempt), max(0.0, deadline - time.perf_counter())))
+        except DBError:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            stats.seconds += elapsed
+            metrics.observe_stage("supabase_rpc" if op.startswith("rpc:") else "supabase_rest", elapsed)
+
+    async def select(self, table: str, filters: dict, columns: str = "*", timeout: float | None = None) -> list:
+        params = {"select": columns, **{column: f"eq.{value}" for column, value in filters.items()}}
+        return await self._request(f"select:{table}", "GET", f"/{table}", params=params, timeout=timeout)
+
+    async def update(self, table: str, filters: dict, values: dict, timeout: float | None = None):
+        params = {column: f"eq.{value}" for column, value in filters.items()}
+        return await self._request(f"update:{table}", "PATCH", f"/{table}", params=params, json=values, timeout=timeout)
+
+    async def rpc(self, name: str, params: dict, timeout: float | None = None, idempotent: bool = True):
+        return await self._request(f"rpc:{name}", "POST", f"/rpc/{name}", json=params, timeout=timeout, idempotent=idempotent)
+
+    async def bulk_insert(self, table: str, rows: list, returning: bool = False, chunk_size: int = DB_BULK_CHUNK_SIZE) -> list:
+        return await self._bulk_write(table, rows, None, returning, chunk_size)
+
+    async def bulk_upsert(
+        self, table: str, rows: list, on_conflict: str, returning: bool = False, chunk_size: int = DB_BULK_CHUNK_SIZE
+    ) -> list:
+        return await self._bulk_write(table, rows, on_conflict, returning, chunk_size)
+
+    async def _bulk_write(self, table: str, rows: list, on_conflict: str | None, returning: bool, chunk_size: int) -> list:
+        prefer = ["return=representation" if returning else "return=minimal"]
+        params = None
+        if on_conflict:
+            prefer.append("resolution=merge-duplicates")
+            params = {"on_conflict": on_conflict}
+        written = []
+        for start in range(0, len(rows), chunk_size):
+            result = await self._request(
+                f"{'upsert' if on_conflict else 'insert'}:{table}",
+                "POST",
+                f"/{table}",
+                params=params,
+                json=rows[start:start + chunk_size],
+                headers={"Prefer": ",".join(prefer)},
+                idempotent=bool(on_conflict),
+            )
+            if result:
+                written.extend(result)
+        return written
+
+    async def get_user_by_email(self, email: str) -> dict | None:
+        rows = await self.select("users", {"email": email})
+        return rows[0] if rows else None
+
+    async def insert_user(self, name: str, email: str, password: str) -> dict | None:
+        rows = await self.bulk_insert("users", [{"name": name, "email": email, "password": password}], returning=True)
+        return rows[0] if rows else None
+
+    async def update_user_password(self, user_id, password: str):
+        await self.update("users", {"id": user_id}, {"password": password})
+
+    async def upsert_full_resume(self, user_id, data: dict):
+        # Not retried: the function rewrites the user's child rows, and a
+        # replay racing a newer upload could put the older resume back.
+        return await self.rpc("upsert_full_resume", {"p_user_id": user_id, "data": data}, idempotent=False)
+
+    async def upsert_full_resumes(self, items: list, concurrency: int = DB_BULK_RPC_CONCURRENCY) -> list:
+        # upsert_full_resume is a per-user RPC, so a batch is pipelined over the
+        # pooled connections; failures are returned in place rather than raised.
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upsert(user_id, data):
+            async with semaphore:
+                return await self.upsert_full_resume(user_id, data)
+
+        return await asyncio.gather(*(upsert(user_id, data) for user_id, data in items), return_exceptions=True)
+
+    async def get_full_candidate_profile(self, user_id):
+        return await self.rpc("get_full_candidate_profile", {"p_user_id": int(user_id)})
+
+    def stats(self) -> dict:
+        return {op: stats.as_dict() for op, stats in self.ops.items()}
+
+
+def _error_from(op: str, response: httpx.Response) -> DBError:
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+    message = body.get("message") or response.text or response.reason_phrase
+    return DBError(f"{op} failed: {message}", status_code=response.status_code, code=body.get("code"))
+
+
+db = SupabaseDB()
+
+
+async def get_full_candidate_profile(user_id):
+    return await db.get_full_candidate_profile(user_id)
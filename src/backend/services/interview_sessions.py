@@ -0,0 +1,157 @@
+import asyncio
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+
+INTERVIEW_MAX_SESSIONS = int(os.getenv("INTERVIEW_MAX_SESSIONS", "2000"))
+INTERVIEW_IDLE_SECONDS = float(os.getenv("INTERVIEW_IDLE_SECONDS", "900"))
+INTERVIEW_SWEEP_SECONDS = float(os.getenv("INTERVIEW_SWEEP_SECONDS", "60"))
+# Messages kept verbatim; older ones are folded into the running summary.
+INTERVIEW_RECENT_MESSAGES = int(os.getenv("INTERVIEW_RECENT_MESSAGES", "6"))
+INTERVIEW_SUMMARY_MAX_CHARS = int(os.getenv("INTERVIEW_SUMMARY_MAX_CHARS", "1500"))
+INTERVIEW_PROFILE_MAX_CHARS = int(os.getenv("INTERVIEW_PROFILE_MAX_CHARS", "3000"))
+INTERVIEW_MESSAGE_MAX_CHARS = int(os.getenv("INTERVIEW_MESSAGE_MAX_CHARS", "4000"))
+INTERVIEWER = "interviewer"
+CANDIDATE = "candidate"
+
+_SENTENCE_END = re.compile(r"(?<=[.?!])\s")
+
+
+def clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def gist(text: str, limit: int = 120) -> str:
+    # First sentence of a turn, clipped: enough to remember what was asked or
+    # claimed without carrying the whole answer forward.
+    text = " ".join(text.split())
+    first = _SENTENCE_END.split(text, 1)[0]
+    return clip(first, limit)
+
+
+class InterviewSession:
+    def __init__(self, user_id: str, domain: str, profile: str):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.domain = domain
+        # Loaded and compacted once when the session starts, never per turn.
+        self.profile = profile
+        self.summary = []
+        self.summary_chars = 0
+        self.recent = deque()
+        self.turns = 0
+        self.compactions = 0
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+        self.lock = asyncio.Lock()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def add(self, role: str, text: str, recent_messages: int = INTERVIEW_RECENT_MESSAGES):
+        self.recent.append((role, clip(text, INTERVIEW_MESSAGE_MAX_CHARS)))
+        if role == INTERVIEWER:
+            self.turns += 1
+        while len(self.recent) > recent_messages:
+            self._compact(*self.recent.popleft())
+
+    def _compact(self, role: str, text: str):
+        line = f"{'Asked' if role == INTERVIEWER else 'Candidate answered'}: {gist(text)}"
+        self.summary.append(line)
+        self.summary_chars += len(line) + 1
+        while self.summary_chars > INTERVIEW_SUMMARY_MAX_CHARS and len(self.summary) > 1:
+            self.summary_chars -= len(self.summary.pop(0)) + 1
+        self.compactions += 1
+
+    def summary_text(self) -> str:
+        return "\n".join(self.summary)
+
+
+class InterviewStore:
+    def __init__(
+        self,
+        max_sessions: int = INTERVIEW_MAX_SESSIONS,
+        idle_seconds: float = INTERVIEW_IDLE_SECONDS,
+        sweep_seconds: float = INTERVIEW_SWEEP_SECONDS,
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.idle_seconds = idle_seconds
+        self.sweep_seconds = sweep_seconds
+        self._sessions = OrderedDict()
+        self._sweeper = None
+        self.created = 0
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    async def start(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    def create(self, user_id: str, domain: str, profile: str) -> InterviewSession:
+        session = InterviewSession(user_id, domain, profile)
+        self._sessions[session.id] = session
+        self.created += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted_capacity += 1
+        return session
+
+    def get(self, session_id: str, user_id: str) -> InterviewSession | None:
+        session = self._sessions.get(session_id)
+        if session is None or session.user_id != user_id:
+            return None
+        self.touch(session)
+        return session
+
+    def touch(self, session: InterviewSession):
+        session.touch()
+        if session.id in self._sessions:
+            self._sessions.move_to_end(session.id)
+
+    def contains(self, session: InterviewSession) -> bool:
+        return self._sessions.get(session.id) is session
+
+    def close(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        # Sessions are kept in last-active order, so expired ones are at the front.
+        cutoff = (time.monotonic() if now is None else now) - self.idle_seconds
+        evicted = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_active > cutoff:
+                break
+            self._sessions.popitem(last=False)
+            evicted += 1
+        self.evicted_idle += evicted
+        return evicted
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_seconds)
+            self.evict_idle()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "created": self.created,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity,
+        }
+
+
+interview_store = InterviewStore()
@@ -0,0 +1,252 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+from services import metrics
+
+LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "gemini-2.5-flash")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+# Comma separated route=limit pairs, e.g. "resume=8,domain_switch=8". Background
+# quiz refills get a small share so they never starve interactive routes, and
+# mock interviews cannot take every slot however many sessions are open.
+LLM_ROUTE_LIMITS = os.getenv("LLM_ROUTE_LIMITS", "resume=8,domain_switch=8,quiz=2,mock_interview=8")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_BUDGET_RATIO = float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.2"))
+LLM_RETRY_BUDGET_MIN = float(os.getenv("LLM_RETRY_BUDGET_MIN", "10"))
+
+
+def parse_route_limits(spec: str) -> dict:
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            route, limit = item.split("=", 1)
+            limits[route.strip()] = int(limit)
+    return limits
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class RetryBudget:
+    # Every call deposits `ratio` tokens and every retry spends one, so retries
+    # stay a bounded fraction of traffic when the provider is degraded.
+    def __init__(self, ratio: float = LLM_RETRY_BUDGET_RATIO, minimum: float = LLM_RETRY_BUDGET_MIN):
+        self.ratio = ratio
+        self.cap = max(minimum, 1.0)
+        self.tokens = self.cap
+
+    def deposit(self):
+        self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class RouteStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.queue_wait_seconds = 0.0
+        self.generation_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in ("429", "500", "503", "unavailable", "exhausted", "deadline", "internal"))
+
+
+class LLMService:
+    def __init__(
+        self,
+        model=None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        route_limits: dict | None = None,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_base_delay: float = LLM_RETRY_BASE_DELAY,
+        retry_budget: RetryBudget | None = None,
+    ):
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._structured = {}
+        self.max_concurrency = max_concurrency
+        self.route_limits = parse_route_limits(LLM_ROUTE_LIMITS) if route_limits is None else route_limits
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_budget = retry_budget or RetryBudget()
+        self._global = None
+        self._routes = {}
+        self.routes = {}
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+
+                    self._model = ChatGoogleGenerativeAI(
+                        model=LLM_MODEL_NAME,
+                        temperature=LLM_TEMPERATURE,
+                        google_api_key=os.getenv("RESUME_API"),
+                    )
+        return self._model
+
+    def set_model(self, model):
+        with self._model_lock:
+            self._model = model
+            self._structured = {}
+
+    def structured(self, schema):
+        runnable = self._structured.get(schema)
+        if runnable is None:
+            runnable = self.model.with_structured_output(schema)
+            self._structured[schema] = runnable
+        return runnable
+
+    def warm_up(self, schemas: list = ()):
+        # Building the Gemini client and its structured-output wrappers takes
+        # seconds; done once at startup so no request pays for it.
+        self.model
+        for schema in schemas:
+            self.structured(schema)
+
+    def _semaphores(self, route: str):
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrency)
+        semaphore = self._routes.get(route)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.route_limits.get(route, self.max_concurrency))
+            self._routes[route] = semaphore
+        return semaphore, self._global
+
+    def route_stats(self, route: str) -> RouteStats:
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        return stats
+
+    async def _acquire(self, route: str, stats: RouteStats):
+        route_semaphore, global_semaphore = self._semaphores(route)
+        queued_at = time.perf_counter()
+        stats.waiting += 1
+        try:
+            await route_semaphore.acquire()
+            try:
+                await global_semaphore.acquire()
+            except BaseException:
+                route_semaphore.release()
+                raise
+        finally:
+            stats.waiting -= 1
+        wait = time.perf_counter() - queued_at
+        stats.queue_wait_seconds += wait
+        metrics.observe_stage("llm_queue_wait", wait)
+        return wait
+
+    def _release(self, route: str):
+        route_semaphore, global_semaphore = self._semaphores(route)
+        global_semaphore.release()
+        route_semaphore.release()
+
+    async def _attempt(self, route: str, stats: RouteStats, runnable, payload, timeout: float):
+        await self._acquire(route, stats)
+        started_at = time.perf_counter()
+        stats.in_flight += 1
+        try:
+            return await asyncio.wait_for(runnable.ainvoke(payload), timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise LLMTimeoutError(f"LLM call for {route} timed out after {timeout:.0f}s")
+        finally:
+            elapsed = time.perf_counter() - started_at
+            stats.in_flight -= 1
+            stats.generation_seconds += elapsed
+            metrics.observe_stage("llm_generation", elapsed)
+            self._release(route)
+
+    async def ainvoke(self, route: str, runnable, payload, timeout: float | None = None):
+        timeout = self.timeout if timeout is None else timeout
+        stats = self.route_stats(route)
+        stats.calls += 1
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(route, stats, runnable, payload, timeout)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e) or not self.retry_budget.withdraw():
+                    stats.errors += 1
+                    raise
+                attempt += 1
+                stats.retries += 1
+                # Full jitter keeps retries from a burst of failures from re-synchronising.
+                await asyncio.sleep(random.uniform(0, self.retry_base_delay * 2 ** attempt))
+
+    async def astream(self, route: str, runnable, payload, timeout: float | None = None):
+        # Retries only happen before the first chunk; after that a failure is
+        # surfaced to the caller, which has already forwarded partial output.
+        timeout = self.timeout if timeout is None else timeout
+        stats = self.route_stats(route)
+        stats.calls += 1
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            await self._acquire(route, stats)
+            started_at = time.perf_counter()
+            stats.in_flight += 1
+            yielded = False
+            try:
+                stream = runnable.astream(payload).__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        return
+                    except asyncio.TimeoutError:
+                        stats.timeouts += 1
+                        raise LLMTimeoutError(f"LLM stream for {route} stalled for {timeout:.0f}s")
+                    yielded = True
+                    yield chunk
+            except Exception as e:
+                if yielded or attempt >= self.max_retries or not _is_retryable(e) or not self.retry_budget.withdraw():
+                    stats.errors += 1
+                    raise
+            finally:
+                elapsed = time.perf_counter() - started_at
+                stats.in_flight -= 1
+                stats.generation_seconds += elapsed
+                metrics.observe_stage("llm_generation", elapsed)
+                self._release(route)
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(random.uniform(0, self.retry_base_delay * 2 ** attempt))
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "retry_budget_tokens": round(self.retry_budget.tokens, 2),
+            "routes": {route: stats.as_dict() for route, stats in self.routes.items()},
+        }
+
+
+llm = LLMService()
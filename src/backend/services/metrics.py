@@ -0,0 +1,223 @@
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_PREFIX = os.getenv("METRICS_PREFIX", "vidyamitra")
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "true").lower() == "true"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+UNMATCHED_ROUTE = "unmatched"
+BACKGROUND_ROUTE = "background"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(s[0]), s[1], s[2])) for labels, s in self._series.items())
+        for label_values, (counts, total, count) in series:
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {count}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total:.6f}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class RequestTimings:
+    # Per-request (or per-job) stage totals; also the source of Server-Timing.
+    def __init__(self, route: str | None = None, scope: dict | None = None):
+        self._route = route
+        self.scope = scope
+        self.stages = {}
+        self.started_at = time.perf_counter()
+
+    @property
+    def route(self) -> str:
+        if self._route is None and self.scope is not None:
+            # FastAPI stores the matched APIRoute in the scope once routing ran;
+            # its template keeps label cardinality bounded.
+            route = self.scope.get("route")
+            path = getattr(route, "path", None)
+            if path is None:
+                return UNMATCHED_ROUTE
+            self._route = path
+        return self._route or BACKGROUND_ROUTE
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        entries.append(f"app;dur={(time.perf_counter() - self.started_at) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current = contextvars.ContextVar("metrics_timings", default=None)
+
+request_duration = Histogram(
+    f"{METRICS_PREFIX}_request_duration_seconds", "HTTP request latency by route", ("route", "method", "status")
+)
+stage_duration = Histogram(
+    f"{METRICS_PREFIX}_stage_duration_seconds", "Time spent in a processing stage by route", ("route", "stage")
+)
+job_duration = Histogram(
+    f"{METRICS_PREFIX}_job_duration_seconds", "Background job run time by kind", ("kind", "status")
+)
+
+
+def current_route() -> str | None:
+    timings = _current.get()
+    return timings.route if timings is not None else None
+
+
+def observe_stage(stage: str, seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+    stage_duration.observe(seconds, timings.route if timings is not None else BACKGROUND_ROUTE, stage)
+
+
+@contextmanager
+def stage(name: str):
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - started_at)
+
+
+@contextmanager
+def bind(route: str | None):
+    # Background work (scheduler jobs) runs outside the request that queued it,
+    # so it re-binds that request's route label for its own stages.
+    token = _current.set(RequestTimings(route=route))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class MetricsMiddleware:
+    def __init__(self, app, server_timing: bool = METRICS_SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        timings = RequestTimings(scope=scope)
+        token = _current.set(timings)
+        if scope["type"] == "websocket":
+            try:
+                return await self.app(scope, receive, send)
+            finally:
+                _current.reset(token)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            request_duration.observe(
+                time.perf_counter() - timings.started_at, timings.route, scope.get("method", ""), status
+            )
+
+
+def _sample_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)) and not (isinstance(value, float) and math.isnan(value)):
+        return value
+    return None
+
+
+def stats_samples(prefix: str, stats: dict, labels: dict | None = None, help: str = "") -> list:
+    # Flattens a component's stats() dict into gauges. Keys listed in `labels`
+    # hold {name: value-or-dict} collections and become a label instead of a
+    # name segment, e.g. llm routes -> {llm_route="resume"}.
+    labels = labels or {}
+    series = {}
+
+    def add(name: str, label: str, value):
+        value = _sample_value(value)
+        if value is not None:
+            series.setdefault(name, []).append((label, value))
+
+    def walk(name: str, value, label: str):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in labels and isinstance(item, dict):
+                    for member, member_value in item.items():
+                        member_label = f'{labels[key]}="{_escape(member)}"'
+                        member_label = f"{label},{member_label}" if label else member_label
+                        if isinstance(member_value, dict):
+                            walk(name, member_value, member_label)
+                        else:
+                            add(f"{name}_{key}", member_label, member_value)
+                else:
+                    walk(f"{name}_{key}", item, label)
+        else:
+            add(name, label, value)
+
+    walk(f"{METRICS_PREFIX}_{prefix}", stats, "")
+    lines = []
+    for name, samples in series.items():
+        if help:
+            lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(f"{name}{{{label}}} {value}" if label else f"{name} {value}" for label, value in samples)
+    return lines
+
+
+def render(extra: list | None = None) -> str:
+    lines = []
+    for histogram in (request_duration, stage_duration, job_duration):
+        lines.extend(histogram.render())
+    lines.extend(extra or [])
+    return "\n".join(lines) + "\n"
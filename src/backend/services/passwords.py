@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+from services import metrics
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _hash(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def hash_cost(hashed: str) -> int | None:
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=BCRYPT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken):
+    # One worker dying (OOM kill, SIGKILL) breaks a ProcessPoolExecutor for
+    # good; drop it so the next call starts a new one, unless another caller
+    # already has.
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def _run(func, *args):
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            _reset_pool(pool)
+            if attempt:
+                raise
+
+
+def warm_up():
+    # Spawned workers start cold (fresh interpreter + bcrypt import); pay that
+    # at boot instead of on the first logins.
+    pool = _get_pool()
+    for future in [pool.submit(_hash, b"warm-up", 4) for _ in range(BCRYPT_WORKERS)]:
+        future.result()
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    with metrics.stage("bcrypt"):
+        return await _run(_hash, password.encode("utf-8"), rounds)
+
+
+async def verify_password(password: str, hashed: str, rounds: int = BCRYPT_ROUNDS) -> tuple[bool, bool]:
+    try:
+        with metrics.stage("bcrypt"):
+            ok = await _run(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        return False, False
+    return ok, ok and hash_cost(hashed) != rounds
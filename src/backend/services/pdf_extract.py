@@ -0,0 +1,190 @@
+import importlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from starlette.responses import JSONResponse
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "40"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_MAGIC = b"%PDF-"
+# The PDF spec lets readers accept a header anywhere in the first 1 KiB.
+PDF_MAGIC_WINDOW = 1024
+READ_CHUNK_SIZE = 64 * 1024
+# Allowance for multipart boundaries and part headers around the PDF itself.
+PDF_UPLOAD_OVERHEAD_BYTES = int(os.getenv("PDF_UPLOAD_OVERHEAD_BYTES", str(16 * 1024)))
+
+
+class PDFRejected(ValueError):
+    def __init__(self, detail: str, status_code: int = 415):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def check_pdf_header(head: bytes):
+    if PDF_MAGIC not in head[:PDF_MAGIC_WINDOW]:
+        raise PDFRejected("Only PDF files are supported")
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """Rejects request bodies over a per-path byte limit before they are parsed.
+
+    Starlette reads a multipart upload in full, into a SpooledTemporaryFile
+    that moves to disk past 1 MiB, before the route runs. The cap therefore
+    has to be applied here: on Content-Length when the client sends one, and
+    by counting received chunks otherwise.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+        detail = f"Upload exceeds the {limit} byte limit"
+        length = dict(scope.get("headers", [])).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            return await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Stops the body parser; FastAPI reports that as a 400,
+                    # which send_413_instead replaces.
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def send_413_instead(message):
+            if not exceeded:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+
+        try:
+            await self.app(scope, limited_receive, send_413_instead)
+        except _BodyTooLarge:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+
+
+async def read_pdf_upload(file, max_bytes: int = PDF_MAX_BYTES) -> bytes:
+    # Copies a parsed UploadFile into memory, checking the magic bytes and the
+    # per-file cap as it goes. The request body itself is bounded earlier, by
+    # UploadLimitMiddleware; uploads over 1 MiB have been spooled to a
+    # temporary file by Starlette by the time this runs.
+    buffer = bytearray()
+    header_checked = False
+    while True:
+        chunk = await file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if not header_checked and len(buffer) >= PDF_MAGIC_WINDOW:
+            check_pdf_header(bytes(buffer[:PDF_MAGIC_WINDOW]))
+            header_checked = True
+        if len(buffer) > max_bytes:
+            raise PDFRejected(f"PDF exceeds the {max_bytes} byte limit", status_code=413)
+    if not buffer:
+        raise PDFRejected("Uploaded file is empty", status_code=400)
+    check_pdf_header(bytes(buffer[:PDF_MAGIC_WINDOW]))
+    return bytes(buffer)
+
+
+def _open_reader(data: bytes):
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise PDFRejected("Password protected PDFs are not supported", status_code=422)
+    return reader
+
+
+def _extract_range(data: bytes, start: int, stop: int) -> list[str]:
+    reader = _open_reader(data)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken):
+    # One worker dying (a PDF that crashes or exhausts the parser, an OOM
+    # kill) breaks a ProcessPoolExecutor for good; drop it so the next upload
+    # starts a new one, unless another caller already has.
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _extract_parallel(data: bytes, ranges: list) -> list[str]:
+    for _ in range(2):
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(_extract_range, data, start, stop) for start, stop in ranges]
+            pages = []
+            for future in futures:
+                pages.extend(future.result())
+            return pages
+        except BrokenProcessPool:
+            _reset_pool(pool)
+    raise PDFRejected("Could not read PDF: the parser crashed", status_code=422)
+
+
+def warm_up():
+    # Short PDFs are parsed in-process and pypdf is only imported inside
+    # _open_reader (it is slow to import), so load it here ahead of the first upload.
+    importlib.import_module("pypdf")
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def extract_pages(data: bytes, max_pages: int = PDF_MAX_PAGES) -> list[str]:
+    check_pdf_header(data)
+    try:
+        reader = _open_reader(data)
+        page_count = len(reader.pages)
+    except PDFRejected:
+        raise
+    except Exception as e:
+        raise PDFRejected(f"Could not read PDF: {e}", status_code=422)
+    if page_count > max_pages:
+        raise PDFRejected(f"PDF has {page_count} pages, the limit is {max_pages}", status_code=413)
+    if page_count < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS <= 1:
+        return [page.extract_text() or "" for page in reader.pages]
+    chunk_size = -(-page_count // PDF_WORKERS)
+    ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+    return _extract_parallel(data, ranges)
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import time
+import uuid
+
+from services.lru_cache import LRUCache
+
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "2048"))
+PROFILE_CACHE_REDIS_URL = os.getenv("PROFILE_CACHE_REDIS_URL", "")
+
+
+class LocalVersionStore:
+    # Only sees writes made through this process.
+    shared = False
+
+    def __init__(self):
+        self._versions = {}
+        # Versions restart from zero with the process, so they are only
+        # comparable under the same epoch.
+        self.epoch = uuid.uuid4().hex[:12]
+        self._lock = asyncio.Lock()
+
+    async def get(self, user_id: str) -> int:
+        return self._versions.get(user_id, 0)
+
+    async def bump(self, user_id: str) -> int:
+        async with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+            return version
+
+
+class RedisVersionStore:
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "vidyamitra:profile_version:"):
+        import redis.asyncio as redis
+
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.epoch = "redis"
+
+    async def get(self, user_id: str) -> int:
+        value = await self._client.get(self.prefix + user_id)
+        return int(value) if value is not None else 0
+
+    async def bump(self, user_id: str) -> int:
+        return int(await self._client.incr(self.prefix + user_id))
+
+
+class ProfileCache:
+    def __init__(self, versions, max_entries: int = PROFILE_CACHE_MAX_ENTRIES, ttl: float = PROFILE_CACHE_TTL):
+        self.versions = versions
+        self.entries = LRUCache(max_entries=max_entries, ttl=ttl)
+
+    async def version(self, user_id) -> int:
+        return await self.versions.get(str(user_id))
+
+    async def stamp(self, user_id, version: int | None = None) -> str:
+        # Identifies the current profile contents across processes and restarts.
+        if version is None:
+            version = await self.version(user_id)
+        return f"{self.versions.epoch}:{version}"
+
+    async def validator(self, user_id) -> str | None:
+        # What a /profile ETag is built from. A local version misses writes
+        # made by other workers, so there the TTL window is part of it: a
+        # client keeps a stale profile no longer than this cache would serve
+        # one. Without a TTL nothing bounds that, and there is no validator.
+        stamp = await self.stamp(user_id)
+        if self.versions.shared:
+            return stamp
+        if not self.entries.ttl:
+            return None
+        return f"{stamp}:{int(time.time() // self.entries.ttl)}"
+
+    async def get(self, user_id, loader):
+        key = str(user_id)
+        version = await self.versions.get(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        data = await loader(user_id)
+        if data:
+            self.entries.set(key, (version, data))
+        return data
+
+    async def invalidate(self, user_id) -> int:
+        key = str(user_id)
+        self.entries.pop(key)
+        return await self.versions.bump(key)
+
+    def stats(self) -> dict:
+        return self.entries.stats()
+
+
+def _version_store():
+    if PROFILE_CACHE_REDIS_URL:
+        try:
+            return RedisVersionStore(PROFILE_CACHE_REDIS_URL)
+        except ImportError:
+            print("Warning: PROFILE_CACHE_REDIS_URL is set but the redis package is not installed")
+    return LocalVersionStore()
+
+
+profile_cache = ProfileCache(_version_store())
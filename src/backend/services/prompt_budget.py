@@ -0,0 +1,128 @@
+import math
+import os
+import re
+
+from services.text_normalizer import heading_key
+
+PROMPT_INPUT_TOKEN_BUDGET = int(os.getenv("PROMPT_INPUT_TOKEN_BUDGET", "6000"))
+
+# Sections the LLM needs least for extraction and scoring are trimmed first.
+SECTION_TRIM_ORDER = [
+    "declaration", "references", "personal details", "personal information",
+    "hobbies and interests", "hobbies", "interests", "languages",
+    "extracurricular activities", "activities", "volunteering",
+    "positions of responsibility", "leadership", "publications",
+    "awards", "achievements", "accomplishments", "courses", "trainings", "training",
+]
+_TRIM_RANK = {name: rank for rank, name in enumerate(SECTION_TRIM_ORDER)}
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+
+class LocalTokenizer:
+    # Offline stand-in for the provider tokenizer: words are split into ~4
+    # character pieces like a BPE vocabulary would, punctuation counts as one.
+    def __init__(self, chars_per_token: int = 4):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return sum(math.ceil(len(piece) / self.chars_per_token) for piece in _WORD.findall(text))
+
+
+def split_sections(text: str) -> list:
+    sections = []
+    name, lines = "header", []
+    for line in text.split("\n"):
+        key = heading_key(line.strip())
+        if key is not None:
+            if lines:
+                sections.append((name, "\n".join(lines)))
+            name, lines = key, []
+        lines.append(line)
+    if lines:
+        sections.append((name, "\n".join(lines)))
+    return sections
+
+
+class AssembledPrompt:
+    def __init__(
+        self, text: str, prompt_tokens: int, resume_tokens: int, trimmed_sections: list, truncated: bool, hint_tokens: int = 0
+    ):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.resume_tokens = resume_tokens
+        self.hint_tokens = hint_tokens
+        self.trimmed_sections = trimmed_sections
+        self.truncated = truncated
+
+    def usage(self, output_tokens: int | None = None) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "resume_tokens": self.resume_tokens,
+            "hint_tokens": self.hint_tokens,
+            "output_tokens": output_tokens,
+            "trimmed_sections": self.trimmed_sections,
+            "truncated": self.truncated,
+        }
+
+
+class PromptAssembler:
+    def __init__(self, prefix: str, static_extra: str = "", budget: int = PROMPT_INPUT_TOKEN_BUDGET, tokenizer=None):
+        # `prefix` is sent byte-identical on every call so provider-side prefix
+        # caching applies; `static_extra` (e.g. the tool schema) is only counted.
+        self.prefix = prefix
+        self.budget = budget
+        self.tokenizer = tokenizer or LocalTokenizer()
+        self.prompt_tokens = self.tokenizer.count(prefix) + self.tokenizer.count(static_extra)
+
+    def count(self, text: str) -> int:
+        return self.tokenizer.count(text)
+
+    def assemble(self, resume_text: str, hints: str = "") -> AssembledPrompt:
+        # `hints` are per-resume lines placed after the resume text, outside the
+        # cached prefix; they are never trimmed and count against the budget.
+        hint_tokens = self.tokenizer.count(hints) if hints else 0
+        available = max(0, self.budget - self.prompt_tokens - hint_tokens)
+        sections = [(name, body, self.tokenizer.count(body)) for name, body in split_sections(resume_text)]
+        total = sum(tokens for _, _, tokens in sections)
+        trimmed = []
+        if total > available:
+            for index in sorted(
+                (i for i, (name, _, _) in enumerate(sections) if name in _TRIM_RANK),
+                key=lambda i: _TRIM_RANK[sections[i][0]],
+            ):
+                if total <= available:
+                    break
+                name, _, tokens = sections[index]
+                sections[index] = (name, None, 0)
+                total -= tokens
+                trimmed.append(name)
+        truncated = total > available
+        if truncated:
+            # Still over budget: every remaining section keeps its heading and
+            # its leading lines, in proportion to its share of the resume.
+            ratio = available / total if total else 0
+            sections = [self._truncate(name, body, tokens, ratio) for name, body, tokens in sections if body is not None]
+            total = sum(tokens for _, _, tokens in sections)
+        text = "\n".join(body for _, body, _ in sections if body is not None)
+        if hints:
+            text = f"{text}\n\n{hints}"
+        return AssembledPrompt(self.prefix + text, self.prompt_tokens, total, trimmed, truncated, hint_tokens)
+
+    def _truncate(self, name: str, body: str, tokens: int, ratio: float):
+        # The heading is reserved first and only body lines are cut; a section
+        # whose share cannot hold its heading and one line is dropped whole.
+        # The leading "header" section has no heading line.
+        allowance = math.floor(tokens * ratio)
+        lines = body.split("\n")
+        heading = [] if name == "header" else lines[:1]
+        kept, used = list(heading), sum(self.tokenizer.count(line) for line in heading)
+        for line in lines[len(heading):]:
+            line_tokens = self.tokenizer.count(line)
+            if used + line_tokens > allowance:
+                break
+            kept.append(line)
+            used += line_tokens
+        if len(kept) == len(heading) and (used > allowance or len(lines) > len(heading)):
+            return name, None, 0
+        return name, "\n".join(kept), used
@@ -0,0 +1,353 @@
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from models.quiz import QuizLLMResponse
+from services.llm import llm
+from services.single_flight import SingleFlight
+
+QUIZ_BANK_PATH = os.getenv("QUIZ_BANK_PATH", "quiz_bank.db")
+QUIZ_SIZE = 10
+QUIZ_DIFFICULTIES = ("easy", "medium", "hard")
+# A pool is topped up to TARGET unseen questions ahead of the requesting user
+# once fewer than LOW_WATER remain.
+QUIZ_POOL_TARGET = int(os.getenv("QUIZ_POOL_TARGET", "50"))
+QUIZ_POOL_LOW_WATER = int(os.getenv("QUIZ_POOL_LOW_WATER", "20"))
+QUIZ_POOL_MAX_QUESTIONS = int(os.getenv("QUIZ_POOL_MAX_QUESTIONS", "5000"))
+QUIZ_REFILL_MAX_ROUNDS = int(os.getenv("QUIZ_REFILL_MAX_ROUNDS", "6"))
+QUIZ_REFILL_WAIT_SECONDS = float(os.getenv("QUIZ_REFILL_WAIT_SECONDS", "45"))
+QUIZ_PROMPT_EXAMPLES = 20
+
+QUIZ_PROMPT = """
+You are an expert technical interviewer writing multiple-choice quiz questions.
+Write exactly 10 {difficulty} difficulty questions for a student preparing for roles in: {domain}.
+Rules:
+1. Each question has exactly 4 options with keys A, B, C and D, and exactly one correct option.
+2. correct_answer is the key of the correct option.
+3. The explanation is one or two sentences.
+4. Cover different topics; do NOT repeat or rephrase any of these existing questions:
+{existing}
+"""
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def question_hash(text: str) -> str:
+    normalized = " ".join(_PUNCTUATION.sub(" ", text.casefold()).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def valid_question(question) -> bool:
+    keys = [option.key.strip().upper() for option in question.options]
+    return (
+        bool(question.question.strip())
+        and len(keys) >= 2
+        and len(set(keys)) == len(keys)
+        and question.correct_answer.strip().upper() in keys
+    )
+
+
+_QUESTIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS quiz_questions (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (domain, difficulty, hash)
+)
+"""
+_CURSORS_TABLE = """
+CREATE TABLE IF NOT EXISTS quiz_cursors (
+    user_id TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    last_id INTEGER NOT NULL,
+    PRIMARY KEY (user_id, domain, difficulty)
+)
+"""
+
+
+class QuizStore:
+    # Questions are served in id order and a cursor is the id of the last
+    # question a user was served, so every worker walks a pool the same way
+    # however its in-memory copy was filled.
+    def __init__(self, path: str = QUIZ_BANK_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_QUESTIONS_TABLE)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS quiz_questions_pool ON quiz_questions (domain, difficulty, id)")
+        self._conn.execute(_CURSORS_TABLE)
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _fetchall(self, sql: str, params=()):
+        # Read to the end under the lock: a half-read SELECT holds a read
+        # snapshot on the shared connection, and a write from another thread
+        # then fails with "database is locked".
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def questions(self):
+        return self._fetchall("SELECT id, domain, difficulty, hash, body FROM quiz_questions ORDER BY id")
+
+    def questions_after(self, domain: str, difficulty: str, after_id: int):
+        return self._fetchall(
+            "SELECT id, hash, body FROM quiz_questions WHERE domain=? AND difficulty=? AND id>? ORDER BY id",
+            (domain, difficulty, after_id),
+        )
+
+    def add_questions(self, domain: str, difficulty: str, items: list) -> int:
+        # Returns how many were new; another worker may have stored the rest.
+        now = time.time()
+        with self._lock:
+            return self._conn.executemany(
+                "INSERT OR IGNORE INTO quiz_questions (domain, difficulty, hash, body, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(domain, difficulty, digest, json.dumps(body), now) for digest, body in items],
+            ).rowcount
+
+    def get_cursor(self, user_id: str, domain: str, difficulty: str) -> int:
+        rows = self._fetchall(
+            "SELECT last_id FROM quiz_cursors WHERE user_id=? AND domain=? AND difficulty=?",
+            (user_id, domain, difficulty),
+        )
+        return rows[0][0] if rows else 0
+
+    def advance_cursor(self, user_id: str, domain: str, difficulty: str, last_id: int, new_id: int) -> bool:
+        # Compare-and-set, so two requests for the same user (in any worker)
+        # never both hand out the questions after `last_id`.
+        if not last_id:
+            cursor = self._execute(
+                "INSERT OR IGNORE INTO quiz_cursors (user_id, domain, difficulty, last_id) VALUES (?, ?, ?, ?)",
+                (user_id, domain, difficulty, new_id),
+            )
+        else:
+            cursor = self._execute(
+                "UPDATE quiz_cursors SET last_id=? WHERE user_id=? AND domain=? AND difficulty=? AND last_id=?",
+                (new_id, user_id, domain, difficulty, last_id),
+            )
+        return cursor.rowcount == 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class QuizPool:
+    def __init__(self):
+        self.questions = []
+        self.ids = []
+        self.hashes = set()
+        self.wanted = 0
+
+    @property
+    def last_id(self) -> int:
+        return self.ids[-1] if self.ids else 0
+
+    def add(self, question_id: int, digest: str, body: dict):
+        self.ids.append(question_id)
+        self.hashes.add(digest)
+        self.questions.append(body)
+
+    def position(self, last_id: int) -> int:
+        # Index of the first question after `last_id`.
+        return bisect.bisect_right(self.ids, last_id)
+
+    def __len__(self):
+        return len(self.questions)
+
+
+class QuizBank:
+    def __init__(
+        self,
+        store: QuizStore,
+        target: int = QUIZ_POOL_TARGET,
+        low_water: int = QUIZ_POOL_LOW_WATER,
+        max_questions: int = QUIZ_POOL_MAX_QUESTIONS,
+        max_rounds: int = QUIZ_REFILL_MAX_ROUNDS,
+    ):
+        self.store = store
+        self.target = target
+        self.low_water = low_water
+        self.max_questions = max_questions
+        self.max_rounds = max_rounds
+        self.pools = {}
+        self._refills = SingleFlight()
+        self._tasks = set()
+        self._loaded = False
+        self._loading = asyncio.Lock()
+        self.served = 0
+        self.exhausted = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.refill_errors = 0
+
+    async def start(self):
+        async with self._loading:
+            if self._loaded:
+                return
+            for question_id, domain, difficulty, digest, body in await asyncio.to_thread(self.store.questions):
+                self.pool(domain, difficulty).add(question_id, digest, json.loads(body))
+            self._loaded = True
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def pool(self, domain: str, difficulty: str) -> QuizPool:
+        pool = self.pools.get((domain, difficulty))
+        if pool is None:
+            pool = self.pools[(domain, difficulty)] = QuizPool()
+        return pool
+
+    async def sync(self, domain: str, difficulty: str) -> int:
+        # Appends what any worker stored since this pool was last read, in id
+        # order; returns how many questions were added.
+        pool = self.pool(domain, difficulty)
+        rows = await asyncio.to_thread(self.store.questions_after, domain, difficulty, pool.last_id)
+        added = 0
+        for question_id, digest, body in rows:
+            # A concurrent sync may have appended these while this one read.
+            if question_id > pool.last_id:
+                pool.add(question_id, digest, json.loads(body))
+                added += 1
+        return added
+
+    async def next_quiz(self, user_id, domain: str, difficulty: str, size: int = QUIZ_SIZE) -> list | None:
+        # Pools are append-only and each user's cursor is the last question id
+        # they were served, so a quiz is a slice of the pool and no user ever
+        # sees a question twice.
+        await self.start()
+        pool = self.pool(domain, difficulty)
+        key = (str(user_id), domain, difficulty)
+        deadline = time.monotonic() + QUIZ_REFILL_WAIT_SECONDS
+        while True:
+            last_id = await asyncio.to_thread(self.store.get_cursor, *key)
+            position = pool.position(last_id)
+            if len(pool) - position < size:
+                # Another worker may have stored questions this one has not
+                # read, possibly including `last_id` itself.
+                await self.sync(domain, difficulty)
+                position = pool.position(last_id)
+            if len(pool) - position >= size:
+                if await asyncio.to_thread(self.store.advance_cursor, *key, last_id, pool.ids[position + size - 1]):
+                    break
+                # A concurrent request for the same user took these; re-read.
+                continue
+            pool.wanted = max(pool.wanted, position + size)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.exhausted += 1
+                return None
+            before = len(pool)
+            try:
+                await asyncio.wait_for(self._refill_shared(domain, difficulty), remaining)
+            except asyncio.TimeoutError:
+                pass
+            if len(pool) == before:
+                self.exhausted += 1
+                return None
+        questions = pool.questions[position:position + size]
+        position += size
+        self.served += 1
+        if len(pool) - position < self.low_water:
+            pool.wanted = max(pool.wanted, position + self.target)
+            self.schedule_refill(domain, difficulty)
+        return questions
+
+    def schedule_refill(self, domain: str, difficulty: str):
+        if (domain, difficulty) in self._refills:
+            return
+        task = asyncio.create_task(self._background_refill(domain, difficulty))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _background_refill(self, domain: str, difficulty: str):
+        try:
+            await self._refill_shared(domain, difficulty)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: quiz refill for {domain}/{difficulty} failed: {e}")
+
+    def _refill_shared(self, domain: str, difficulty: str):
+        return self._refills.do((domain, difficulty), lambda: self._refill(domain, difficulty))
+
+    async def _refill(self, domain: str, difficulty: str) -> int:
+        pool = self.pool(domain, difficulty)
+        added = 0
+        stale = 0
+        for _ in range(self.max_rounds):
+            if len(pool) >= min(pool.wanted, self.max_questions):
+                break
+            try:
+                new = await self._generate(domain, difficulty, pool)
+            except Exception:
+                self.refill_errors += 1
+                if added:
+                    break
+                raise
+            added += new
+            stale = 0 if new else stale + 1
+            if stale >= 2:
+                # The model keeps producing duplicates; stop rather than spin.
+                break
+        return added
+
+    async def _generate(self, domain: str, difficulty: str, pool: QuizPool) -> int:
+        recent = [question["question"] for question in pool.questions[-QUIZ_PROMPT_EXAMPLES:]]
+        text = QUIZ_PROMPT.format(
+            domain=domain,
+            difficulty=difficulty,
+            existing="\n".join(f"- {question}" for question in recent) or "(none yet)",
+        )
+        response = await llm.ainvoke("quiz", llm.structured(QuizLLMResponse), text)
+        if response is None:
+            return 0
+        items = []
+        for question in response.questions:
+            if not valid_question(question):
+                self.rejected += 1
+                continue
+            body = question.model_dump(mode="json")
+            digest = question_hash(question.question)
+            if digest in pool.hashes or any(digest == seen for seen, _ in items):
+                self.duplicates += 1
+                continue
+            items.append((digest, body))
+        if items:
+            stored = await asyncio.to_thread(self.store.add_questions, domain, difficulty, items)
+            self.duplicates += len(items) - stored
+            self.generated += stored
+        # Read back rather than appending, so the pool keeps the store's id order.
+        return await self.sync(domain, difficulty)
+
+    def stats(self) -> dict:
+        return {
+            "served": self.served,
+            "exhausted": self.exhausted,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "refill_errors": self.refill_errors,
+            "refilling": len(self._refills),
+            "pools": {f"{domain}/{difficulty}": len(pool) for (domain, difficulty), pool in self.pools.items()},
+        }
+
+
+quiz_bank = QuizBank(QuizStore(QUIZ_BANK_PATH))
@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+import os
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Smaller bodies are sent as-is: gzip framing and CPU outweigh the savings.
+RESPONSE_GZIP_MIN_BYTES = int(os.getenv("RESPONSE_GZIP_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def dumps(content) -> bytes:
+    # Compact JSON. Pydantic models use their own serializer; everything else
+    # goes through orjson where installed. Either way jsonable_encoder only
+    # sees the values the serializer cannot handle itself, instead of walking
+    # the whole profile first as FastAPI's default response does.
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content, default=jsonable_encoder)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=jsonable_encoder).encode("utf-8")
+
+
+def accepts_gzip(request: Request) -> bool:
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+def make_etag(*parts) -> str:
+    # Strong validator for the identity representation; the gzip one gets a suffix.
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def matching_etag(request: Request, etag: str) -> str | None:
+    # The If-None-Match entry that `etag` satisfies, if any. Comparison is
+    # weak, and either encoding of the same version is still current.
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        opaque = candidate.removeprefix("W/")
+        if opaque.endswith(GZIP_ETAG_SUFFIX + '"'):
+            opaque = opaque[: -len(GZIP_ETAG_SUFFIX) - 1] + '"'
+        if opaque == etag:
+            return candidate
+    return None
+
+
+def not_modified(request: Request, etag: str, headers: dict | None = None) -> Response | None:
+    # Checked before loading anything, so a revalidation costs no DB read and no serialization.
+    matched = matching_etag(request, etag)
+    if matched is None:
+        return None
+    # Echo the client's own validator so its stored copy stays current.
+    return Response(status_code=304, headers={**(headers or {}), "Vary": "Accept-Encoding", "ETag": matched})
+
+
+def json_response(request: Request, content, status_code: int = 200, etag: str | None = None, headers: dict | None = None) -> Response:
+    if etag is not None:
+        response = not_modified(request, etag, headers)
+        if response is not None:
+            return response
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    body = dumps(content)
+    if len(body) >= RESPONSE_GZIP_MIN_BYTES and accepts_gzip(request):
+        body = gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+        if etag is not None:
+            etag = etag[:-1] + GZIP_ETAG_SUFFIX + '"'
+    if etag is not None:
+        headers["ETag"] = etag
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from models.upload_resume import resume_upload
+from services.lru_cache import LRUCache
+
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "512"))
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", "")
+
+
+class ResumeCache:
+    def __init__(self, version: str, max_entries: int = RESUME_CACHE_MAX_ENTRIES, cache_dir: str = RESUME_CACHE_DIR):
+        self.version = version
+        self.memory = LRUCache(max_entries=max_entries)
+        self.cache_dir = cache_dir or None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, cleaned_text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(cleaned_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return resume_upload.model_validate(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print("Warning: dropping unreadable resume cache entry", key, e)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            return None
+
+    def _write_disk(self, key: str, parsed: resume_upload):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(parsed.model_dump_json())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print("Warning: could not write resume cache entry", key, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def get(self, key: str):
+        parsed = self.memory.get(key)
+        if parsed is None and self.cache_dir:
+            parsed = self._read_disk(key)
+            if parsed is not None:
+                self.memory.set(key, parsed)
+                with self._lock:
+                    self.disk_hits += 1
+        with self._lock:
+            if parsed is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return parsed
+
+    def set(self, key: str, parsed: resume_upload):
+        self.memory.set(key, parsed)
+        if self.cache_dir:
+            self._write_disk(key, parsed)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "memory": self.memory.stats(),
+            "disk_enabled": bool(self.cache_dir),
+        }
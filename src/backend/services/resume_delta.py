@@ -0,0 +1,98 @@
+import functools
+import hashlib
+import json
+import os
+
+from pydantic import create_model
+
+from models.upload_resume import resume_upload
+from services.prompt_budget import split_sections
+
+# A re-upload is only patched when the edited sections are at most this share
+# of the resume text; bigger rewrites get a full analysis.
+RESUME_PARTIAL_MAX_CHANGED_SHARE = float(os.getenv("RESUME_PARTIAL_MAX_CHANGED_SHARE", "0.5"))
+
+# Headings whose content maps onto exactly one list field of resume_upload.
+# Everything else (header, summary, experience, ...) feeds the candidate info
+# and the evaluation as a whole, and is grouped as OTHER.
+SECTION_FIELDS = {
+    "education": "education", "academic details": "education",
+    "academic qualifications": "education", "qualifications": "education",
+    "projects": "projects", "academic projects": "projects", "personal projects": "projects",
+    "certifications": "certificates", "certificates": "certificates",
+    "courses": "certificates", "trainings": "certificates", "training": "certificates",
+    "skills": "skills", "technical skills": "skills", "key skills": "skills",
+    "core competencies": "skills", "tools": "skills", "technologies": "skills",
+}
+LIST_FIELDS = ("education", "projects", "certificates", "skills")
+OTHER = "other"
+# Judge the resume as a whole, so a partial run always asks for them again.
+EVALUATION_FIELDS = ("analysis", "resume_score", "domain", "skill_analysis", "suggested_projects")
+
+
+def group_texts(text: str) -> dict:
+    groups = {}
+    for name, body in split_sections(text):
+        groups.setdefault(SECTION_FIELDS.get(name, OTHER), []).append(body)
+    return {group: "\n".join(bodies) for group, bodies in groups.items()}
+
+
+def unchanged_text(text: str, fields) -> str:
+    # The sections outside `fields`, in resume order: read-only context for a partial run.
+    return "\n".join(body for name, body in split_sections(text) if SECTION_FIELDS.get(name, OTHER) not in fields)
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def section_fingerprints(text: str) -> dict:
+    return {group: fingerprint(body) for group, body in group_texts(text).items()}
+
+
+def changed_groups(old: dict, new: dict) -> list:
+    return sorted(group for group in set(old) | set(new) if old.get(group) != new.get(group))
+
+
+def plan_update(old_fingerprints: dict, texts: dict, max_share: float = RESUME_PARTIAL_MAX_CHANGED_SHARE):
+    # List fields to re-extract; [] when nothing changed and None when the
+    # edit needs a full analysis.
+    changed = changed_groups(old_fingerprints, {group: fingerprint(body) for group, body in texts.items()})
+    if OTHER in changed:
+        return None
+    total = sum(len(body) for body in texts.values())
+    if total and sum(len(texts.get(group, "")) for group in changed) / total > max_share:
+        return None
+    return changed
+
+
+@functools.lru_cache(maxsize=None)
+def partial_model(fields: tuple):
+    # resume_upload narrowed to `fields`, for structured output on a partial run.
+    return create_model(
+        "resume_update",
+        **{name: (info.annotation, info) for name, info in resume_upload.model_fields.items() if name in fields},
+    )
+
+
+def merge_update(previous: dict, values: dict) -> dict:
+    merged = json.loads(json.dumps(previous))
+    merged.update(values)
+    candidates = merged.get("candidates") or {}
+    if "domain" in values:
+        candidates["domain"] = values["domain"]
+    resume_json = candidates.get("resume_json")
+    if isinstance(resume_json, dict):
+        for field in LIST_FIELDS:
+            if field in values and field in resume_json:
+                resume_json[field] = values[field]
+    return merged
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def same_analysis(old: dict, new: dict) -> bool:
+    # Compared as stored: key order is ignored and dates match their ISO strings.
+    return _canonical(old) == _canonical(new)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import Counter
+
+RESUME_STATE_PATH = os.getenv("RESUME_STATE_PATH", "resume_state.db")
+
+
+class ResumeStateStore:
+    """Last analysis written for each user: section fingerprints and the full response.
+
+    It is the base a re-upload is diffed against, so an entry is only trusted
+    while the profile version it was written at is still current. A batch
+    upload discards the entry. Writes from other workers or instances only
+    bump a shared (Redis) version, so with a local one a re-upload is always
+    written in full, however little it changed.
+    """
+
+    def __init__(self, path: str = RESUME_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_state (
+                user_id TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                profile_stamp TEXT NOT NULL,
+                fingerprints TEXT NOT NULL,
+                response TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._user_locks = weakref.WeakValueDictionary()
+        self.analyses = Counter()
+        self.writes = Counter()
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _fetchall(self, sql: str, params=()):
+        # Read to the end under the lock: a half-read SELECT holds a read
+        # snapshot on the shared connection, and a write from another thread
+        # then fails with "database is locked".
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def get(self, user_id, prompt_version: str, profile_stamp: str) -> dict | None:
+        rows = self._fetchall(
+            "SELECT prompt_version, profile_stamp, fingerprints, response FROM resume_state WHERE user_id=?",
+            (str(user_id),),
+        )
+        row = rows[0] if rows else None
+        if row is None or row[0] != prompt_version or row[1] != profile_stamp:
+            return None
+        return {"profile_stamp": row[1], "fingerprints": json.loads(row[2]), "response": json.loads(row[3])}
+
+    def set(self, user_id, prompt_version: str, profile_stamp: str, fingerprints: dict, response: dict):
+        self._execute(
+            "INSERT INTO resume_state (user_id, prompt_version, profile_stamp, fingerprints, response, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET prompt_version=excluded.prompt_version, "
+            "profile_stamp=excluded.profile_stamp, fingerprints=excluded.fingerprints, response=excluded.response, "
+            "updated_at=excluded.updated_at",
+            (str(user_id), prompt_version, profile_stamp, json.dumps(fingerprints), json.dumps(response, default=str), time.time()),
+        )
+
+    def discard(self, user_id):
+        self._execute("DELETE FROM resume_state WHERE user_id=?", (str(user_id),))
+
+    def lock(self, user_id) -> asyncio.Lock:
+        # Serialises check-stamp / write / save for one user within this process.
+        key = str(user_id)
+        lock = self._user_locks.get(key)
+        if lock is None:
+            lock = self._user_locks[key] = asyncio.Lock()
+        return lock
+
+    def stats(self) -> dict:
+        return {
+            "entries": self._fetchall("SELECT COUNT(*) FROM resume_state")[0][0],
+            "analyses": dict(self.analyses),
+            "writes": dict(self.writes),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+resume_state = ResumeStateStore()
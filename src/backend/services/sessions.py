@@ -0,0 +1,67 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+from fastapi import HTTPException, Request
+
+SESSION_COOKIE = "session"
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+SESSION_COOKIE_SECURE = os.getenv("SESSION_COOKIE_SECURE", "false").lower() == "true"
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+if not SESSION_SECRET:
+    print("Warning: SESSION_SECRET is not set, sessions will not survive restarts or span workers")
+    SESSION_SECRET = secrets.token_urlsafe(32)
+_key = SESSION_SECRET.encode("utf-8")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _sign(payload: str) -> str:
+    return _b64(hmac.new(_key, payload.encode("utf-8"), hashlib.sha256).digest())
+
+
+def create_session_token(user_id, ttl: int = SESSION_TTL_SECONDS) -> str:
+    payload = f"{user_id}.{int(time.time()) + ttl}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_session_token(token: str | None) -> str | None:
+    if not token or token.count(".") != 2:
+        return None
+    user_id, expires_at, signature = token.split(".")
+    if not hmac.compare_digest(signature, _sign(f"{user_id}.{expires_at}")):
+        return None
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return None
+    return user_id
+
+
+def user_id_from_cookies(cookies) -> str | None:
+    return verify_session_token(cookies.get(SESSION_COOKIE))
+
+
+def current_user_id(request: Request) -> str:
+    user_id = user_id_from_cookies(request.cookies)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="User not logged in")
+    return user_id
+
+
+def set_session_cookie(response, user_id):
+    response.set_cookie(
+        key=SESSION_COOKIE,
+        value=create_session_token(user_id),
+        max_age=SESSION_TTL_SECONDS,
+        samesite="lax",
+        secure=SESSION_COOKIE_SECURE,
+        httponly=True,
+    )
+
+
+def clear_session_cookie(response):
+    response.delete_cookie(key=SESSION_COOKIE, samesite="lax", secure=SESSION_COOKIE_SECURE, httponly=True)
@@ -0,0 +1,307 @@
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+
+from models.domains import DEFAULT_DOMAIN, DOMAINS
+from services.text_normalizer import heading_key
+
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "skill_taxonomy.json")
+)
+# Below this share of the total domain score the provisional domain is reported
+# but neither suggested to the LLM nor used when the LLM returns no valid domain.
+TAXONOMY_MIN_CONFIDENCE = float(os.getenv("TAXONOMY_MIN_CONFIDENCE", "0.35"))
+# Headings and line labels ("Skills: ...", "Backend: ...") under which an
+# everyday word such as "Swift" or "Express" is taken to be the skill.
+SKILL_CONTEXT_LABELS = frozenset({
+    "skills", "technical skills", "key skills", "core competencies", "tools", "technologies",
+    "tools and technologies", "tools & technologies", "tech stack", "languages", "programming languages",
+    "frameworks", "libraries", "databases", "backend", "frontend", "platforms", "cloud",
+})
+# What may sit between two skills listed together: "Flutter, Dart", "Go / Rust", "Kotlin and Java".
+_LIST_GAP = re.compile(r"[\s,/|;&+()]*(?:and[\s,/|;&+()]+)?")
+
+
+def alias_variants(alias: str) -> set:
+    # "node.js" should also match "nodejs" and "node js", "scikit-learn" should
+    # match "scikit learn" and so on.
+    variants = {alias}
+    for separator in (".", "-", "_"):
+        for variant in list(variants):
+            if separator in variant:
+                variants.add(variant.replace(separator, " ").strip())
+                variants.add(variant.replace(separator, ""))
+    return {" ".join(variant.split()) for variant in variants if variant.strip()}
+
+
+class AhoCorasick:
+    # Multi-pattern matcher over lower-cased text. Transitions are resolved
+    # through failure links once and memoised per state, so scanning is a single
+    # dict lookup per character after warm-up.
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._delta = [{}]
+        self.patterns = 0
+
+    def add(self, pattern: str, value):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._delta.append({})
+            state = nxt
+        self._out[state] += ((len(pattern), value),)
+        self.patterns += 1
+
+    def build(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+        return self
+
+    def _next(self, state: int, ch: str) -> int:
+        delta = self._delta[state]
+        nxt = delta.get(ch)
+        if nxt is None:
+            cursor = state
+            while True:
+                nxt = self._goto[cursor].get(ch)
+                if nxt is not None or cursor == 0:
+                    break
+                cursor = self._fail[cursor]
+            nxt = nxt or 0
+            delta[ch] = nxt
+        return nxt
+
+    def iter(self, text: str):
+        # Yields (start, end, value) for every occurrence, end exclusive.
+        state = 0
+        out = self._out
+        for index, ch in enumerate(text):
+            state = self._next(state, ch)
+            if out[state]:
+                for length, value in out[state]:
+                    yield index + 1 - length, index + 1, value
+
+
+class TaxonomyResult:
+    def __init__(self, skills: list, counts: dict, domain_scores: list):
+        self.skills = skills
+        self.counts = counts
+        self.domain_scores = domain_scores
+
+    @property
+    def domain(self) -> str:
+        return self.domain_scores[0][0] if self.domain_scores else DEFAULT_DOMAIN
+
+    @property
+    def confidence(self) -> float:
+        return self.domain_scores[0][1] if self.domain_scores else 0.0
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= TAXONOMY_MIN_CONFIDENCE
+
+    def top_domains(self, limit: int = 3) -> list:
+        return [domain for domain, _ in self.domain_scores[:limit]]
+
+    def as_dict(self, limit: int = 3) -> dict:
+        return {
+            "domain": self.domain,
+            "confidence": round(self.confidence, 3),
+            "domains": [{"domain": domain, "score": round(score, 3)} for domain, score in self.domain_scores[:limit]],
+            "skills": self.skills,
+        }
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum()
+
+
+def _everyday_word(exact: str) -> bool:
+    # "Swift", "Express", "Rust": a capitalised word that is also plain
+    # English, unlike acronyms ("SOC", "DAX") or mixed case ("IaC").
+    return exact.isalpha() and exact.istitle()
+
+
+def _skills_label(label: str) -> bool:
+    return label in SKILL_CONTEXT_LABELS or label.endswith(" skills")
+
+
+def _skill_lines(lowered: str) -> list:
+    # Per line: whether it sits under a skills heading or carries a skills label.
+    flags = []
+    in_skills = False
+    for line in lowered.split("\n"):
+        line = line.strip()
+        key = heading_key(line) if line else None
+        if key is not None:
+            in_skills = _skills_label(key)
+            flags.append(in_skills)
+            continue
+        label = line.split(":", 1)[0].lstrip("- ").strip() if ":" in line else ""
+        flags.append(in_skills or _skills_label(label))
+    return flags
+
+
+def taxonomy_version(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:12]
+
+
+def taxonomy_file_version(path: str = SKILL_TAXONOMY_PATH) -> str:
+    # Cheap enough for import time, unlike building the matcher.
+    with open(path, "rb") as f:
+        return taxonomy_version(f.read())
+
+
+class SkillTaxonomy:
+    def __init__(self, skills: list, version: str = ""):
+        self.version = version
+        self.skills = []
+        self.domains = {}
+        self._canonical = {}
+        self._matcher = AhoCorasick()
+        valid = set(DOMAINS.values())
+        for skill in skills:
+            index = len(self.skills)
+            name = skill["name"]
+            weights = {domain: float(weight) for domain, weight in skill.get("domains", {}).items() if domain in valid}
+            self.skills.append(name)
+            self.domains[name] = weights
+            aliases = set(skill.get("aliases", ()))
+            if skill.get("match_name", True):
+                aliases.add(name.lower())
+            for alias in aliases:
+                for variant in alias_variants(alias.lower()):
+                    self._matcher.add(variant, (index, None, False))
+                    self._canonical.setdefault(variant, name)
+            for exact in skill.get("exact", ()):
+                # Ambiguous words ("Go", "Spring", "Excel") only count in their
+                # exact casing, and everyday words only in a skills context.
+                self._matcher.add(exact.lower(), (index, exact, _everyday_word(exact)))
+                self._canonical.setdefault(exact.lower(), name)
+            self._canonical[name.lower()] = name
+        self._matcher.build()
+
+    @classmethod
+    def load(cls, path: str = SKILL_TAXONOMY_PATH) -> "SkillTaxonomy":
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        return cls(data["skills"], version=taxonomy_version(raw))
+
+    @property
+    def patterns(self) -> int:
+        return self._matcher.patterns
+
+    def canonical(self, skill: str) -> str | None:
+        return self._canonical.get(" ".join(skill.lower().split()))
+
+    def extract(self, text: str) -> dict:
+        # Returns {skill_index: occurrences}, insertion ordered by first appearance.
+        lowered = text.lower()
+        origin = None
+        if len(lowered) != len(text):
+            # Some characters lower-case to several ("İ" -> "i̇"); map match
+            # offsets back to `text` so exact-case skills still compare.
+            origin = [i for i, ch in enumerate(text) for _ in ch.lower()]
+            lowered = "".join(ch.lower() for ch in text)
+        size = len(lowered)
+        matches = []
+        for start, end, (index, exact, contextual) in self._matcher.iter(lowered):
+            if start > 0 and _is_word(lowered[start - 1]) and _is_word(lowered[start]):
+                continue
+            if end < size and _is_word(lowered[end]) and _is_word(lowered[end - 1]):
+                continue
+            if exact is not None:
+                original = text[start:end] if origin is None else text[origin[start]:origin[end - 1] + 1]
+                if original != exact:
+                    continue
+            matches.append((start, -end, index, contextual))
+        # Leftmost-longest: "react native" wins over "react", "aws lambda" over "Lambda".
+        matches.sort()
+        selected = []
+        covered = 0
+        for start, end, index, contextual in matches:
+            if start < covered:
+                continue
+            covered = -end
+            selected.append((start, -end, index, contextual))
+        if any(contextual for _, _, _, contextual in selected):
+            selected = self._in_context(lowered, selected)
+        counts = {}
+        for _, _, index, _ in selected:
+            counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    @staticmethod
+    def _in_context(lowered: str, selected: list) -> list:
+        # An everyday word counts in a skills section or labelled line, or when
+        # listed right next to an unambiguous skill ("Flutter, Dart"); "Swift
+        # Logistics" or "Express delivery" in an experience line does not.
+        line_starts = [0] + [match.end() for match in re.finditer("\n", lowered)]
+        skill_lines = None
+        kept = []
+        for i, (start, end, index, contextual) in enumerate(selected):
+            if contextual:
+                if skill_lines is None:
+                    skill_lines = _skill_lines(lowered)
+                line = bisect.bisect_right(line_starts, start) - 1
+                neighbours = []
+                if i > 0:
+                    neighbours.append((selected[i - 1], lowered[selected[i - 1][1]:start]))
+                if i + 1 < len(selected):
+                    neighbours.append((selected[i + 1], lowered[end:selected[i + 1][0]]))
+                listed = any(not other[3] and _LIST_GAP.fullmatch(gap) for other, gap in neighbours)
+                if not skill_lines[line] and not listed:
+                    continue
+            kept.append((start, end, index, contextual))
+        return kept
+
+    def classify(self, text: str) -> TaxonomyResult:
+        counts = self.extract(text)
+        scores = {}
+        for index, count in counts.items():
+            boost = 1.0 + math.log(count)
+            for domain, weight in self.domains[self.skills[index]].items():
+                scores[domain] = scores.get(domain, 0.0) + weight * boost
+        total = sum(scores.values())
+        ranked = sorted(
+            ((domain, score / total) for domain, score in scores.items()), key=lambda item: item[1], reverse=True
+        ) if total else []
+        skills = [self.skills[index] for index in counts]
+        return TaxonomyResult(skills, {self.skills[index]: count for index, count in counts.items()}, ranked)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def skill_taxonomy() -> SkillTaxonomy:
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = SkillTaxonomy.load()
+    return _default
@@ -0,0 +1,118 @@
+import json
+from typing import Annotated
+
+from pydantic import BaseModel, TypeAdapter
+
+
+class TopLevelFieldParser:
+    # Incrementally scans streamed JSON text and returns each top-level member of
+    # the outermost object as soon as the delimiter after it arrives.
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.member = []
+
+    def feed(self, text: str) -> list:
+        members = []
+        for ch in text:
+            if self.finished:
+                break
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                    self.depth = 1
+                continue
+            if self.in_string:
+                self.member.append(ch)
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.finished = True
+                    members.extend(self._close_member())
+                    continue
+            elif ch == "," and self.depth == 1:
+                members.extend(self._close_member())
+                continue
+            self.member.append(ch)
+        return members
+
+    def _close_member(self) -> list:
+        text = "".join(self.member).strip()
+        self.member = []
+        if not text:
+            return []
+        return list(json.loads("{" + text + "}").items())
+
+
+class FieldValidator:
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self._adapters = {}
+
+    def validate(self, name: str, value):
+        field = self.schema.model_fields.get(name)
+        if field is None:
+            return None
+        adapter = self._adapters.get(name)
+        if adapter is None:
+            annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+            adapter = self._adapters[name] = TypeAdapter(annotation)
+        return adapter.dump_python(adapter.validate_python(value), mode="json")
+
+
+def json_instructions(schema: type[BaseModel], field_order: list | None = None) -> str:
+    order = list(field_order or schema.model_fields)
+    order += [name for name in schema.model_fields if name not in order]
+    return (
+        "Respond with a single JSON object and nothing else (no markdown fences) that matches this JSON schema:\n"
+        f"{json.dumps(schema.model_json_schema(), separators=(',', ':'))}\n"
+        f"Write the top-level keys in exactly this order: {', '.join(order)}."
+    )
+
+
+def chunk_text(chunk) -> str:
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, str) or part.get("type") == "text"
+        )
+    return ""
+
+
+async def stream_fields(chunks, schema: type[BaseModel]):
+    # Yields (name, validated_value) per completed top-level field, then
+    # (None, model) once the whole object validates against the schema.
+    parser = TopLevelFieldParser()
+    validator = FieldValidator(schema)
+    values = {}
+    async for chunk in chunks:
+        for name, raw in parser.feed(chunk_text(chunk)):
+            values[name] = raw
+            if name in schema.model_fields:
+                yield name, validator.validate(name, raw)
+    if not parser.finished:
+        raise ValueError("Model output ended before the JSON object was complete")
+    yield None, schema.model_validate(values)
+
+
+def sse_event(event: str, data) -> str:
+    payload = json.dumps(data, default=str, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,122 @@
+import re
+from typing import Iterable
+
+# Header/footer candidates are the first and last few non-empty lines of each page.
+EDGE_LINES = 2
+
+_INVISIBLE = re.compile("[\u200b-\u200d\u2060\ufeff]")
+_DIGITS = re.compile(r"\d+")
+# "Page 3", "Page 3 of 5", "3 of 5", "3/5": always page labels.
+_PAGE_LABEL = re.compile(r"^(page\s*[-(]?\s*\d+\s*[-)]?(\s*(of|/)\s*\d+)?|\d+\s*(of|/)\s*\d+)$", re.IGNORECASE)
+# "3", "- 3 -", "(3)": only a page number when it fits the page sequence,
+# otherwise it is content such as a year.
+_BARE_NUMBER = re.compile(r"^[-(]?\s*(\d+)\s*[-)]?$")
+# A page counter inside a longer edge line: "Confidential - page 3", "Resume 2/3".
+# Only these lines repeat with a changing number; elsewhere the digits are
+# content ("CGPA: 8.4") and two lines differing in them are both kept.
+_PAGE_COUNTER = re.compile(r"\bpage\s*[-(]?\s*\d+|\b\d+\s*(of|/)\s*\d+\b", re.IGNORECASE)
+_BULLET_STRIP = "\u2022\u25cf\u25aa\u25a0\u25e6\u2023\u2043\u2219\u00b7*"
+_BULLET_CHARS = frozenset(_BULLET_STRIP)
+
+SECTION_HEADINGS = frozenset({
+    "summary", "professional summary", "profile", "about me", "objective", "career objective",
+    "education", "academic details", "academic qualifications", "qualifications",
+    "experience", "work experience", "professional experience", "employment", "internships", "internship",
+    "projects", "academic projects", "personal projects",
+    "skills", "technical skills", "key skills", "core competencies", "tools", "technologies",
+    "certifications", "certificates", "courses", "trainings", "training",
+    "achievements", "awards", "accomplishments", "publications", "extracurricular activities",
+    "activities", "positions of responsibility", "leadership", "volunteering",
+    "languages", "hobbies", "interests", "hobbies and interests", "personal details",
+    "personal information", "declaration", "references",
+})
+
+
+def heading_key(line: str):
+    if len(line) > 40:
+        return None
+    key = line.rstrip(":").strip().casefold()
+    if key in SECTION_HEADINGS:
+        return key
+    if line.endswith(":") and " " not in key.replace(" & ", "&").strip():
+        return key
+    return None
+
+
+def _page_lines(page: str) -> list[str]:
+    page = _INVISIBLE.sub("", page)
+    lines = [" ".join(line.split()) for line in page.splitlines()]
+    for i, line in enumerate(lines):
+        if line and line[0] in _BULLET_CHARS:
+            rest = line.lstrip(_BULLET_STRIP).lstrip()
+            lines[i] = "- " + rest if rest else ""
+    return lines
+
+
+def normalize_pages(pages: Iterable[str], edge_lines: int = EDGE_LINES) -> str:
+    pages = list(pages)
+    blocks = []
+    seen_blocks = set()
+    seen_edges = set()
+    block = []
+    prev_line = None
+    # Page numbers are the page index plus a constant offset (0, or e.g. -1
+    # after an unnumbered cover page). A bare edge number within the page
+    # count is one when its offset is 0, the one already found, or that of a
+    # bare edge number on the previous page. Years never fit, so they stay.
+    page_offset = 0
+    previous_offsets = set()
+
+    def flush():
+        if block:
+            key = "\n".join(block).casefold()
+            if key not in seen_blocks:
+                seen_blocks.add(key)
+                blocks.append("\n".join(block))
+            block.clear()
+
+    for page_no, page in enumerate(pages, start=1):
+        lines = _page_lines(page)
+        content_idx = [i for i, line in enumerate(lines) if line]
+        if len(content_idx) > 4 * edge_lines:
+            top = set(content_idx[:edge_lines])
+            bottom = set(content_idx[-edge_lines:])
+        else:
+            top = bottom = set()
+        page_edge_keys = []
+        candidate_offsets = set()
+        for i, line in enumerate(lines):
+            if not line:
+                flush()
+                continue
+            if i in top or i in bottom:
+                if _PAGE_LABEL.match(line):
+                    continue
+                number = _BARE_NUMBER.match(line)
+                if number:
+                    value = int(number.group(1))
+                    if 0 < value <= len(pages) and value - page_no in {0, page_offset, *previous_offsets}:
+                        page_offset = value - page_no
+                        continue
+                    candidate_offsets.add(value - page_no)
+                    # Kept as content; only an identical line repeats it.
+                    edge_key = ("top" if i in top else "bottom", line)
+                elif _PAGE_COUNTER.search(line):
+                    edge_key = ("top" if i in top else "bottom", _DIGITS.sub("#", line.casefold()))
+                else:
+                    edge_key = ("top" if i in top else "bottom", line.casefold())
+                if edge_key in seen_edges:
+                    continue
+                page_edge_keys.append(edge_key)
+            if line == prev_line:
+                continue
+            if heading_key(line) is not None:
+                flush()
+            block.append(line)
+            prev_line = line
+        # Page breaks end a block; edges only count once the page is done so a
+        # header is never dropped from the page that introduced it.
+        flush()
+        seen_edges.update(page_edge_keys)
+        previous_offsets = candidate_offsets
+    return "\n\n".join(blocks)
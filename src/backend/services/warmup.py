@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+
+class Warmup:
+    """Slow one-off initialisation run in the background once the server is up.
+
+    Nothing here is required for correctness: every step is also done lazily on
+    first use. Running them early just moves that cost off the first requests,
+    and readiness reports when it is done.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self.timings = {}
+        self.errors = {}
+        self.started_at = None
+        self.finished_at = None
+        self._task = None
+
+    def add(self, name: str, func):
+        self.steps.append((name, func))
+
+    def start(self):
+        # Called from the startup hook; the task only gets to run once startup
+        # has returned and the server is accepting connections.
+        if self._task is None:
+            self.started_at = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        for name, func in self.steps:
+            started_at = time.perf_counter()
+            try:
+                await asyncio.to_thread(func)
+            except Exception as e:
+                # A failed step is retried lazily by whichever request needs it.
+                self.errors[name] = str(e)
+                print(f"Warning: warm-up step {name} failed: {e}")
+            self.timings[name] = round(time.perf_counter() - started_at, 3)
+        self.finished_at = time.monotonic()
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.finished_at - self.started_at, 3) if self.ready else None,
+            "steps": self.timings,
+            "errors": self.errors,
+        }
+
+
+warmup = Warmup()
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Run from anywhere: the backend modules import each other as top-level packages.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SESSION_SECRET", "test-secret")
+os.environ.setdefault("RESUME_API", "unused")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+os.environ.setdefault("QUIZ_BANK_PATH", ":memory:")
+os.environ.setdefault("RESUME_STATE_PATH", ":memory:")
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from services.admission import ADMISSION_MAX_RETRY_AFTER, Gate, Rejected, TokenBucket
+
+
+def test_token_bucket_spends_its_burst_then_refills_at_the_rate():
+    bucket = TokenBucket(rate_per_minute=60, burst=3)
+    now = bucket.updated_at
+    assert [bucket.take(now) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take(now) == pytest.approx(1.0)
+    assert bucket.take(now + 0.5) == pytest.approx(0.5)
+    assert bucket.take(now + 1.0) == 0.0
+
+
+def test_token_bucket_never_holds_more_than_its_burst():
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    later = bucket.updated_at + 3600
+    assert [bucket.take(later) for _ in range(2)] == [0.0, 0.0]
+    assert bucket.take(later) > 0
+
+
+def test_token_bucket_with_no_rate_waits_forever_once_empty():
+    bucket = TokenBucket(rate_per_minute=0, burst=1)
+    assert bucket.take() == 0.0
+    assert bucket.take() == float("inf")
+
+
+def test_rejection_retry_after_is_a_bounded_whole_second():
+    assert Rejected("busy", 0.2).http_exception().headers["Retry-After"] == "1"
+    assert Rejected("busy", 2.5).http_exception().headers["Retry-After"] == "3"
+    exc = Rejected("slow down", float("inf")).http_exception()
+    assert (exc.status_code, exc.headers["Retry-After"]) == (429, str(ADMISSION_MAX_RETRY_AFTER))
+
+
+def test_gate_queues_in_order_and_hands_slots_over():
+    async def main():
+        gate = Gate(max_in_flight=1, max_queue=2)
+        await gate.acquire(timeout=1)
+        order = []
+
+        async def wait(name):
+            await gate.acquire(timeout=1)
+            order.append(name)
+
+        waiters = [asyncio.create_task(wait(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        assert (gate.in_flight, gate.waiting) == (1, 2)
+        gate.release()
+        # The slot goes straight to the first waiter; in_flight never dips.
+        assert (gate.in_flight, gate.waiting) == (1, 1)
+        gate.release()
+        await asyncio.gather(*waiters)
+        assert order == ["first", "second"]
+        gate.release()
+        assert (gate.in_flight, gate.waiting) == (0, 0)
+
+    asyncio.run(main())
+
+
+def test_gate_rejects_at_once_when_the_queue_is_full():
+    async def main():
+        gate = Gate(max_in_flight=1, max_queue=0)
+        await gate.acquire(timeout=1)
+        with pytest.raises(Rejected) as rejected:
+            await gate.acquire(timeout=1)
+        assert rejected.value.status_code == 429 and rejected.value.retry_after > 0
+
+    asyncio.run(main())
+
+
+def test_gate_timeout_leaves_the_queue_and_no_slot_behind():
+    async def main():
+        gate = Gate(max_in_flight=1, max_queue=1)
+        await gate.acquire(timeout=1)
+        with pytest.raises(Rejected) as rejected:
+            await gate.acquire(timeout=0.01)
+        assert rejected.value.status_code == 503
+        assert gate.waiting == 0
+        gate.release()
+        assert gate.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_gate_release_updates_the_hold_estimate():
+    gate = Gate(max_in_flight=2, max_queue=0, hold_seconds=2.0)
+    gate.in_flight = 1
+    gate.release(held_seconds=1.0)
+    assert gate.hold_seconds == pytest.approx(1.8)
+    assert gate.retry_after() == pytest.approx(0.9)
@@ -0,0 +1,55 @@
+import asyncio
+
+from models.domain_switch import DomainSwitchRequest
+from routes import domain_switch
+from services.admission import AdmissionController
+from services.lru_cache import LRUCache
+from services.single_flight import SingleFlight
+
+
+class FakeProfiles:
+    async def version(self, user_id):
+        return 1
+
+    async def get(self, user_id, loader):
+        return {"name": "Asha"}
+
+
+class SlowLLM:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    def structured(self, schema):
+        return schema
+
+    async def ainvoke(self, route, runnable, prompt):
+        self.calls += 1
+        await self.release.wait()
+        return None
+
+
+def test_the_shared_analysis_holds_its_slot_after_the_leading_request_leaves(monkeypatch):
+    controller = AdmissionController(rates={}, max_in_flight={"domain_switch": 1}, max_queue={}, global_max_in_flight=4)
+    llm = SlowLLM()
+    monkeypatch.setattr(domain_switch, "admission", controller)
+    monkeypatch.setattr(domain_switch, "profile_cache", FakeProfiles())
+    monkeypatch.setattr(domain_switch, "llm", llm)
+    monkeypatch.setattr(domain_switch, "analysis_cache", LRUCache(max_entries=8))
+    monkeypatch.setattr(domain_switch, "inflight", SingleFlight())
+    gate = lambda: controller.gates["domain_switch"]
+
+    async def main():
+        data = DomainSwitchRequest(target_domain="Data Science")
+        leader = asyncio.create_task(domain_switch.domain_switch(data, None, user_id="1"))
+        await asyncio.sleep(0.01)
+        assert llm.calls == 1 and gate().in_flight == 1
+        # The leader disconnects; the shared call runs on and keeps its slot.
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        assert gate().in_flight == 1 and len(domain_switch.inflight) == 1
+        llm.release.set()
+        await asyncio.sleep(0.01)
+        assert gate().in_flight == 0 and len(domain_switch.inflight) == 0
+
+    asyncio.run(main())
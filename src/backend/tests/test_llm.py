@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+from services.llm import LLMService, LLMTimeoutError, RetryBudget
+
+
+class SleepingRunnable:
+    """Sleeps like a model call and records how many calls overlap."""
+
+    def __init__(self, latency: float = 0.01, failures: list | None = None, shared: dict | None = None):
+        self.latency = latency
+        # Exceptions raised by the first calls, in order.
+        self.failures = list(failures or [])
+        self.shared = shared if shared is not None else {"active": 0, "peak": 0}
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def ainvoke(self, payload):
+        self.calls += 1
+        self.active += 1
+        self.shared["active"] += 1
+        self.peak = max(self.peak, self.active)
+        self.shared["peak"] = max(self.shared["peak"], self.shared["active"])
+        try:
+            await asyncio.sleep(self.latency)
+            if self.failures:
+                raise self.failures.pop(0)
+            return payload
+        finally:
+            self.active -= 1
+            self.shared["active"] -= 1
+
+    async def astream(self, payload):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        for chunk in payload:
+            await asyncio.sleep(self.latency)
+            yield chunk
+
+
+def service(**kwargs) -> LLMService:
+    kwargs.setdefault("retry_base_delay", 0)
+    return LLMService(model=object(), **kwargs)
+
+
+def test_route_and_global_limits_cap_concurrent_calls():
+    llm = service(max_concurrency=4, route_limits={"resume": 3, "quiz": 1})
+    shared = {"active": 0, "peak": 0}
+    resume, quiz = SleepingRunnable(shared=shared), SleepingRunnable(shared=shared)
+
+    async def main():
+        await asyncio.gather(
+            *(llm.ainvoke("resume", resume, i) for i in range(30)),
+            *(llm.ainvoke("quiz", quiz, i) for i in range(10)),
+        )
+
+    asyncio.run(main())
+    assert (resume.peak, quiz.peak, shared["peak"]) == (3, 1, 4)
+    stats = llm.stats()["routes"]
+    assert stats["resume"]["calls"] == 30 and stats["resume"]["in_flight"] == 0 and stats["resume"]["waiting"] == 0
+    assert stats["resume"]["queue_wait_seconds"] > 0
+
+
+def test_routes_without_a_limit_share_the_global_one():
+    llm = service(max_concurrency=5, route_limits={})
+    runnable = SleepingRunnable()
+
+    async def main():
+        await asyncio.gather(*(llm.ainvoke("other", runnable, i) for i in range(20)))
+
+    asyncio.run(main())
+    assert runnable.peak == 5
+
+
+def test_event_loop_stays_responsive_under_many_concurrent_calls():
+    llm = service(max_concurrency=16, route_limits={"domain_switch": 16})
+    runnable = SleepingRunnable(latency=0.05)
+
+    async def main():
+        stop = asyncio.Event()
+
+        async def lag():
+            worst = 0.0
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                worst = max(worst, time.perf_counter() - start - 0.005)
+            return worst
+
+        probe = asyncio.create_task(lag())
+        results = await asyncio.gather(*(llm.ainvoke("domain_switch", runnable, i) for i in range(160)))
+        stop.set()
+        return results, await probe
+
+    results, worst_lag = asyncio.run(main())
+    assert results == list(range(160))
+    assert runnable.peak == 16
+    assert worst_lag < 0.05
+
+
+def test_a_timeout_raises_and_frees_the_slot():
+    llm = service(max_concurrency=1, route_limits={}, max_retries=0)
+
+    async def main():
+        with pytest.raises(LLMTimeoutError):
+            await llm.ainvoke("resume", SleepingRunnable(latency=1), "slow", timeout=0.01)
+        # The only slot is free again.
+        return await asyncio.wait_for(llm.ainvoke("resume", SleepingRunnable(), "fast"), 1)
+
+    assert asyncio.run(main()) == "fast"
+    stats = llm.stats()["routes"]["resume"]
+    assert (stats["timeouts"], stats["errors"], stats["in_flight"]) == (1, 1, 0)
+
+
+def test_transient_errors_are_retried_and_others_are_not():
+    llm = service(max_retries=2)
+    flaky = SleepingRunnable(failures=[RuntimeError("503 UNAVAILABLE"), ConnectionError("reset")])
+    assert asyncio.run(llm.ainvoke("resume", flaky, "ok")) == "ok"
+    assert flaky.calls == 3
+
+    broken = SleepingRunnable(failures=[ValueError("bad schema")])
+    with pytest.raises(ValueError):
+        asyncio.run(llm.ainvoke("resume", broken, "ok"))
+    assert broken.calls == 1
+    stats = llm.stats()["routes"]["resume"]
+    assert (stats["retries"], stats["errors"]) == (2, 1)
+
+
+def test_the_retry_budget_bounds_retries_when_the_provider_is_down():
+    budget = RetryBudget(ratio=0.1, minimum=2)
+    llm = service(max_retries=3, retry_budget=budget)
+    down = [SleepingRunnable(latency=0, failures=[RuntimeError("503")] * 4) for _ in range(20)]
+
+    async def main():
+        return await asyncio.gather(*(llm.ainvoke("resume", runnable, i) for i, runnable in enumerate(down)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+    # Without the budget every call would have retried three times.
+    retries = llm.stats()["routes"]["resume"]["retries"]
+    assert retries == sum(runnable.calls for runnable in down) - len(down)
+    assert retries <= 2 + 20 * 0.1
+
+
+def test_retry_budget_deposits_up_to_its_cap():
+    budget = RetryBudget(ratio=0.5, minimum=2)
+    assert budget.withdraw() and budget.withdraw() and not budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+
+def test_a_stream_is_retried_only_before_its_first_chunk():
+    llm = service(max_retries=2)
+    runnable = SleepingRunnable(latency=0, failures=[RuntimeError("503 UNAVAILABLE")])
+
+    async def collect():
+        return [chunk async for chunk in llm.astream("resume", runnable, "abc")]
+
+    assert asyncio.run(collect()) == ["a", "b", "c"]
+    assert runnable.calls == 2
+
+    class Interrupted(SleepingRunnable):
+        async def astream(self, payload):
+            self.calls += 1
+            yield "a"
+            raise RuntimeError("503 UNAVAILABLE")
+
+    interrupted = Interrupted()
+
+    async def partial():
+        chunks = []
+        with pytest.raises(RuntimeError):
+            async for chunk in llm.astream("resume", interrupted, None):
+                chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(partial()) == ["a"]
+    assert interrupted.calls == 1
+    assert llm.stats()["routes"]["resume"]["in_flight"] == 0
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import random
+import tracemalloc
+
+from fastapi import FastAPI
+
+from benchmarks.fakes import FakeChatModel
+from routes import mock_interview
+from services.admission import AdmissionController
+from services.interview_sessions import INTERVIEW_RECENT_MESSAGES, INTERVIEW_SUMMARY_MAX_CHARS, InterviewStore
+from services.llm import LLMService
+from services.sessions import create_session_token
+
+
+class Closed(Exception):
+    pass
+
+
+class WebSocketClient:
+    # Drives the ASGI app directly, so hundreds of sessions need no sockets.
+    def __init__(self, app, user_id: int, query: str = "domain=3"):
+        self.app = app
+        self.scope = {
+            "type": "websocket",
+            "path": "/mock_interview/ws",
+            "raw_path": b"/mock_interview/ws",
+            "query_string": query.encode(),
+            "headers": [(b"cookie", f"session={create_session_token(user_id)}".encode())],
+            "scheme": "ws",
+            "server": ("test", 80),
+            "client": ("test", 1),
+            "root_path": "",
+            "subprotocols": [],
+        }
+        self.to_app = asyncio.Queue()
+        self.from_app = asyncio.Queue()
+        self.task = None
+
+    async def connect(self):
+        self.task = asyncio.create_task(self.app(self.scope, self.to_app.get, self.from_app.put))
+        await self.to_app.put({"type": "websocket.connect"})
+        message = await self.from_app.get()
+        if message["type"] != "websocket.accept":
+            raise Closed(message)
+
+    async def receive(self) -> dict:
+        message = await self.from_app.get()
+        if message["type"] == "websocket.close":
+            raise Closed(message)
+        return json.loads(message["text"])
+
+    async def send(self, data: dict):
+        await self.to_app.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def close(self):
+        await self.to_app.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+async def read_turn(client: WebSocketClient) -> dict:
+    while True:
+        message = await client.receive()
+        if message["type"] in ("turn_end", "busy", "error"):
+            return message
+
+
+async def run_candidate(app, user_id: int, answers: int, results: dict, arrival: float = 0.0, think: float = 0.0):
+    # Candidates arrive and answer at staggered times, and honour "busy" like a real client.
+    rng = random.Random(user_id)
+    await asyncio.sleep(rng.uniform(0, arrival))
+    while True:
+        client = WebSocketClient(app, user_id)
+        await client.connect()
+        first = await client.receive()
+        if first["type"] == "session":
+            break
+        assert first["type"] == "busy"
+        results["busy"] += 1
+        await asyncio.sleep(first["retry_after"])
+    end = await read_turn(client)
+    assert end["type"] == "turn_end", end
+    for answer in range(answers):
+        await asyncio.sleep(rng.uniform(0, think))
+        while True:
+            await client.send({"type": "answer", "text": f"Answer {answer}: " + "details " * 60})
+            end = await read_turn(client)
+            if end["type"] != "busy":
+                break
+            results["busy"] += 1
+            await asyncio.sleep(end["retry_after"])
+        assert end["type"] == "turn_end", end
+        results["prompt_tokens"].append(end["prompt_tokens"])
+    await client.close()
+    results["completed"] += 1
+
+
+def interview_app(monkeypatch, latency: float = 0.005):
+    # Fresh controller, store and LLM service, each built with the default limits.
+    controller, store, service = AdmissionController(), InterviewStore(), LLMService(model=FakeChatModel(latency=latency))
+    loads = []
+
+    async def load_profile(user_id):
+        loads.append(user_id)
+        return {"domain": "Web Development", "skills": [{"skill_name": "Python"}]}
+
+    monkeypatch.setattr(mock_interview, "admission", controller)
+    monkeypatch.setattr(mock_interview, "interview_store", store)
+    monkeypatch.setattr(mock_interview, "llm", service)
+    monkeypatch.setattr(mock_interview, "get_full_candidate_profile", load_profile)
+    app = FastAPI()
+    app.include_router(mock_interview.router)
+    return app, controller, store, service, loads
+
+
+def test_concurrent_sessions_complete_within_default_limits(monkeypatch):
+    sessions, answers = 500, 3
+    app, controller, store, service, loads = interview_app(monkeypatch)
+    assert service.route_limits["mock_interview"] == controller.max_in_flight["mock_interview"] == 8
+    results = {"completed": 0, "busy": 0, "prompt_tokens": []}
+
+    async def main():
+        tracemalloc.start()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(
+                    run_candidate(app, user_id, answers, results, arrival=1.0, think=0.5)
+                    for user_id in range(1, sessions + 1)
+                )),
+                timeout=60,
+            )
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    held_bytes = asyncio.run(main())
+    assert results["completed"] == sessions
+    # Every slot went back, and the LLM never ran more turns than the route limit.
+    stats = controller.stats()
+    assert stats["global"] == {"in_flight": 0, "waiting": 0}
+    assert stats["routes"]["mock_interview"]["in_flight"] == stats["routes"]["mock_interview"]["waiting"] == 0
+    assert service.route_stats("mock_interview").in_flight == 0
+    assert service.route_stats("mock_interview").calls == sessions * (answers + 1)
+    # Sessions stay bounded: one profile load each, compacted history, modest memory.
+    assert len(store) == sessions and len(loads) == sessions
+    for session in store._sessions.values():
+        assert len(session.recent) <= INTERVIEW_RECENT_MESSAGES
+        assert session.summary_chars <= INTERVIEW_SUMMARY_MAX_CHARS
+    assert held_bytes / sessions < 64 * 1024
+
+
+def test_turns_over_the_user_rate_are_refused_without_recording_the_answer(monkeypatch):
+    app, controller, store, service, _ = interview_app(monkeypatch)
+    burst = controller.bursts["mock_interview"]
+    replies = []
+
+    async def main():
+        client = WebSocketClient(app, 1)
+        await client.connect()
+        assert (await client.receive())["type"] == "session"
+        replies.append(await read_turn(client))
+        for answer in range(burst):
+            await client.send({"type": "answer", "text": f"Answer {answer}"})
+            replies.append(await read_turn(client))
+        await client.close()
+
+    asyncio.run(main())
+    assert [reply["type"] for reply in replies] == ["turn_end"] * burst + ["busy"]
+    assert replies[-1]["retry_after"] >= 1
+    session = next(iter(store._sessions.values()))
+    assert session.turns == burst
+    assert all(text != f"Answer {burst - 1}" for _, text in session.recent)
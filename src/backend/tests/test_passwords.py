@@ -0,0 +1,27 @@
+import asyncio
+
+from services import passwords
+
+
+def kill_workers():
+    pool = passwords._get_pool()
+    pool.submit(passwords._hash, b"spawn", 4).result()
+    for process in list(pool._processes.values()):
+        process.kill()
+        process.join()
+    return pool
+
+
+def test_a_crashed_worker_does_not_break_later_calls():
+    async def main():
+        hashed = await passwords.hash_password("s3cret", rounds=4)
+        broken = kill_workers()
+        assert await passwords.verify_password("s3cret", hashed, rounds=4) == (True, False)
+        assert passwords._pool is not broken
+        kill_workers()
+        assert await passwords.verify_password("wrong", await passwords.hash_password("s3cret", rounds=4), rounds=4) == (False, False)
+
+    try:
+        asyncio.run(main())
+    finally:
+        passwords.shutdown_pool()
@@ -0,0 +1,18 @@
+from benchmarks.fixtures import make_pdf
+from services import pdf_extract
+
+
+def test_a_crashed_worker_does_not_break_later_uploads(monkeypatch):
+    monkeypatch.setattr(pdf_extract, "PDF_WORKERS", 2)
+    data = make_pdf([f"Page {i} of the resume" for i in range(1, pdf_extract.PDF_PARALLEL_MIN_PAGES + 1)])
+    try:
+        pages = pdf_extract.extract_pages(data)
+        broken = pdf_extract._pool
+        for process in list(broken._processes.values()):
+            process.kill()
+            process.join()
+        assert pdf_extract.extract_pages(data) == pages
+        assert pdf_extract._pool is not broken
+        assert pages[0].strip() == "Page 1 of the resume"
+    finally:
+        pdf_extract.shutdown_pool()
@@ -0,0 +1,49 @@
+import asyncio
+
+from benchmarks.fakes import FakeChatModel, fake_quiz
+from models.quiz import QuizLLMResponse
+from services import quiz_bank
+from services.llm import LLMService
+from services.quiz_bank import QuizBank, QuizStore
+
+
+def workers(monkeypatch, tmp_path, count: int = 2) -> list:
+    # Banks over one file stand in for uvicorn workers sharing a quiz_bank.db.
+    model = FakeChatModel(latency=0.001, factories={QuizLLMResponse: fake_quiz})
+    monkeypatch.setattr(quiz_bank, "llm", LLMService(model=model))
+    path = str(tmp_path / "quiz_bank.db")
+    return [QuizBank(QuizStore(path), target=20, low_water=10) for _ in range(count)]
+
+
+def texts(quiz: list) -> list:
+    return [question["question"] for question in quiz]
+
+
+def test_every_worker_serves_a_pool_in_the_same_order(monkeypatch, tmp_path):
+    first, second = workers(monkeypatch, tmp_path)
+
+    async def main():
+        served = texts(await first.next_quiz("a", "Web Development", "easy"))
+        again = texts(await second.next_quiz("b", "Web Development", "easy"))
+        following = texts(await second.next_quiz("a", "Web Development", "easy"))
+        for bank in (first, second):
+            await bank.stop()
+        return served, again, following
+
+    served, again, following = asyncio.run(main())
+    assert len(served) == 10 and served == again
+    assert not set(served) & set(following)
+
+
+def test_concurrent_requests_for_one_user_never_share_questions(monkeypatch, tmp_path):
+    banks = workers(monkeypatch, tmp_path)
+
+    async def main():
+        quizzes = await asyncio.gather(*(banks[i % 2].next_quiz("a", "Data Science", "hard") for i in range(6)))
+        for bank in banks:
+            await bank.stop()
+        return quizzes
+
+    quizzes = [texts(quiz) for quiz in asyncio.run(main()) if quiz]
+    served = [question for quiz in quizzes for question in quiz]
+    assert len(quizzes) == 6 and len(served) == len(set(served))
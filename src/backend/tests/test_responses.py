@@ -0,0 +1,49 @@
+from starlette.requests import Request
+
+from services.responses import accepts_gzip, json_response, make_etag, matching_etag
+
+ETAG = make_etag("1", "42", "epoch:3")
+
+
+def request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/profile",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_matching_etag_without_a_validator():
+    assert matching_etag(request(), ETAG) is None
+
+
+def test_matching_etag_accepts_either_encoding_and_weak_forms():
+    gzip_tag = ETAG[:-1] + '-gzip"'
+    assert matching_etag(request(if_none_match=ETAG), ETAG) == ETAG
+    assert matching_etag(request(if_none_match=gzip_tag), ETAG) == gzip_tag
+    assert matching_etag(request(if_none_match=f"W/{ETAG}"), ETAG) == f"W/{ETAG}"
+
+
+def test_matching_etag_picks_the_current_entry_from_a_list():
+    other = make_etag("1", "42", "epoch:2")
+    assert matching_etag(request(if_none_match=f"{other}, {ETAG}"), ETAG) == ETAG
+    assert matching_etag(request(if_none_match=other), ETAG) is None
+
+
+def test_matching_etag_wildcard():
+    assert matching_etag(request(if_none_match="*"), ETAG) == ETAG
+
+
+def test_accepts_gzip_honours_q_values():
+    assert accepts_gzip(request(accept_encoding="br, gzip;q=0.5"))
+    assert not accepts_gzip(request(accept_encoding="gzip;q=0"))
+    assert not accepts_gzip(request(accept_encoding="identity"))
+
+
+def test_json_response_revalidates_the_tag_it_sent():
+    body = {"data": "x" * 4096}
+    first = json_response(request(accept_encoding="gzip"), body, etag=ETAG)
+    assert first.status_code == 200 and first.headers["content-encoding"] == "gzip"
+    again = json_response(request(accept_encoding="gzip", if_none_match=first.headers["etag"]), body, etag=ETAG)
+    assert again.status_code == 304 and again.headers["etag"] == first.headers["etag"]
@@ -0,0 +1,69 @@
+import datetime
+
+from services.resume_delta import group_texts, merge_update, plan_update, same_analysis, section_fingerprints
+
+RESUME = "\n".join([
+    "Ravi Kumar | ravi@example.com",
+    "Experience:",
+    "- Intern at Flipkart, built dashboards in React.",
+    "Projects:",
+    "- Smart Attendance System with OpenCV and Flask.",
+    "- Crop Yield Predictor with scikit-learn.",
+    "Skills:",
+    "- Python, React, SQL",
+    "Certifications:",
+    "- AWS Cloud Practitioner",
+])
+
+
+def plan(old_text: str, new_text: str, **kwargs):
+    return plan_update(section_fingerprints(old_text), group_texts(new_text), **kwargs)
+
+
+def test_plan_update_is_empty_when_nothing_changed():
+    assert plan(RESUME, RESUME.replace("Python,", "Python,  ")) == []
+
+
+def test_plan_update_names_the_edited_list_sections():
+    edited = RESUME.replace("Python, React, SQL", "Python, React, SQL, Docker").replace("AWS", "GCP")
+    assert plan(RESUME, edited) == ["certificates", "skills"]
+
+
+def test_plan_update_needs_a_full_analysis_when_other_text_changed():
+    assert plan(RESUME, RESUME.replace("Flipkart", "Swiggy")) is None
+
+
+def test_plan_update_needs_a_full_analysis_for_large_edits():
+    edited = RESUME.replace("with OpenCV and Flask", "with OpenCV and Flask " + "and more " * 100)
+    assert plan(RESUME, edited) is None
+    assert plan(RESUME, edited, max_share=1.0) == ["projects"]
+
+
+def test_plan_update_treats_a_removed_section_as_changed():
+    without_certificates = RESUME.split("\nCertifications:")[0]
+    assert plan(RESUME, without_certificates) == ["certificates"]
+
+
+def test_merge_update_replaces_fields_and_keeps_the_rest():
+    previous = {
+        "skills": [{"skill_name": "Python"}],
+        "projects": [{"project_name": "Attendance"}],
+        "domain": "Web Development",
+        "candidates": {"domain": "Web Development", "resume_json": {"skills": ["Python"], "projects": ["Attendance"]}},
+    }
+    merged = merge_update(previous, {"skills": [{"skill_name": "Go"}], "domain": "Cloud Computing"})
+    assert merged["skills"] == [{"skill_name": "Go"}]
+    assert merged["projects"] == previous["projects"]
+    assert merged["candidates"]["domain"] == "Cloud Computing"
+    assert merged["candidates"]["resume_json"] == {"skills": [{"skill_name": "Go"}], "projects": ["Attendance"]}
+    # The stored previous analysis is left untouched.
+    assert previous["skills"] == [{"skill_name": "Python"}]
+    assert previous["candidates"]["domain"] == "Web Development"
+
+
+def test_same_analysis_compares_as_stored():
+    new = {"resume_score": 70, "certificates": [{"name": "AWS", "issued": datetime.date(2022, 5, 1)}]}
+    stored = {"certificates": [{"issued": "2022-05-01", "name": "AWS"}], "resume_score": 70}
+    assert same_analysis(stored, new)
+    assert not same_analysis(stored, {**new, "resume_score": 71})
+    assert not same_analysis({"skills": ["Python", "SQL"]}, {"skills": ["SQL", "Python"]})
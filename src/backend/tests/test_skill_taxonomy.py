@@ -0,0 +1,91 @@
+from services.skill_taxonomy import AhoCorasick, SkillTaxonomy, alias_variants
+
+
+def matches(matcher: AhoCorasick, text: str) -> list:
+    return sorted(matcher.iter(text))
+
+
+def test_aho_corasick_reports_overlapping_and_nested_matches():
+    matcher = AhoCorasick()
+    for pattern in ("he", "she", "his", "hers"):
+        matcher.add(pattern, pattern)
+    matcher.build()
+    assert matches(matcher, "ushers") == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+    assert matches(matcher, "xyz") == []
+    assert matcher.patterns == 4
+
+
+def test_aho_corasick_follows_failure_links_across_partial_matches():
+    matcher = AhoCorasick()
+    for pattern in ("aab", "ab", "b"):
+        matcher.add(pattern, pattern)
+    matcher.build()
+    assert matches(matcher, "aaab") == [(1, 4, "aab"), (2, 4, "ab"), (3, 4, "b")]
+
+
+def test_aho_corasick_keeps_every_value_of_a_repeated_pattern():
+    matcher = AhoCorasick()
+    matcher.add("go", 1)
+    matcher.add("go", 2)
+    matcher.build()
+    assert matches(matcher, "go") == [(0, 2, 1), (0, 2, 2)]
+
+
+def test_alias_variants_cover_separators():
+    assert alias_variants("node.js") == {"node.js", "node js", "nodejs"}
+
+
+def taxonomy() -> SkillTaxonomy:
+    return SkillTaxonomy([
+        {"name": "React", "domains": {}},
+        {"name": "React Native", "domains": {}},
+        {"name": "Go", "match_name": False, "exact": ["Go", "Golang"], "domains": {}},
+        {"name": "Node.js", "domains": {}},
+    ])
+
+
+def found(taxonomy: SkillTaxonomy, text: str) -> dict:
+    return {taxonomy.skills[index]: count for index, count in taxonomy.extract(text).items()}
+
+
+def test_extract_prefers_the_longest_match_and_whole_words():
+    t = taxonomy()
+    assert found(t, "React Native and React; reactive UIs") == {"React Native": 1, "React": 1}
+    assert found(t, "nodejs, Node JS") == {"Node.js": 2}
+
+
+def test_extract_matches_exact_case_skills_only_in_that_case():
+    t = taxonomy()
+    assert found(t, "Skills: Go, Docker") == {"Go": 1}
+    assert found(t, "ready to go") == {}
+
+
+def test_extract_counts_everyday_words_only_in_a_skills_context():
+    t = SkillTaxonomy([
+        {"name": "Swift", "match_name": False, "exact": ["Swift"], "domains": {}},
+        {"name": "Express.js", "aliases": ["expressjs"], "exact": ["Express"], "domains": {}},
+        {"name": "Rust", "match_name": False, "exact": ["Rust"], "domains": {}},
+        {"name": "Ruby", "match_name": False, "exact": ["Ruby"], "domains": {}},
+        {"name": "Dart", "match_name": False, "exact": ["Dart"], "domains": {}},
+        {"name": "Flutter", "domains": {}},
+        {"name": "Node.js", "domains": {}},
+    ])
+    for text in (
+        "Operations intern at Swift Logistics",
+        "Managed Express delivery routes",
+        "Volunteered on Rust removal for a bridge",
+        "President of the Ruby club; won the Dart tournament",
+    ):
+        assert found(t, text) == {}, text
+    assert found(t, "Skills: Swift, Rust, Ruby") == {"Swift": 1, "Rust": 1, "Ruby": 1}
+    assert found(t, "TECHNICAL SKILLS\nSwift\nRuby") == {"Swift": 1, "Ruby": 1}
+    # Listed next to an unambiguous skill, on any line.
+    assert found(t, "Built the app with Flutter and Dart, API on Node.js / Express") == {
+        "Flutter": 1, "Dart": 1, "Node.js": 1, "Express.js": 1,
+    }
+    assert found(t, "Experience\n- Backend: Express\n- Intern at Swift Logistics") == {"Express.js": 1}
+
+
+def test_extract_keeps_exact_case_when_lowercasing_changes_the_length():
+    # "İ" lower-cases to two characters, shifting every later offset.
+    assert found(taxonomy(), "İstanbul office, Skills: Go and React") == {"Go": 1, "React": 1}
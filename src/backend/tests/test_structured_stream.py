@@ -0,0 +1,45 @@
+import json
+
+from services.structured_stream import TopLevelFieldParser
+
+DOCUMENT = {
+    "analysis": 'Strong "backend" work, {braces} and [brackets] inside a string, a \\ backslash',
+    "resume_score": 82,
+    "skills": [{"skill_name": "Python"}, {"skill_name": "React, Native"}],
+    "candidates": {"phone": None, "resume_json": {"sections": [1, [2, 3]]}},
+    "domain": "Web Development",
+}
+
+
+def feed_in_chunks(text: str, size: int) -> list:
+    parser = TopLevelFieldParser()
+    members = []
+    for start in range(0, len(text), size):
+        members.extend(parser.feed(text[start:start + size]))
+    assert parser.finished
+    return members
+
+
+def test_members_come_out_in_order_whatever_the_chunking():
+    text = json.dumps(DOCUMENT, indent=2)
+    for size in (1, 2, 7, 64, len(text)):
+        assert feed_in_chunks(text, size) == list(DOCUMENT.items())
+
+
+def test_a_member_is_returned_once_the_delimiter_after_it_arrives():
+    parser = TopLevelFieldParser()
+    assert parser.feed('{"a": 1') == []
+    assert parser.feed(', "b": [1, 2') == [("a", 1)]
+    assert parser.feed("]}") == [("b", [1, 2])]
+
+
+def test_text_around_the_object_is_ignored():
+    parser = TopLevelFieldParser()
+    assert parser.feed('```json\n{"a": "x"}\n``` trailing {"b": 2}') == [("a", "x")]
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_an_empty_object_yields_nothing():
+    parser = TopLevelFieldParser()
+    assert parser.feed("{ }") == []
+    assert parser.finished
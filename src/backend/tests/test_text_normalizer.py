@@ -0,0 +1,48 @@
+from services.text_normalizer import normalize_pages
+
+
+def page(name: str, bottom: list, top: list = (), lines: int = 12) -> str:
+    body = [f"{name} entry {i}: built something worth mentioning" for i in range(lines)]
+    return "\n".join([*top, *body, *bottom])
+
+
+def edge_lines(text: str) -> list:
+    return [line for line in text.split("\n") if line and "entry" not in line]
+
+
+def test_page_numbers_are_dropped():
+    pages = [page("a", ["1"]), page("b", ["- 2 -"]), page("c", ["Page 3 of 3"])]
+    assert edge_lines(normalize_pages(pages)) == []
+
+
+def test_years_on_page_edges_are_kept():
+    pages = [page("a", ["2023"]), page("b", ["2024"]), page("c", ["3"]), page("d", ["2"])]
+    # "2" on page 4 does not fit the sequence either, so it is content too.
+    assert edge_lines(normalize_pages(pages)) == ["2023", "2024", "2"]
+
+
+def test_page_numbers_after_an_unnumbered_cover_are_dropped():
+    pages = [page("cover", []), page("a", ["1"]), page("b", ["2"]), page("c", ["3"])]
+    # The first "1" cannot be told from content yet; the sequence after it can.
+    assert edge_lines(normalize_pages(pages)) == ["1"]
+
+
+def test_repeated_headers_and_footers_are_kept_once():
+    header = ["Ravi Kumar | ravi@example.com"]
+    pages = [page(name, [f"Confidential - page {i}"], header) for i, name in enumerate("abc", start=1)]
+    assert edge_lines(normalize_pages(pages)) == [header[0], "Confidential - page 1"]
+
+
+def test_edge_lines_differing_only_in_numbers_are_content():
+    pages = [page("a", ["CGPA: 8.4"]), page("b", ["CGPA: 9.1"]), page("c", ["Resume - 3/4"]), page("d", ["Resume - 4/4"])]
+    assert edge_lines(normalize_pages(pages)) == ["CGPA: 8.4", "CGPA: 9.1", "Resume - 3/4"]
+
+
+def test_an_identical_bare_number_repeats_like_any_edge_line():
+    pages = [page("a", ["2023"]), page("b", ["2023"])]
+    assert edge_lines(normalize_pages(pages)) == ["2023"]
+
+
+def test_short_pages_keep_their_edges():
+    pages = ["Skills\n7", "Projects\n7"]
+    assert normalize_pages(pages) == "Skills\n7\n\nProjects\n7"